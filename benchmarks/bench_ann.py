@@ -0,0 +1,95 @@
+"""Recall@N and query latency of the LSH recommender index vs exact search.
+
+Synthetic catalogues of N projects are drawn from the real feature
+vectors: every project takes the facilities, price and location vectors
+of three random real projects, with multiplicative noise so no two rows
+are identical. Exact search scores the query against all N projects
+with the same vectors (``AnnIndex.recommend(..., exact=True)``), so
+recall measures only what the candidate pruning loses.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_ann.py --sizes 1000 10000 50000 --queries 200
+    python benchmarks/bench_ann.py --sizes 50000 --tables 16 --weights 1 0.2 0.2
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.ann import DEFAULT_TABLES, AnnIndex  # noqa: E402
+from core.pipeline import transforms  # noqa: E402
+from core.pipeline.stages import ann_blocks  # noqa: E402
+from core.similarity import DEFAULT_WEIGHTS  # noqa: E402
+
+SOURCE = os.path.join(ROOT, "data", "appartments.csv")
+
+
+def real_blocks():
+    apartments = pd.read_csv(SOURCE)
+    return ann_blocks(apartments, transforms.landmark_distances(apartments))
+
+
+def synthetic_blocks(blocks, n, rng, noise=0.3):
+    out = []
+    for block in blocks:
+        rows = rng.integers(0, block.shape[0], n)
+        picked = block[rows]
+        if sparse.issparse(picked):
+            picked = picked.tocsr(copy=True)
+            picked.data *= rng.uniform(1 - noise, 1 + noise, picked.data.size).astype(np.float32)
+        else:
+            picked = picked * rng.uniform(1 - noise, 1 + noise, picked.shape).astype(np.float32)
+        out.append(picked)
+    return out
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--tables", type=int, default=DEFAULT_TABLES)
+    parser.add_argument("--bits", type=int, default=None)
+    parser.add_argument("--weights", type=float, nargs=3, default=list(DEFAULT_WEIGHTS),
+                        help="query weights (the index is always hashed with the defaults)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = real_blocks()
+    print(f"{'projects':>8s} {'bits':>4s} {'build s':>8s} {'cand %':>7s} "
+          f"{'recall@' + str(args.top_n):>9s} {'exact ms':>9s} {'ann ms':>7s}")
+    for n in args.sizes:
+        names = pd.Index([f"project {i}" for i in range(n)])
+        blocks = synthetic_blocks(base, n, rng)
+        index, build_ms = timed_ms(lambda: AnnIndex.build(names, blocks, args.tables, args.bits))
+
+        queries = names[rng.choice(n, min(args.queries, n), replace=False)]
+        recall, candidates, exact_ms, ann_ms = [], [], [], []
+        for name in queries:
+            (truth, _), ms = timed_ms(lambda: index.recommend(name, args.top_n, args.weights, exact=True))
+            exact_ms.append(ms)
+            (found, _), ms = timed_ms(lambda: index.recommend(name, args.top_n, args.weights))
+            ann_ms.append(ms)
+            recall.append(len(set(truth) & set(found)) / len(truth))
+            candidates.append(index.candidates(names.get_loc(name)).size / n)
+
+        print(f"{n:8d} {index.bits:4d} {build_ms / 1e3:8.2f} {100 * np.mean(candidates):6.1f}% "
+              f"{np.mean(recall):9.3f} {np.median(exact_ms):9.2f} {np.median(ann_ms):7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Startup/rerun cost of page artifacts: per-rerun pickle loads vs core.artifacts.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_artifacts.py --reruns 20
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import joblib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core import artifacts  # noqa: E402
+from core.config import DATA_DIR  # noqa: E402
+
+PICKLES = ["distance_location.pkl", "url.pkl"] + list(artifacts.ARRAY_PICKLES)
+JOBLIBS = ["df.pkl", "price_prediction.pkl"]
+
+
+def present(names):
+    return [n for n in names if os.path.exists(os.path.join(DATA_DIR, n))]
+
+
+def read_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def rerun_baseline():
+    # What every page rerun did before: unconditional loads from disk
+    for name in present(PICKLES):
+        read_pickle(os.path.join(DATA_DIR, name))
+    for name in present(JOBLIBS):
+        joblib.load(os.path.join(DATA_DIR, name))
+
+
+def rerun_store():
+    for name in present(PICKLES):
+        if name in artifacts.ARRAY_PICKLES:
+            artifacts.load_array(name)
+        else:
+            artifacts.load_pickle(name)
+    for name in present(JOBLIBS):
+        artifacts.load_joblib(name)
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    for name in artifacts.ARRAY_PICKLES:
+        artifacts.convert_to_npy(name)
+
+    baseline = timed(rerun_baseline, args.reruns)
+    artifacts.clear_cache()
+    cold = timed(rerun_store, 1)
+    warm = timed(rerun_store, args.reruns)
+
+    print(f"artifacts: {', '.join(present(PICKLES) + present(JOBLIBS))}")
+    print(f"baseline  per rerun : {baseline:8.2f} ms")
+    print(f"store     first load: {cold:8.2f} ms")
+    print(f"store     per rerun : {warm:8.4f} ms")
+
+    for name in artifacts.ARRAY_PICKLES:
+        path = os.path.join(DATA_DIR, name)
+        pkl = timed(lambda: read_pickle(path), args.reruns)
+        npy = timed(
+            lambda: artifacts.np.load(artifacts.npy_path(name), mmap_mode="r"),
+            args.reruns,
+        )
+        print(f"{name:22s} pickle {pkl:7.3f} ms | npy mmap {npy:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
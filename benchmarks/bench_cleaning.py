@@ -0,0 +1,90 @@
+"""Peak memory of the raw house cleaning: whole-file pandas vs streaming.
+
+``independent-house.csv`` is replicated N times (each copy with distinct
+links so de-duplication keeps it) and cleaned in a fresh process, once
+the notebook way (read everything, then clean) and once with
+``core.pipeline.cleaning.stream_clean``. Peak RSS is the larger of the
+main process and its pool workers.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_cleaning.py --sizes 1 10 50 --jobs 2
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.pipeline.cleaning import DEFAULT_CHUNKSIZE, clean_houses, stream_clean  # noqa: E402
+
+SOURCE = os.path.join(ROOT, "data", "independent-house.csv")
+
+
+def make_input(copies, path):
+    raw = pd.read_csv(SOURCE, dtype=str)
+    for copy in range(copies):
+        chunk = raw.assign(link=raw["link"] + f"?copy={copy}")
+        chunk.to_csv(path, mode="w" if copy == 0 else "a", header=copy == 0, index=False)
+
+
+def peak_rss_mb():
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, workers) / 1024  # ru_maxrss is in KB on Linux
+
+
+def child(mode, src, dst, chunksize, jobs):
+    start = time.perf_counter()
+    if mode == "pandas":
+        clean_houses(pd.read_csv(src, dtype=str).drop_duplicates()).to_csv(dst, index=False)
+    else:
+        stream_clean(src, dst, "houses", chunksize, jobs)
+    print(json.dumps({"seconds": time.perf_counter() - start, "rss_mb": peak_rss_mb()}))
+
+
+def measure(mode, src, dst, chunksize, jobs):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, src, dst,
+         "--chunksize", str(chunksize), "--jobs", str(jobs)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50],
+                        help="copies of independent-house.csv per run")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--jobs", type=int, default=2)
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "SRC", "DST"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.chunksize, args.jobs)
+        return
+
+    print(f"{'copies':>6s} {'input':>9s} {'pandas':>20s} {'streaming':>20s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "houses.csv")
+        dst = os.path.join(tmp, "house_cleaned.csv")
+        for copies in args.sizes:
+            make_input(copies, src)
+            cells = []
+            for mode in ("pandas", "streaming"):
+                result = measure(mode, src, dst, args.chunksize, args.jobs)
+                cells.append(f"{result['rss_mb']:7.0f} MB {result['seconds']:6.2f}s")
+            print(f"{copies:6d} {os.path.getsize(src) / 1e6:7.1f}MB {cells[0]:>20s} {cells[1]:>20s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Map payload and render cost: raw boundaries vs the core.geo levels of detail.
+
+For every source the raw file is compared with each level in
+``core.geo.LEVELS`` (points, compact GeoJSON and TopoJSON size, gzipped
+size). For sector files the choropleth is also built and serialized the
+way ``st.plotly_chart`` does, which is the server-side render cost and the
+payload the browser has to parse.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_geometry.py --repeat 5
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.config import DATA_DIR  # noqa: E402
+from core.figures import choropleth_figure  # noqa: E402
+from core.geo import LEVELS, Topology, count_points, read_geojson  # noqa: E402
+
+SOURCES = [
+    os.path.join(ROOT, "data", "gurugram_sectors_clean.geojson"),
+    os.path.join(ROOT, "data", "export.geojson"),
+    os.path.join(DATA_DIR, "gurugram_sectors_clean.geojson"),
+]
+
+
+def compact(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1e3
+
+
+def render(sector_stats, geojson, repeat):
+    """(figure JSON bytes, build + serialize ms)."""
+    text, ms = timed(lambda: choropleth_figure(sector_stats, geojson).to_json(), repeat)
+    return len(text.encode()), ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sector_stats = pd.read_csv(os.path.join(DATA_DIR, "sector_stats.csv"))
+
+    for path in SOURCES:
+        source = read_geojson(path)
+        raw = open(path, "rb").read()
+        is_sectors = all("sector" in (f.get("properties") or {}) for f in source["features"])
+
+        print(f"\n{os.path.relpath(path, ROOT)}")
+        header = f"{'':10s} {'points':>7s} {'GeoJSON':>9s} {'gzip':>8s} {'TopoJSON':>9s} {'build':>9s}"
+        if is_sectors:
+            header += f" {'figure':>9s} {'render':>9s}"
+        print(header)
+
+        line = (f"{'raw':10s} {count_points(source):7d} {len(raw) / 1e3:8.1f}K "
+                f"{len(gzip.compress(raw)) / 1e3:7.1f}K {'':>9s} {'':>9s}")
+        if is_sectors:
+            size, ms = render(sector_stats, source, args.repeat)
+            line += f" {size / 1e3:8.1f}K {ms:7.1f}ms"
+        print(line)
+
+        topologies = {}
+        for i, level in enumerate(LEVELS):
+            if level.precision not in topologies:
+                topologies[level.precision] = timed(
+                    lambda: Topology(source, level.precision), 1
+                )
+            topology, topo_ms = topologies[level.precision]
+            lod, simplify_ms = timed(lambda: topology.to_geojson(level.tolerance_m), 1)
+            body = compact(lod)
+            topo = compact(topology.to_topojson(level.tolerance_m))
+
+            line = (f"{f'lod{i} ±{level.tolerance_m:g}m':10s} {count_points(lod):7d} "
+                    f"{len(body) / 1e3:8.1f}K {len(gzip.compress(body)) / 1e3:7.1f}K "
+                    f"{len(topo) / 1e3:8.1f}K {topo_ms + simplify_ms:7.1f}ms")
+            if is_sectors:
+                size, ms = render(sector_stats, lod, args.repeat)
+                line += f" {size / 1e3:8.1f}K {ms:7.1f}ms"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Pickled price pipeline vs its compact NumPy export: load time, latency, agreement.
+
+The pickle is exported to a temporary ``price_model.npz``
+(``core.price_model``). "load s" is measured in fresh interpreters: the
+imports plus loading the file, as a cold page or service start pays it.
+"1-row ms" is ``core.pricing.predict_key`` (a prediction cache miss on
+the Price Predictor page); "rows/s" prices ``df.pkl`` in one batch.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_model_export.py --model website/dataset/price_prediction.pkl
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.config import DATA_DIR  # noqa: E402
+from core.price_model import COMPACT_FILE, MODEL_FILE, check_frame, export_pipeline, load_model  # noqa: E402
+from core.pricing import feature_key, predict_key  # noqa: E402
+
+LOAD_SCRIPT = """
+import time
+start = time.perf_counter()
+from core.price_model import load_model
+load_model({path!r})
+print(time.perf_counter() - start)
+"""
+
+
+def cold_load_s(path, repeat):
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", LOAD_SCRIPT.format(path=path)],
+            cwd=os.path.join(ROOT, "website"), capture_output=True, text=True, check=True,
+        )
+        times.append(float(out.stdout.split()[-1]))
+    return float(np.median(times))
+
+
+def single_row_ms(model, keys):
+    times = []
+    for key in keys:
+        start = time.perf_counter()
+        predict_key(model, key)
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1e3
+    return np.median(times), np.percentile(times, 99)
+
+
+def rows_per_s(model, features):
+    start = time.perf_counter()
+    model.predict(features)
+    return len(features) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(DATA_DIR, MODEL_FILE))
+    parser.add_argument("--rows", type=int, default=500, help="single-row predictions to time")
+    parser.add_argument("--loads", type=int, default=5, help="cold interpreter loads per format")
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    features = check_frame(joblib.load(os.path.join(DATA_DIR, "df.pkl")))
+    keys = [feature_key(r) for r in features.sample(args.rows, random_state=0).to_dict("records")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compact_path = os.path.join(tmp, COMPACT_FILE)
+        export_pipeline(pipeline).save(compact_path)
+        compact = load_model(compact_path)
+
+        diff = np.abs(compact.predict(features) - pipeline.predict(features))
+        print(f"max |Δ log price| {diff.max():.2e} over {len(features)} rows "
+              f"(max |Δ price| {np.abs(np.expm1(compact.predict(features)) - np.expm1(pipeline.predict(features))).max():.2e} Cr)")
+        print(f"{'format':8s} {'KB':>8s} {'load s':>7s} {'1-row ms':>9s} {'p99 ms':>7s} {'rows/s':>10s}")
+        for label, path, model in [("pickle", args.model, pipeline), ("compact", compact_path, compact)]:
+            p50, p99 = single_row_ms(model, keys)
+            print(f"{label:8s} {os.path.getsize(path) / 1e3:8.1f} {cold_load_s(path, args.loads):7.2f} "
+                  f"{p50:9.3f} {p99:7.3f} {rows_per_s(model, features):10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
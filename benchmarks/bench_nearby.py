@@ -0,0 +1,90 @@
+"""Radius + similarity query latency: candidate scoring vs full similarity rows.
+
+A synthetic catalogue of N properties gets random top-K similarity
+matrices (as ``core.topk`` stores them) and random coordinates in a
+30 km square around Gurugram. "full row" blends the query's whole
+similarity row and then keeps the properties inside the radius;
+``core.nearby.nearby_recommendations`` scores only the radius
+candidates.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_nearby.py --sizes 10000 100000 --radii 1 3 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.nearby import nearby_recommendations  # noqa: E402
+from core.similarity import SimilarityEngine, top_n_indices  # noqa: E402
+from core.spatial import ORIGIN_LAT, ORIGIN_LON, SpatialIndex  # noqa: E402
+from core.topk import DEFAULT_K, TopKMatrix  # noqa: E402
+
+# ~30 km square (1° latitude ≈ 111 km)
+SPREAD_DEG = 0.27
+
+
+def random_topk(n, k, rng):
+    indices = np.sort(rng.integers(0, n, (n, k)), axis=1)
+    data = rng.random((n, k)).astype(np.float32)
+    residuals = sparse.csr_matrix(
+        (data.ravel(), indices.ravel(), np.arange(0, n * k + 1, k)), shape=(n, n)
+    )
+    residuals.sum_duplicates()  # a few rows keep fewer than k neighbours
+    return TopKMatrix(residuals, rng.random(n) * 0.1)
+
+
+def timed_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--radii", type=float, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'properties':>10s} {'radius':>6s} {'cands':>7s} {'full row ms':>12s} {'nearby ms':>10s}")
+    for n in args.sizes:
+        names = pd.Index([f"property {i}" for i in range(n)])
+        engine = SimilarityEngine([random_topk(n, DEFAULT_K, rng) for _ in range(3)], names)
+        spatial = SpatialIndex(
+            names,
+            ORIGIN_LAT + rng.uniform(-SPREAD_DEG, SPREAD_DEG, n) / 2,
+            ORIGIN_LON + rng.uniform(-SPREAD_DEG, SPREAD_DEG, n) / 2,
+        )
+        query = names[0]
+
+        for radius in args.radii:
+            def full_row():
+                row = engine.row(0)
+                nearby = spatial.query_radius(ORIGIN_LAT, ORIGIN_LON, radius)
+                rows = engine.index.get_indexer(nearby.index)
+                rows = rows[rows != 0]
+                return row[rows[top_n_indices(row[rows], 5)]]
+
+            def combined():
+                return nearby_recommendations(engine, spatial, query, (ORIGIN_LAT, ORIGIN_LON), radius)
+
+            expected, full_ms = timed_ms(full_row, args.repeat)
+            result, nearby_ms = timed_ms(combined, args.repeat)
+            assert np.allclose(result["SimilarityScore"], expected)
+            candidates = len(spatial.query_radius(ORIGIN_LAT, ORIGIN_LON, radius))
+            print(f"{n:10d} {radius:6.1f} {candidates:7d} {full_ms:12.2f} {nearby_ms:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Latency and hit rate of the name search index, plus selectbox payload size.
+
+Queries are prefixes (4 characters up to the full name) of random
+names with one typo (a dropped, doubled or swapped character). A hit
+means the intended name is among the top 5 results. The payload
+columns compare the JSON of a selectbox listing every name with one
+listing the top 20 results.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_search.py --queries 2000 --synthetic 50000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.search import NameIndex, landmark_index, property_index, society_index  # noqa: E402
+
+
+def typo(text, rng):
+    if len(text) < 4:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    kind = rng.choice(["drop", "double", "swap"])
+    if kind == "drop":
+        return text[:i] + text[i + 1:]
+    if kind == "double":
+        return text[:i] + text[i] + text[i:]
+    return text[:i - 1] + text[i] + text[i - 1] + text[i + 1:]
+
+
+def synthetic_index(names, n, rng):
+    words = sorted({w for name in names for w in name.split()})
+    return NameIndex(" ".join(rng.sample(words, rng.randint(2, 4))) for _ in range(n))
+
+
+def measure(label, index, queries, rng):
+    latencies, hits = [], 0
+    for _ in range(queries):
+        name = rng.choice(index.names)
+        query = typo(name[:rng.randint(min(4, len(name)), len(name))], rng)
+        start = time.perf_counter()
+        results = index.search(query, 5)
+        latencies.append(time.perf_counter() - start)
+        hits += name in results
+    latencies = np.array(latencies) * 1e3
+    full = len(json.dumps(index.sorted_names))
+    top = len(json.dumps(index.search("", 20)))
+    print(f"{label:10s} {len(index):7d} {np.median(latencies):8.3f} {np.percentile(latencies, 99):8.3f} "
+          f"{hits / queries:7.1%} {full / 1e3:9.1f}KB {top / 1e3:6.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--synthetic", type=int, default=50000,
+                        help="also index this many names made of random real words (0 = skip)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    indexes = {
+        "property": property_index(),
+        "society": society_index(),
+        "landmark": landmark_index(),
+    }
+    print(f"{'index':10s} {'names':>7s} {'p50 ms':>8s} {'p99 ms':>8s} {'top-5':>7s} {'all names':>11s} {'top 20':>8s}")
+    for label, index in indexes.items():
+        measure(label, index, args.queries, rng)
+    if args.synthetic:
+        names = [n for index in indexes.values() for n in index.names]
+        measure("synthetic", synthetic_index(names, args.synthetic, rng), args.queries, rng)
+
+
+if __name__ == "__main__":
+    main()
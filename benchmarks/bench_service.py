@@ -0,0 +1,66 @@
+"""Latency/throughput of the prediction service, in-process (no network).
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_service.py --requests 512 --concurrency 1 16 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.config import DATA_DIR  # noqa: E402
+from core.service import LocalClient, PredictionService  # noqa: E402
+
+
+async def run(client, records, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(record):
+        async with semaphore:
+            start = time.perf_counter()
+            status, _ = await client.post("/predict", record)
+            latencies.append(time.perf_counter() - start)
+            assert status == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(r) for r in records))
+    elapsed = time.perf_counter() - start
+    return np.array(latencies) * 1e3, len(records) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(DATA_DIR, "price_prediction.pkl"))
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    df = joblib.load(os.path.join(DATA_DIR, "df.pkl"))
+    sample = df.sample(args.requests, replace=True, random_state=0)
+    records = sample.to_dict(orient="records")
+
+    modes = {
+        "unbatched": dict(max_batch_rows=1, max_wait_ms=0.0),
+        "micro-batched": dict(),
+    }
+    print(f"{'mode':14s} {'conc':>5s} {'p50 ms':>8s} {'p95 ms':>8s} {'req/s':>9s} {'batches':>8s}")
+    for concurrency in args.concurrency:
+        for mode, options in modes.items():
+            service = PredictionService(pipeline, **options)
+            latencies, rate = asyncio.run(run(LocalClient(service), records, concurrency))
+            print(f"{mode:14s} {concurrency:5d} {np.percentile(latencies, 50):8.2f} "
+                  f"{np.percentile(latencies, 95):8.2f} {rate:9.0f} {service.batcher.batches:8d}")
+
+
+if __name__ == "__main__":
+    main()
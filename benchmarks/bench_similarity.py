@@ -0,0 +1,105 @@
+"""Peak memory of the recommender top-K build: dense N×N vs row tiles.
+
+``appartments.csv`` is replicated up to N projects (with distinct names)
+and the three top-K files are built in a fresh process, once the
+notebook way (dense float64 cosine matrix, then ``sparsify_topk``) and
+once with ``core.pipeline.cosine.build_topk``. Dense runs above
+``--max-dense`` projects are skipped: they need 8·N² bytes per matrix.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_similarity.py --sizes 1000 5000 20000 50000 --jobs 2
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.pipeline import cosine, transforms  # noqa: E402
+from core.similarity import SIMILARITY_FILES  # noqa: E402
+from core.topk import save_topk, sparsify_topk, topk_path  # noqa: E402
+
+SOURCE = os.path.join(ROOT, "data", "appartments.csv")
+
+
+def make_input(n, path):
+    raw = pd.read_csv(SOURCE)
+    copies = pd.concat([raw] * (n // len(raw) + 1), ignore_index=True).iloc[:n]
+    copies["PropertyName"] = copies["PropertyName"] + " #" + copies.index.astype(str)
+    copies.to_csv(path, index=False)
+
+
+def peak_rss_mb():
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, workers) / 1024  # ru_maxrss is in KB on Linux
+
+
+def build_dense(apartments, out_dir):
+    distances = transforms.landmark_distances(apartments)
+    matrices = {
+        SIMILARITY_FILES[0]: lambda: transforms.facility_similarity(transforms.facility_texts(apartments)),
+        SIMILARITY_FILES[1]: lambda: transforms.standardized_cosine(transforms.price_features(apartments)),
+        SIMILARITY_FILES[2]: lambda: transforms.standardized_cosine(distances),
+    }
+    for name, matrix in matrices.items():
+        save_topk(topk_path(name, out_dir), sparsify_topk(matrix()))
+
+
+def child(mode, src, out_dir, jobs):
+    apartments = pd.read_csv(src)
+    start = time.perf_counter()
+    if mode == "dense":
+        build_dense(apartments, out_dir)
+    else:
+        cosine.build_topk(apartments, out_dir, jobs=jobs, log=lambda msg: None)
+    print(json.dumps({"seconds": time.perf_counter() - start, "rss_mb": peak_rss_mb()}))
+
+
+def measure(mode, src, out_dir, jobs):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, src, out_dir, "--jobs", str(jobs)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="projects per run")
+    parser.add_argument("--max-dense", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=2)
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "SRC", "OUT_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.jobs)
+        return
+
+    print(f"{'projects':>8s} {'dense':>20s} {'tiled':>20s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "apartments.csv")
+        for n in args.sizes:
+            make_input(n, src)
+            cells = []
+            for mode in ("dense", "tiled"):
+                if mode == "dense" and n > args.max_dense:
+                    cells.append("skipped")
+                    continue
+                result = measure(mode, src, tmp, args.jobs)
+                cells.append(f"{result['rss_mb']:7.0f} MB {result['seconds']:6.2f}s")
+            print(f"{n:8d} {cells[0]:>20s} {cells[1]:>20s}")
+
+
+if __name__ == "__main__":
+    main()
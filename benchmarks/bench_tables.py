@@ -0,0 +1,78 @@
+"""Load time and memory: full CSV reads vs the core.tables Parquet layer.
+
+For every table the old path (``pd.read_csv`` of the whole file) is
+compared with reading the compact Parquet copy in full and, for the
+Analytic page tables, only the columns the page uses. The Parquet copies
+are written to a temporary directory, not next to the CSVs.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench_tables.py --repeat 10
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+from core.analytics import MAIN_COLUMNS, PROPERTY_COLUMNS  # noqa: E402
+from core.tables import convert_to_parquet, default_paths, memory_mb  # noqa: E402
+
+PAGE_COLUMNS = {
+    "new_latlong.csv": MAIN_COLUMNS,
+    "gurgaon_properties.csv": PROPERTY_COLUMNS,
+}
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'table':46s} {'path':>14s} {'load':>9s} {'memory':>9s}")
+    totals = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in default_paths():
+            name = os.path.basename(path)
+            copy = os.path.join(tmp, os.path.basename(os.path.dirname(path)), name)
+            os.makedirs(os.path.dirname(copy), exist_ok=True)
+            shutil.copy(path, copy)
+            pq = convert_to_parquet(copy)
+
+            runs = [
+                ("csv", lambda: pd.read_csv(path)),
+                ("parquet", lambda: pd.read_parquet(pq)),
+            ]
+            if name in PAGE_COLUMNS:
+                runs.append(("parquet cols", lambda: pd.read_parquet(pq, columns=PAGE_COLUMNS[name])))
+
+            for label, fn in runs:
+                df, ms = timed(fn, args.repeat)
+                mb = memory_mb(df)
+                print(f"{name:46s} {label:>14s} {ms:7.2f}ms {mb:7.2f}MB")
+                if label != "parquet cols":
+                    t, m = totals.get(label, (0.0, 0.0))
+                    totals[label] = (t + ms, m + mb)
+
+    print()
+    csv_ms, csv_mb = totals["csv"]
+    pq_ms, pq_mb = totals["parquet"]
+    print(f"all tables  csv {csv_ms:.1f} ms / {csv_mb:.2f} MB | parquet {pq_ms:.1f} ms / {pq_mb:.2f} MB "
+          f"({csv_ms / pq_ms:.1f}x faster, {csv_mb / pq_mb:.1f}x less memory)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Shared fixtures; the ``core`` package is imported from ``website/``.
+
+Run from the repository root::
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "website"))
+
+RAW_DIR = os.path.join(ROOT, "data")
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_artifact_cache():
+    # core.artifacts caches per process; keep tests independent
+    from core.artifacts import clear_cache
+
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def random_similarity(n, rng):
+    """Symmetric cosine similarity matrix of ``n`` random vectors."""
+    vectors = rng.normal(size=(n, 8))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors @ vectors.T
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.ann import AnnIndex
+from core.similarity import SimilarityEngine
+
+
+def clustered_blocks(n, rng):
+    centres = [rng.normal(size=(20, d)) for d in (30, 12, 40)]
+    labels = rng.integers(0, 20, n)
+    return [c[labels] + 0.4 * rng.normal(size=(n, c.shape[1])) for c in centres]
+
+
+@pytest.fixture(scope="module")
+def built():
+    rng = np.random.default_rng(0)
+    names = pd.Index([f"p{i}" for i in range(3000)])
+    return AnnIndex.build(names, clustered_blocks(3000, rng)), names
+
+
+def test_exact_path_matches_similarity_engine(built):
+    index, names = built
+    blocks = [np.asarray(b, dtype=np.float64) for b in index.blocks]
+    engine = SimilarityEngine([b @ b.T for b in blocks], names)
+    found, scores = index.recommend("p5", 10, exact=True)
+    expected, expected_scores = engine.recommend("p5", 10)
+    assert found == expected
+    np.testing.assert_allclose(scores, expected_scores, atol=1e-5)
+
+
+def test_recall_against_exact(built):
+    index, names = built
+    recall = []
+    for name in names[:100]:
+        truth, _ = index.recommend(name, 10, exact=True)
+        found, _ = index.recommend(name, 10)
+        recall.append(len(set(truth) & set(found)) / 10)
+        assert name not in found
+    # bench_ann.py: 0.987 at 1k, 0.967 at 10k
+    assert np.mean(recall) >= 0.95
+
+
+def test_save_load_round_trip(built, tmp_path):
+    index, _ = built
+    path = str(tmp_path / "ann.npz")
+    index.save(path)
+    loaded = AnnIndex.load(path)
+    names, scores = loaded.recommend("p7", 5)
+    expected_names, expected_scores = index.recommend("p7", 5)
+    assert names == expected_names
+    np.testing.assert_allclose(scores, expected_scores)
+    np.testing.assert_array_equal(loaded.candidates(7), index.candidates(7))
@@ -0,0 +1,40 @@
+import os
+import pickle
+
+import numpy as np
+
+from core.artifacts import cached, load_array, npy_path
+
+
+def test_cached_calls_loader_once():
+    calls = []
+    for _ in range(3):
+        value = cached(("test", "key"), lambda: calls.append(1) or "value")
+    assert value == "value" and len(calls) == 1
+
+
+def test_load_array_memory_maps_fresh_npy(tmp_path, rng):
+    matrix = rng.random((6, 6))
+    with open(tmp_path / "m.pkl", "wb") as f:
+        pickle.dump(matrix, f)
+    loaded = load_array("m.pkl", data_dir=str(tmp_path))
+    assert isinstance(loaded, np.memmap) and not loaded.flags.writeable
+    np.testing.assert_array_equal(loaded, matrix)
+    assert os.path.exists(npy_path("m.pkl", str(tmp_path)))
+
+
+def test_stale_npy_is_regenerated(tmp_path, rng):
+    from core.artifacts import clear_cache
+
+    src = tmp_path / "m.pkl"
+    with open(src, "wb") as f:
+        pickle.dump(rng.random((3, 3)), f)
+    load_array("m.pkl", data_dir=str(tmp_path))
+    clear_cache()
+
+    replacement = rng.random((4, 4))
+    with open(src, "wb") as f:
+        pickle.dump(replacement, f)
+    stamp = os.path.getmtime(npy_path("m.pkl", str(tmp_path))) + 10
+    os.utime(src, (stamp, stamp))
+    np.testing.assert_array_equal(load_array("m.pkl", data_dir=str(tmp_path)), replacement)
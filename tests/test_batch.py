@@ -0,0 +1,48 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from core import batch
+from core.batch import batch_recommend
+from core.similarity import SIMILARITY_FILES, SimilarityEngine, load_engine
+from tests.conftest import random_similarity
+
+
+def test_batch_matches_single_recommendations(rng):
+    names = pd.Index([f"p{i}" for i in range(70)])
+    engine = SimilarityEngine([random_similarity(70, rng) for _ in range(3)], names)
+    weights = (0.2, 0.5, 1.0)
+    out = batch_recommend(engine, top_n=4, weights=weights, block_size=16, n_jobs=1)
+
+    assert len(out) == 70 * 4
+    for name, group in out.groupby("PropertyName", sort=False):
+        expected, scores = engine.recommend(name, top_n=4, weights=weights)
+        assert group["RecommendedProperty"].tolist() == expected
+        np.testing.assert_allclose(group["SimilarityScore"], scores)
+        assert group["Rank"].tolist() == [1, 2, 3, 4]
+
+
+def test_batch_subset_and_pool(rng):
+    names = pd.Index([f"p{i}" for i in range(40)])
+    engine = SimilarityEngine([random_similarity(40, rng) for _ in range(3)], names)
+    serial = batch_recommend(engine, ["p3", "p39"], top_n=3, block_size=1, n_jobs=1)
+    pooled = batch_recommend(engine, ["p3", "p39"], top_n=3, block_size=1, n_jobs=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert set(serial["PropertyName"]) == {"p3", "p39"}
+
+
+def test_pool_workers_map_the_dense_files(tmp_path, rng, monkeypatch):
+    for name in SIMILARITY_FILES:
+        with open(os.path.join(tmp_path, name), "wb") as f:
+            pickle.dump(random_similarity(30, rng), f)
+    engine = load_engine(pd.Index([f"p{i}" for i in range(30)]), str(tmp_path), use_topk=False)
+    serial = batch_recommend(engine, top_n=3, block_size=8, n_jobs=1)
+    pooled = batch_recommend(engine, top_n=3, block_size=8, n_jobs=2, data_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(serial, pooled)
+
+    monkeypatch.setattr(batch, "_WORKER_MATRICES", None)
+    monkeypatch.setattr(batch, "_WORKER_WEIGHTS", None)
+    batch._init_worker(SIMILARITY_FILES, (1.0, 1.0, 1.0), str(tmp_path))
+    assert all(isinstance(m, np.memmap) for m in batch._WORKER_MATRICES)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.binning import AREA_BINS, FLOOR_BINS, assign_bins, make_spec, parse_edges
+
+
+def old_area_range(x):
+    # The Analytic page's original row-wise bucketing
+    if x < 500:
+        return "<500"
+    elif x <= 1000:
+        return "500–1000"
+    elif x <= 1500:
+        return "1000–1500"
+    elif x <= 2000:
+        return "1500–2000"
+    elif x <= 2500:
+        return "2000–2500"
+    return "2500+"
+
+
+def old_floor_range(x):
+    if x <= 2:
+        return "Ground–2"
+    elif x <= 5:
+        return "3–5"
+    elif x <= 10:
+        return "6–10"
+    elif x <= 15:
+        return "11–15"
+    elif x <= 20:
+        return "16–20"
+    return "21+"
+
+
+def test_area_bins_match_row_wise_version():
+    values = [0, 499.9, 500, 500.1, 1000, 1000.5, 1500, 2000, 2500, 2500.01, 1e6]
+    assert assign_bins(values, AREA_BINS).tolist() == [old_area_range(v) for v in values]
+
+
+def test_floor_bins_match_row_wise_version():
+    values = np.arange(-1, 30, 0.5)
+    assert assign_bins(values, FLOOR_BINS).tolist() == [old_floor_range(v) for v in values]
+
+
+def test_nan_stays_missing_and_order_is_kept():
+    out = assign_bins(pd.Series([np.nan, 3.0], index=[10, 11], name="x"), FLOOR_BINS)
+    assert out.isna().tolist() == [True, False]
+    assert out.index.tolist() == [10, 11] and out.name == "x"
+    assert out.cat.ordered and list(out.cat.categories) == FLOOR_BINS.order
+
+
+def test_generated_labels_and_edge_ownership():
+    spec = make_spec([10, 20], upper_inclusive=(False, True))
+    assert spec.labels == ("<10", "10–20", "20+")
+    assert assign_bins([9.99, 10, 20, 20.01], spec).tolist() == ["<10", "10–20", "10–20", "20+"]
+    assert make_spec([]).labels == ("All",)
+
+
+def test_invalid_specs():
+    with pytest.raises(ValueError):
+        make_spec([5, 5])
+    with pytest.raises(ValueError):
+        make_spec([1, 2], labels=["a", "b"])
+
+
+def test_parse_edges():
+    assert parse_edges("1500, 500;1000,, 500") == [500.0, 1000.0, 1500.0]
+    with pytest.raises(ValueError):
+        parse_edges("10, abc")
@@ -0,0 +1,47 @@
+import os
+
+import pandas as pd
+import pytest
+
+from core.pipeline.cleaning import stream_clean
+from tests.conftest import RAW_DIR
+
+HOUSES = os.path.join(RAW_DIR, "independent-house.csv")
+
+
+def read_text(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("chunksize", [7, 97, 5000])
+def test_houses_match_notebook_output(tmp_path, chunksize):
+    dst = str(tmp_path / "house_cleaned.csv")
+    rows = stream_clean(HOUSES, dst, "houses", chunksize=chunksize, jobs=1)
+    assert read_text(dst) == read_text(os.path.join(RAW_DIR, "house_cleaned.csv"))
+    assert rows == len(pd.read_csv(dst))
+
+
+def test_dedupe_spans_chunks(tmp_path):
+    raw = pd.read_csv(HOUSES, dtype=str).head(40)
+    src = str(tmp_path / "raw.csv")
+    # The repeated block lands in later chunks than the originals
+    pd.concat([raw, raw.iloc[:15], raw.iloc[:15]]).to_csv(src, index=False)
+    once, twice = str(tmp_path / "once.csv"), str(tmp_path / "twice.csv")
+    raw.to_csv(str(tmp_path / "raw_once.csv"), index=False)
+    stream_clean(str(tmp_path / "raw_once.csv"), once, "houses", chunksize=7, jobs=1)
+    stream_clean(src, twice, "houses", chunksize=7, jobs=1)
+    assert read_text(once) == read_text(twice)
+
+
+def test_worker_pool_keeps_input_order(tmp_path):
+    serial, pooled = str(tmp_path / "serial.csv"), str(tmp_path / "pooled.csv")
+    stream_clean(HOUSES, serial, "houses", chunksize=500, jobs=1)
+    stream_clean(HOUSES, pooled, "houses", chunksize=500, jobs=2)
+    assert read_text(serial) == read_text(pooled)
+
+
+def test_unknown_kind(tmp_path):
+    with pytest.raises(ValueError):
+        stream_clean(HOUSES, str(tmp_path / "out.csv"), "plots")
+    assert not os.listdir(tmp_path)
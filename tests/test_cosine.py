@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.pipeline import cosine, transforms
+from core.topk import sparsify_topk
+from tests.conftest import RAW_DIR
+
+
+@pytest.fixture(scope="module")
+def apartments():
+    return pd.read_csv(f"{RAW_DIR}/appartments.csv")
+
+
+@pytest.fixture(scope="module")
+def distances(apartments):
+    return transforms.landmark_distances(apartments)
+
+
+def assert_same_topk(tiled, dense):
+    n = dense.shape[0]
+    np.testing.assert_array_equal(tiled.residuals.indices, dense.residuals.indices)
+    np.testing.assert_allclose(tiled.rows(np.arange(n)), dense.rows(np.arange(n)), atol=2e-5)
+
+
+def test_standardized_matches_scaler(rng):
+    from sklearn.preprocessing import StandardScaler
+
+    features = rng.normal(5, 3, (50, 600))
+    features[:, 7] = 1.0  # constant column
+    np.testing.assert_allclose(
+        cosine.standardized(features), StandardScaler().fit_transform(features), atol=1e-5
+    )
+
+
+def test_tiled_price_topk_matches_dense(apartments):
+    dense = sparsify_topk(transforms.standardized_cosine(transforms.price_features(apartments)), k=50)
+    assert_same_topk(cosine.topk_cosine(cosine.price_vectors(apartments), 50, tile_rows=64, jobs=1), dense)
+
+
+def test_tiled_location_topk_matches_dense(distances):
+    dense = sparsify_topk(transforms.standardized_cosine(distances), k=50)
+    assert_same_topk(cosine.topk_cosine(cosine.location_vectors(distances), 50, tile_rows=100, jobs=1), dense)
+
+
+def test_tiled_facility_topk_matches_dense(apartments):
+    texts = transforms.facility_texts(apartments)
+    dense = sparsify_topk(transforms.facility_similarity(texts), k=50)
+    tiled = cosine.topk_cosine(cosine.facility_vectors(apartments), 50, tile_rows=32, jobs=1)
+    n = dense.shape[0]
+    np.testing.assert_allclose(tiled.rows(np.arange(n)), dense.rows(np.arange(n)), atol=2e-5)
+
+
+def test_worker_pool_matches_in_process(distances):
+    vectors = cosine.location_vectors(distances)
+    serial = cosine.topk_cosine(vectors, 10, tile_rows=64, jobs=1)
+    pooled = cosine.topk_cosine(vectors, 10, tile_rows=64, jobs=2)
+    np.testing.assert_array_equal(serial.residuals.indices, pooled.residuals.indices)
+    np.testing.assert_allclose(serial.residuals.data, pooled.residuals.data)
@@ -0,0 +1,38 @@
+import os
+
+import plotly.graph_objects as go
+
+from core.figures import FigureCache, data_version
+
+
+def test_version_tracks_data_and_builder_source(tmp_path, monkeypatch):
+    data = tmp_path / "stats.csv"
+    data.write_text("sector,price\na,1\n")
+    module = tmp_path / "fake_builders.py"
+    module.write_text("def build():\n    return 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    version = data_version([str(data)], code=("fake_builders",))
+    assert data_version([str(data)], code=("fake_builders",)) == version
+    assert data_version([str(data)], code=()) != version
+
+    module.write_text("def build():\n    return 2\n")
+    os.utime(module, ns=(0, os.stat(data).st_mtime_ns + 10_000_000))
+    assert data_version([str(data)], code=("fake_builders",)) != version
+
+
+def bars():
+    return go.Figure(go.Bar(x=[1, 2], y=[3, 4]))
+
+
+def test_figure_built_once_per_version(tmp_path):
+    cache = FigureCache(str(tmp_path))
+    first = cache.get("bars", "v1", bars)
+    cache.get("bars", "v1", bars)
+    assert cache.builds == 1
+    # A fresh process reads the stored JSON instead of rebuilding
+    fresh = FigureCache(str(tmp_path))
+    assert fresh.get("bars", "v1", bars).to_json() == first.to_json()
+    assert fresh.builds == 0
+    cache.get("bars", "v2", bars)
+    assert cache.builds == 2
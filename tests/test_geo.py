@@ -0,0 +1,32 @@
+import os
+
+import numpy as np
+
+from core.config import DATA_DIR
+from core.geo import LEVELS, build_levels, count_points, douglas_peucker, lod_for_zoom, read_geojson
+
+
+def test_douglas_peucker_drops_collinear_points():
+    xy = np.array([[0, 0], [1, 0.01], [2, 0], [3, 5], [4, 0]], dtype=float)
+    np.testing.assert_array_equal(douglas_peucker(xy, 0.1), [True, False, True, True, True])
+    assert douglas_peucker(xy, 0).all()
+
+
+def test_levels_share_borders_and_shrink():
+    geojson = read_geojson(os.path.join(DATA_DIR, "gurugram_sectors_clean.geojson"))
+    levels = build_levels(geojson)
+    counts = [count_points(level) for level in levels]
+    assert counts == sorted(counts, reverse=True)
+    assert all(len(level["features"]) == len(geojson["features"]) for level in levels)
+    # Every feature keeps a closed ring at every level
+    for level in levels:
+        for feature in level["features"]:
+            coords = feature["geometry"]["coordinates"]
+            rings = coords if feature["geometry"]["type"] == "Polygon" else [r for p in coords for r in p]
+            assert all(ring[0] == ring[-1] and len(ring) >= 4 for ring in rings)
+
+
+def test_lod_for_zoom_coarsens_when_zoomed_out():
+    picks = [lod_for_zoom(z, 28.4) for z in range(8, 19)]
+    assert picks == sorted(picks, reverse=True)
+    assert picks[0] == len(LEVELS) - 1 and picks[-1] == 0
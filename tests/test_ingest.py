@@ -0,0 +1,90 @@
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.ann import ANN_FILE, AnnIndex
+from core.pipeline import engine
+from core.pipeline.ingest import ingest_projects
+from core.pipeline.stages import (
+    APARTMENTS_FILE, LATLONG_FILE, PROJECTS_FILE, PROPERTIES_FILE, build_stages,
+)
+from core.similarity import SIMILARITY_FILES
+from core.topk import load_topk, sparsify_topk, topk_path
+from tests.conftest import RAW_DIR
+
+EXISTING = 200
+K = 20
+
+# Everything ingest_projects reads or writes
+STAGES = ["sector_coordinates", "property_urls", "project_prices", "spatial_tables", "recommender_ann"] + [
+    f"{os.path.splitext(name)[0]}_topk" for name in SIMILARITY_FILES
+]
+
+
+def read_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def build(tmp_path, dense):
+    raw = tmp_path / "raw"
+    out = tmp_path / "out"
+    raw.mkdir()
+    out.mkdir()
+    for name in (PROJECTS_FILE, PROPERTIES_FILE, LATLONG_FILE):
+        shutil.copy(os.path.join(RAW_DIR, name), raw)
+    apartments = pd.read_csv(os.path.join(RAW_DIR, APARTMENTS_FILE))
+    apartments.iloc[:EXISTING].to_csv(raw / APARTMENTS_FILE, index=False)
+
+    stages = engine.select(build_stages(str(raw), str(out), "tfidf", K, dense), STAGES)
+    results = engine.run(stages, str(out), jobs=1, log=lambda _: None)
+    assert all(r.status == "built" for r in results), results
+    return str(raw), str(out), apartments.iloc[EXISTING:]
+
+
+def kept_scores(topk):
+    """Each row's kept neighbour scores, sorted."""
+    scores = topk.residuals.data.reshape(topk.shape[0], -1) + topk.fill[:, None]
+    return np.sort(scores, axis=1)
+
+
+@pytest.fixture(autouse=True)
+def _state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "STATE_DIR", str(tmp_path / "state"))
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_ingest_extends_topk_and_ann(tmp_path, dense):
+    raw, out, new = build(tmp_path, dense)
+    assert ingest_projects(new, raw, out, "tfidf", K) == len(new)
+
+    names = read_pickle(os.path.join(out, "distance_location.pkl")).index
+    assert len(names) == EXISTING + len(new)
+    for name in SIMILARITY_FILES:
+        topk = load_topk(topk_path(name, out))
+        assert topk.shape == (len(names), len(names))
+        if dense:
+            # Merging equals re-reducing the extended dense matrix (up to ties)
+            expected = sparsify_topk(read_pickle(os.path.join(out, name)), k=K)
+            np.testing.assert_allclose(kept_scores(topk), kept_scores(expected), atol=1e-5)
+            np.testing.assert_allclose(topk.fill, expected.fill, atol=1e-5)
+        else:
+            assert not os.path.exists(os.path.join(out, name))
+
+    ann = AnnIndex.load(os.path.join(out, ANN_FILE))
+    assert list(ann.names) == list(names)
+    assert len(ann.recommend(new["PropertyName"].iloc[0], top_n=5)[0]) == 5
+    assert len(pd.read_csv(os.path.join(raw, APARTMENTS_FILE))) == len(names)
+
+
+def test_ingest_fails_before_writing_when_dense_pickles_are_partial(tmp_path):
+    raw, out, new = build(tmp_path, dense=True)
+    os.remove(os.path.join(out, SIMILARITY_FILES[1]))
+    before = {name: os.path.getmtime(os.path.join(out, name)) for name in os.listdir(out)}
+    with pytest.raises(FileNotFoundError, match=SIMILARITY_FILES[1]):
+        ingest_projects(new, raw, out, "tfidf", K)
+    assert {name: os.path.getmtime(os.path.join(out, name)) for name in os.listdir(out)} == before
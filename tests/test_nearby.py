@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.nearby import PriceFilter, nearby_recommendations
+from core.similarity import SimilarityEngine, top_n_indices
+from core.spatial import ORIGIN_LAT, ORIGIN_LON, LandmarkDistances, SpatialIndex
+from core.topk import sparsify_topk
+from tests.conftest import random_similarity
+
+N = 300
+
+
+@pytest.fixture
+def catalogue(rng):
+    names = pd.Index([f"p{i}" for i in range(N)])
+    matrices = [random_similarity(N, rng) for _ in range(3)]
+    spatial = SpatialIndex(
+        names[::-1],  # a different order than the engine
+        ORIGIN_LAT + rng.uniform(-0.05, 0.05, N),
+        ORIGIN_LON + rng.uniform(-0.05, 0.05, N),
+    )
+    return names, matrices, spatial
+
+
+def full_row_top(engine, spatial, pos, radius, top_n=5):
+    row = engine.row(pos)
+    nearby = spatial.query_radius(ORIGIN_LAT, ORIGIN_LON, radius)
+    rows = engine.index.get_indexer(nearby.index)
+    rows = rows[rows != pos]
+    return rows[top_n_indices(row[rows], top_n)]
+
+
+@pytest.mark.parametrize("radius", [0.5, 2.0, 10.0])
+def test_matches_full_row_then_filter(catalogue, radius):
+    names, matrices, spatial = catalogue
+    engine = SimilarityEngine(matrices, names)
+    result = nearby_recommendations(engine, spatial, "p0", (ORIGIN_LAT, ORIGIN_LON), radius)
+    expected = full_row_top(engine, spatial, 0, radius)
+    assert result["PropertyName"].tolist() == names[expected].tolist()
+    assert (result["distance_km"] <= radius).all()
+    assert "p0" not in result["PropertyName"].tolist()
+
+
+def test_topk_engine_scores_match_rows(catalogue):
+    names, matrices, spatial = catalogue
+    engine = SimilarityEngine([sparsify_topk(m, k=20) for m in matrices], names)
+    result = nearby_recommendations(engine, spatial, "p1", (ORIGIN_LAT, ORIGIN_LON), 10.0, top_n=10)
+    rows = names.get_indexer(result["PropertyName"])
+    np.testing.assert_allclose(result["SimilarityScore"], engine.row(1)[rows], atol=1e-6)
+
+
+def test_filters_need_a_price_filter(catalogue):
+    names, matrices, spatial = catalogue
+    engine = SimilarityEngine(matrices, names)
+    for filters in ({"configs": ["2 BHK"]}, {"min_price": 1.0}, {"max_price": 2.0}):
+        with pytest.raises(ValueError, match="price_filter"):
+            nearby_recommendations(engine, spatial, "p0", (ORIGIN_LAT, ORIGIN_LON), 2.0, **filters)
+
+
+def test_price_filter_mask():
+    names = pd.Index(["a", "b", "c"])
+    prices = pd.DataFrame({
+        "PropertyName": ["a", "a", "b", "c", "zzz"],
+        "config": ["2 BHK", "3 BHK", "3 BHK", "2 BHK", "2 BHK"],
+        "price_low": [1.0, 2.0, 3.0, np.nan, 1.0],
+        "price_high": [1.5, 2.5, 4.0, np.nan, 1.0],
+    })
+    price_filter = PriceFilter(prices, names)
+    rows = [0, 1, 2]
+    assert price_filter.mask(rows, ["2 BHK"]).tolist() == [True, False, True]
+    assert price_filter.mask(rows, None, min_price=2.2).tolist() == [True, True, False]
+    # Unpriced configurations never pass a price bound
+    assert price_filter.mask(rows, ["2 BHK"], max_price=10).tolist() == [True, False, False]
+    assert price_filter.mask(rows, ["9 BHK"]).tolist() == [False, False, False]
+
+
+def test_landmark_center_uses_scraped_distances(catalogue, rng):
+    names, matrices, _ = catalogue
+    engine = SimilarityEngine(matrices, names)
+    location_df = pd.DataFrame({"Mall": rng.uniform(0, 4000, N)}, index=names)
+    result = nearby_recommendations(engine, LandmarkDistances(location_df), "p2", ("Mall",), 2.0, top_n=N)
+
+    inside = location_df.index[(location_df["Mall"] < 2000) & (location_df.index != "p2")]
+    assert set(result["PropertyName"]) == set(inside)
+    np.testing.assert_allclose(result["distance_km"], location_df.loc[result["PropertyName"], "Mall"] / 1000)
+
+
+def test_equal_scores_rank_nearest_first(catalogue):
+    names, matrices, spatial = catalogue
+    # With K=1 nearly every candidate reads the same fill score
+    engine = SimilarityEngine([sparsify_topk(m, k=1) for m in matrices], names)
+    result = nearby_recommendations(engine, spatial, "p1", (ORIGIN_LAT, ORIGIN_LON), 10.0, top_n=40)
+
+    scores, distances = result["SimilarityScore"].to_numpy(), result["distance_km"].to_numpy()
+    assert np.all(np.diff(scores) <= 0)
+    tied = scores == scores[-1]
+    assert tied.sum() > 10
+    assert np.all(np.diff(distances[tied]) >= 0)
+    # The tied places go to the closest of all candidates with that score
+    nearby = spatial.query_radius(ORIGIN_LAT, ORIGIN_LON, 10.0).drop("p1", errors="ignore")
+    all_scores = engine.scores(1, names.get_indexer(nearby.index))
+    assert distances[tied].max() <= nearby[all_scores == scores[-1]].nsmallest(tied.sum()).max()
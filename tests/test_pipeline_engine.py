@@ -0,0 +1,152 @@
+import importlib.util
+import os
+
+import pytest
+
+from core.pipeline import engine
+from core.pipeline.__main__ import main
+from core.pipeline.engine import Stage
+from core.pipeline.stages import build_stages, resolve_facility_model
+from core.tables import NOTEBOOK_DATA_DIR
+
+
+@pytest.fixture(autouse=True)
+def _state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "STATE_DIR", str(tmp_path / "state"))
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def upper(inputs, outputs, suffix=""):
+    write(outputs["out"], read(inputs["src"]).upper() + suffix)
+
+
+def double(inputs, outputs):
+    write(outputs["out"], read(inputs["src"]) * 2)
+
+
+def broken(inputs, outputs):
+    write(outputs["out"], "partial")
+    raise RuntimeError("boom")
+
+
+def chain(tmp_path, first=upper, **params):
+    src, mid, out = (str(tmp_path / name) for name in ("src.txt", "mid.txt", "out.txt"))
+    if not os.path.exists(src):
+        write(src, "abc")
+    return [
+        Stage("double", double, {"src": mid}, {"out": out}),
+        Stage("upper", first, {"src": src}, {"out": mid}, params),
+    ]
+
+
+def statuses(results):
+    return {r.name: r.status for r in results}
+
+
+def test_stage_key_tracks_inputs_params_and_code(tmp_path):
+    memo = {}
+    base = chain(tmp_path)[1]
+    key = engine.stage_key(base, memo)
+    assert engine.stage_key(chain(tmp_path)[1], memo) == key
+    assert engine.stage_key(chain(tmp_path, suffix="!")[1], memo) != key
+    assert engine.stage_key(chain(tmp_path, first=double)[1], memo) != key
+
+    write(str(tmp_path / "src.txt"), "abd")
+    os.utime(str(tmp_path / "src.txt"), ns=(1, 1))
+    assert engine.stage_key(base, memo) != key
+
+
+def test_touch_without_change_keeps_key(tmp_path):
+    memo = {}
+    stage = chain(tmp_path)[1]
+    key = engine.stage_key(stage, memo)
+    os.utime(stage.inputs["src"], ns=(1, 1))
+    assert engine.stage_key(stage, memo) == key
+
+
+def test_run_orders_and_skips_fresh_stages(tmp_path):
+    stages = chain(tmp_path)
+    assert statuses(engine.run(stages, str(tmp_path), jobs=1, log=lambda _: None)) == {
+        "double": "built", "upper": "built",
+    }
+    assert read(str(tmp_path / "out.txt")) == "ABCABC"
+    assert statuses(engine.run(stages, str(tmp_path), jobs=1, log=lambda _: None)) == {
+        "double": "cached", "upper": "cached",
+    }
+    assert all(reason == "fresh" for _, reason in engine.plan(stages, str(tmp_path)))
+
+
+def test_changed_input_rebuilds_downstream(tmp_path):
+    engine.run(chain(tmp_path), str(tmp_path), jobs=1, log=lambda _: None)
+    write(str(tmp_path / "src.txt"), "xy")
+    assert [reason for _, reason in engine.plan(chain(tmp_path), str(tmp_path))] == ["changed", "upstream changes"]
+    results = engine.run(chain(tmp_path), str(tmp_path), jobs=1, log=lambda _: None)
+    assert statuses(results) == {"double": "built", "upper": "built"}
+    assert read(str(tmp_path / "out.txt")) == "XYXY"
+
+
+def test_edited_output_is_rebuilt(tmp_path):
+    engine.run(chain(tmp_path), str(tmp_path), jobs=1, log=lambda _: None)
+    write(str(tmp_path / "out.txt"), "tampered")
+    results = engine.run(chain(tmp_path), str(tmp_path), jobs=1, log=lambda _: None)
+    assert statuses(results) == {"double": "built", "upper": "cached"}
+
+
+def test_failure_blocks_downstream_and_leaves_no_output(tmp_path):
+    results = engine.run(chain(tmp_path, first=broken), str(tmp_path), jobs=1, log=lambda _: None)
+    assert statuses(results) == {"double": "blocked", "upper": "failed"}
+    assert "RuntimeError: boom" in [r for r in results if r.name == "upper"][0].error
+    assert sorted(os.listdir(tmp_path)) == ["src.txt", "state"]
+
+
+def test_missing_input_fails_stage(tmp_path):
+    stages = chain(tmp_path)
+    os.remove(str(tmp_path / "src.txt"))
+    results = engine.run(stages, str(tmp_path), jobs=1, log=lambda _: None)
+    assert statuses(results) == {"double": "blocked", "upper": "failed"}
+
+
+def test_worker_pool_matches_in_process(tmp_path):
+    results = engine.run(chain(tmp_path), str(tmp_path), jobs=2, log=lambda _: None)
+    assert statuses(results) == {"double": "built", "upper": "built"}
+    assert read(str(tmp_path / "out.txt")) == "ABCABC"
+
+
+def test_graph_errors(tmp_path):
+    stages = chain(tmp_path)
+    with pytest.raises(ValueError):
+        engine.run(stages + [Stage("again", double, {}, stages[1].outputs)], str(tmp_path), jobs=1)
+    with pytest.raises(ValueError):
+        engine.select(stages, ["nope"])
+    assert engine.select(stages, ["upper"]) == [stages[1]]
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_build_graph_only_writes_the_output_directory(tmp_path, dense):
+    stages = build_stages(NOTEBOOK_DATA_DIR, str(tmp_path), "tfidf", dense=dense)
+    engine.topological_order(stages)
+    for stage in stages:
+        assert all(os.path.dirname(p) == str(tmp_path) for p in stage.outputs.values()), stage
+
+
+def test_sbert_is_required_unless_tfidf_is_asked_for(tmp_path, monkeypatch, capsys):
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec",
+                        lambda name: None if name == "sentence_transformers" else real_find_spec(name))
+    with pytest.raises(ImportError, match="--facility-model tfidf"):
+        build_stages(NOTEBOOK_DATA_DIR, str(tmp_path))
+    with pytest.raises(SystemExit):
+        main(["--out-dir", str(tmp_path), "--dry-run"])
+    assert "sentence_transformers" in capsys.readouterr().err
+    assert resolve_facility_model("tfidf") == "tfidf"
+    with pytest.raises(ValueError):
+        resolve_facility_model("auto")
@@ -0,0 +1,148 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from core.artifacts import artifact_path
+from core.price_model import (
+    COMPACT_FILE, DEFAULT_TOLERANCE, MODEL_FILE, CompactModel, check_frame, default_model_path,
+    export_pipeline, file_sha256, load_model,
+)
+from core.pricing import (
+    CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERIC_COLUMNS, CachedPredictor, feature_key, validate_features,
+)
+
+pytest.importorskip("sklearn")
+xgboost = pytest.importorskip("xgboost")
+
+from sklearn.compose import ColumnTransformer  # noqa: E402
+from sklearn.linear_model import Ridge  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def features():
+    return validate_features(joblib.load(artifact_path("df.pkl")))
+
+
+def target(features):
+    rng = np.random.default_rng(0)
+    return np.log1p(features["built_up_area"] / 1000) + 0.1 * rng.random(len(features))
+
+
+def notebook_pipeline(regressor):
+    """The notebook's preprocessor_target layout."""
+    target_encoder = pytest.importorskip("category_encoders").TargetEncoder()
+    preprocessor = ColumnTransformer([
+        ("num", StandardScaler(), NUMERIC_COLUMNS),
+        ("cat_ord", OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1),
+         CATEGORICAL_COLUMNS),
+        ("cat_ohe_age", OneHotEncoder(drop="first", handle_unknown="ignore"), ["agePossession"]),
+        ("target_sector", target_encoder, ["sector"]),
+    ], remainder="passthrough")
+    return Pipeline([("preprocessor", preprocessor), ("regressor", regressor)])
+
+
+@pytest.fixture(scope="module")
+def fitted(features):
+    model = xgboost.XGBRegressor(n_estimators=120, max_depth=6, learning_rate=0.1)
+    return notebook_pipeline(model).fit(features, target(features))
+
+
+def test_xgboost_parity_including_unseen_categories(fitted, features):
+    X = check_frame(features)
+    X.loc[:20, "sector"] = "nowhere"
+    X.loc[10:30, "agePossession"] = "??"
+    diff = np.abs(export_pipeline(fitted).predict(X) - fitted.predict(X))
+    # 3e-6 on the reference model
+    assert diff.max() < DEFAULT_TOLERANCE
+
+
+def test_rows_path_matches_frame_path(fitted, features):
+    compact = export_pipeline(fitted)
+    head = features.head(30)
+    keys = [feature_key(r) for r in head.to_dict("records")]
+    np.testing.assert_allclose(compact.predict_rows(keys, FEATURE_COLUMNS), compact.predict(head))
+
+
+def test_save_load_round_trip(fitted, features, tmp_path):
+    path = str(tmp_path / "price_model.npz")
+    export_pipeline(fitted, source_hash="abc").save(path)
+    loaded = load_model(path)
+    assert isinstance(loaded, CompactModel) and loaded.source_hash == "abc"
+    np.testing.assert_array_equal(loaded.predict(features), export_pipeline(fitted).predict(features))
+
+
+def test_stale_export_is_not_served(fitted, features, tmp_path):
+    pickled, compact = str(tmp_path / MODEL_FILE), str(tmp_path / COMPACT_FILE)
+    joblib.dump(fitted, pickled)
+    export_pipeline(fitted, file_sha256(pickled)).save(compact)
+    assert default_model_path(str(tmp_path)) == compact
+    predictor = CachedPredictor(data_dir=str(tmp_path))
+    assert predictor.active_path == compact
+    row = features.iloc[0].to_dict()
+    before = predictor.predict_one(row)
+
+    # A retrained pickle, older on disk than the export it replaces
+    ridge = Pipeline([
+        ("pre", ColumnTransformer([("num", StandardScaler(), NUMERIC_COLUMNS)])),
+        ("reg", Ridge()),
+    ]).fit(features, target(features) + 1.0)
+    joblib.dump(ridge, pickled)
+    st = os.stat(compact)
+    os.utime(pickled, ns=(st.st_atime_ns, st.st_mtime_ns - 10_000_000))
+    assert default_model_path(str(tmp_path)) == pickled
+    after = predictor.predict_one(row)
+    assert predictor.active_path == pickled
+    assert predictor.model_hash == file_sha256(pickled)
+    assert after == pytest.approx(float(np.expm1(ridge.predict(features.head(1)))[0]))
+    assert after != pytest.approx(before)
+
+
+def test_sparse_output_and_linear_models(features):
+    X = check_frame(features)
+    y = target(features)
+    for regressor, sparse_threshold in [(Ridge(), 0.0), (xgboost.XGBRegressor(n_estimators=30), 0.9)]:
+        preprocessor = ColumnTransformer([
+            ("num", StandardScaler(), NUMERIC_COLUMNS),
+            ("ohe", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_COLUMNS),
+        ], sparse_threshold=sparse_threshold)
+        pipeline = Pipeline([("pre", preprocessor), ("reg", regressor)]).fit(features, y)
+        diff = np.abs(export_pipeline(pipeline).predict(X) - pipeline.predict(X))
+        assert diff.max() < DEFAULT_TOLERANCE
+
+
+@pytest.mark.parametrize("encoder", [
+    OneHotEncoder(drop="first", handle_unknown="error"),
+    OrdinalEncoder(handle_unknown="error"),
+])
+def test_unknown_categories_rejected_like_the_pipeline(features, encoder):
+    pipeline = Pipeline([
+        ("pre", ColumnTransformer([
+            ("num", StandardScaler(), NUMERIC_COLUMNS),
+            ("cat", encoder, CATEGORICAL_COLUMNS),
+        ])),
+        ("reg", Ridge()),
+    ]).fit(features, target(features))
+    compact = export_pipeline(pipeline)
+    X = check_frame(features)
+    diff = np.abs(compact.predict(X) - pipeline.predict(X))
+    assert diff.max() < DEFAULT_TOLERANCE
+
+    X.loc[3, "sector"] = "nowhere"
+    for model in (pipeline, compact):
+        with pytest.raises(ValueError, match=r"Found unknown categories \['nowhere'\]"):
+            model.predict(X)
+
+
+def test_unsupported_steps_raise(features):
+    from sklearn.preprocessing import PolynomialFeatures
+
+    pipeline = Pipeline([
+        ("pre", ColumnTransformer([("poly", PolynomialFeatures(), NUMERIC_COLUMNS)])),
+        ("reg", Ridge()),
+    ]).fit(features, target(features))
+    with pytest.raises(ValueError, match="Unsupported transformer"):
+        export_pipeline(pipeline)
@@ -0,0 +1,37 @@
+import joblib
+import numpy as np
+import pytest
+
+from core.artifacts import artifact_path
+from core.price_surface import PriceSurface, build_surface
+from tests.test_pricing import AreaModel
+
+
+@pytest.fixture(scope="module")
+def surface():
+    df = joblib.load(artifact_path("df.pkl"))
+    return build_surface(AreaModel(), df, max_bhk=3, area_points=8)
+
+
+def test_grid_matches_model(surface):
+    # AreaModel prices are area / 1000 Cr, linear in area
+    curve = surface.curve(surface.sectors[0], "flat", 2, surface.areas)
+    np.testing.assert_allclose(curve, surface.areas / 1000, rtol=1e-5)
+    np.testing.assert_allclose(
+        surface.curve(surface.sectors[0], "flat", 2, [1234.0]), [1.234], rtol=1e-5
+    )
+
+
+def test_unknown_bhk_raises(surface):
+    with pytest.raises(KeyError):
+        surface.curve(surface.sectors[0], "flat", 9, [1000.0])
+
+
+def test_save_load_round_trip(surface, tmp_path):
+    surface.model_hash = "abc"
+    path = str(tmp_path / "surface.npz")
+    surface.save(path)
+    loaded = PriceSurface.load(path)
+    assert loaded.model_hash == "abc" and loaded.sectors == surface.sectors
+    frame = loaded.curves(loaded.sectors[1], "house", [500.0, 900.0])
+    assert list(frame.columns) == ["1 BHK", "2 BHK", "3 BHK"]
@@ -0,0 +1,127 @@
+import io
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.pricing import (
+    FEATURE_COLUMNS, CachedPredictor, feature_key, predict_frame, predict_key, validate_features,
+)
+
+ROW = {
+    "property_type": "flat", "sector": "sector 45", "bedRoom": 3, "bathroom": 3,
+    "balcony": "3+", "agePossession": "New Property", "built_up_area": 1500.0,
+    "servant room": 0, "store room": 0, "furnishing_type": "unfurnished",
+    "luxury_category": "Low", "floor_category": "Mid Floor",
+}
+
+
+class AreaModel:
+    """Stand-in pipeline: log price grows with the built-up area."""
+
+    def __init__(self, scale=1000.0):
+        self.scale = scale
+        self.calls = 0
+
+    def predict(self, df):
+        self.calls += 1
+        return np.log1p(df["built_up_area"].to_numpy() / self.scale)
+
+
+def test_validate_features_reports_missing_columns():
+    with pytest.raises(ValueError, match="Missing columns: sector"):
+        validate_features(pd.DataFrame([ROW]).drop(columns="sector"))
+
+
+def test_validate_features_reports_bad_numbers():
+    df = pd.DataFrame([ROW, {**ROW, "bedRoom": "three"}, {**ROW, "bathroom": None}])
+    with pytest.raises(ValueError, match=r"2 row\(s\).*first rows: 1, 2"):
+        validate_features(df)
+
+
+def test_validate_features_reports_empty_categories():
+    text = pd.DataFrame([ROW] * 4).to_csv(index=False).splitlines()
+    text[2] = text[2].replace("sector 45", "")  # an empty CSV cell reads as NaN
+    df = pd.read_csv(io.StringIO("\n".join(text)))
+    df.loc[3, "floor_category"] = "  "
+    with pytest.raises(ValueError, match=r"2 row\(s\) with empty values in sector, floor_category.*first rows: 1, 3"):
+        validate_features(df)
+
+
+def test_empty_category_rejected_for_single_rows():
+    class RowModel(AreaModel):
+        def predict_rows(self, rows, columns):
+            return self.predict(pd.DataFrame(rows, columns=columns))
+
+    key = feature_key({**ROW, "sector": np.nan})
+    assert key[FEATURE_COLUMNS.index("sector")] == ""
+    for model in (AreaModel(), RowModel()):
+        with pytest.raises(ValueError, match="empty values in sector"):
+            predict_key(model, key)
+
+
+def test_validate_features_normalizes_types():
+    out = validate_features(pd.DataFrame([{**ROW, "balcony": 2, "extra": 1}]))
+    assert list(out.columns) == FEATURE_COLUMNS
+    assert out["balcony"].iloc[0] == "2"
+    assert out["bedRoom"].dtype == np.float64
+
+
+def test_feature_key_normalization():
+    assert feature_key(ROW) == feature_key({**ROW, "bedRoom": "3", "sector": " sector 45 "})
+
+
+def test_predict_frame_in_chunks():
+    df = pd.DataFrame([{**ROW, "built_up_area": a} for a in (1000.0, 2000.0, 3000.0)])
+    priced, rate = predict_frame(AreaModel(), df, chunk_size=2)
+    np.testing.assert_allclose(priced["predicted_price"], [1.0, 2.0, 3.0])
+    assert rate > 0
+
+
+def save_model(path, model):
+    joblib.dump(model, path)
+    # Make sure the next stat sees a different mtime even on coarse clocks
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+def test_cached_predictor_hits_and_lru(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_model(path, AreaModel())
+    predictor = CachedPredictor(path, maxsize=2)
+
+    assert predictor.predict_one(ROW) == pytest.approx(1.5)
+    assert predictor.predict_one({**ROW, "bedRoom": "3.0"}) == pytest.approx(1.5)
+    predictor.predict_one({**ROW, "built_up_area": 2000})
+    predictor.predict_one({**ROW, "built_up_area": 3000})
+    stats = predictor.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 3, 2)
+
+    # The first entry was evicted
+    predictor.predict_one(ROW)
+    assert predictor.stats()["misses"] == 4
+
+
+def test_cached_predictor_reloads_changed_model(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_model(path, AreaModel(1000.0))
+    predictor = CachedPredictor(path)
+    assert predictor.predict_one(ROW) == pytest.approx(1.5)
+    old_hash = predictor.model_hash
+
+    save_model(path, AreaModel(500.0))
+    assert predictor.predict_one(ROW) == pytest.approx(3.0)
+    assert predictor.model_hash != old_hash
+    assert predictor.stats()["size"] == 1
+
+
+def test_cached_predictor_keeps_cache_when_only_mtime_changes(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_model(path, AreaModel())
+    predictor = CachedPredictor(path)
+    predictor.predict_one(ROW)
+    save_model(path, AreaModel())  # same bytes, new mtime
+    predictor.predict_one(ROW)
+    assert predictor.stats()["hits"] == 1
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from core.search import NameIndex, normalize, property_index, trigrams
+
+NAMES = ["M3M Crown", "M3M Golf Estate", "DLF The Crest", "DLF The Camellias",
+         "Sobha City", "Signature Global City 92", "Ireo Skyon", "Emaar Palm Heights"]
+
+
+@pytest.fixture
+def index():
+    return NameIndex(NAMES + [None, "  ", "Sobha City"])
+
+
+def test_blank_and_duplicate_names_dropped(index):
+    assert len(index) == len(NAMES)
+
+
+def test_empty_query_keeps_plain_sorted_order(index):
+    assert index.search("", 3) == sorted(NAMES)[:3]
+
+
+def test_exact_and_prefix_matches_rank_first(index):
+    assert index.search("sobha city")[0] == "Sobha City"
+    assert index.search("m3m")[:2] == ["M3M Crown", "M3M Golf Estate"]
+    assert index.search("the cr")[0] == "DLF The Crest"
+
+
+def test_typos_still_match(index):
+    assert index.search("Sobah City", 3)[0] == "Sobha City"
+    assert index.search("emar palm", 3)[0] == "Emaar Palm Heights"
+    assert index.search("zzzzqqq") == []
+
+
+def test_normalize_and_open_trigrams():
+    assert normalize("  DLF-The_Crest! ") == "dlf the crest"
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+    assert trigrams("ab", closed=False) == {"  a", " ab"}
+
+
+def test_one_typo_prefix_hit_rate_on_projects():
+    """One-typo prefixes of real project names find the name in the top 5."""
+    from benchmarks.bench_search import typo
+
+    index = property_index()
+    rng = random.Random(0)
+    hits = 0
+    for _ in range(300):
+        name = rng.choice(index.names)
+        query = typo(name[:rng.randint(min(4, len(name)), len(name))], rng)
+        hits += name in index.search(query, 5)
+    assert hits / 300 >= 0.75
@@ -0,0 +1,83 @@
+import asyncio
+
+import numpy as np
+
+from core.service import LocalClient, PredictionService
+from tests.test_pricing import ROW, AreaModel
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_predict_single_and_batch():
+    client = LocalClient(PredictionService(AreaModel()))
+    status, body = run(client.post("/predict", ROW))
+    assert status == 200
+    np.testing.assert_allclose(body["predictions"], [1.5])
+
+    records = [{**ROW, "built_up_area": a} for a in (1000, 3000)]
+    status, body = run(client.post("/predict", {"instances": records}))
+    assert status == 200
+    np.testing.assert_allclose(body["predictions"], [1.0, 3.0])
+
+
+def test_concurrent_requests_share_a_batch():
+    model = AreaModel()
+    service = PredictionService(model, max_wait_ms=50)
+    client = LocalClient(service)
+
+    async def many():
+        return await asyncio.gather(*[
+            client.post("/predict", {**ROW, "built_up_area": 1000 * (i + 1)}) for i in range(8)
+        ])
+
+    results = run(many())
+    np.testing.assert_allclose([body["predictions"][0] for _, body in results], np.arange(1.0, 9.0))
+    assert model.calls < 8
+
+
+def test_bad_requests():
+    client = LocalClient(PredictionService(AreaModel()))
+    assert run(client.post("/predict", []))[0] == 400
+    assert run(client.post("/predict", {**ROW, "bedRoom": "x"}))[0] == 400
+    assert run(client.get("/health")) == (200, {"status": "ok"})
+    assert run(client.get("/nope"))[0] == 404
+
+
+class PickyModel(AreaModel):
+    """Rejects one sector like an encoder with ``handle_unknown="error"``."""
+
+    def predict(self, df):
+        if (df["sector"] == "sector 999").any():
+            raise ValueError("Found unknown categories ['sector 999']")
+        return super().predict(df)
+
+
+class BrokenModel(AreaModel):
+    def predict(self, df):
+        raise RuntimeError("model exploded")
+
+
+def test_bad_request_fails_only_its_own_caller():
+    service = PredictionService(PickyModel(), max_wait_ms=50)
+    client = LocalClient(service)
+
+    async def mixed():
+        return await asyncio.gather(*[
+            client.post("/predict", {**ROW, "sector": "sector 999"} if i == 2 else ROW) for i in range(5)
+        ])
+
+    results = run(mixed())
+    assert [status for status, _ in results] == [200, 200, 400, 200, 200]
+    assert "unknown categories" in results[2][1]["error"]
+    np.testing.assert_allclose([body["predictions"][0] for i, (_, body) in enumerate(results) if i != 2], 1.5)
+
+
+def test_model_errors_return_json_500(tmp_path):
+    status, body = run(LocalClient(PredictionService(BrokenModel())).post("/predict", ROW))
+    assert status == 500 and "RuntimeError: model exploded" in body["error"]
+
+    missing = PredictionService(model_path=str(tmp_path / "missing.pkl"))
+    status, body = run(LocalClient(missing).post("/predict", ROW))
+    assert status == 500 and "error" in body
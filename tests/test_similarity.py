@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import similarity
+from core.artifacts import load_pickle
+from core.similarity import DEFAULT_WEIGHTS, SimilarityEngine, load_engine, top_n_indices
+from core.topk import save_topk, sparsify_topk, topk_path
+from tests.conftest import random_similarity
+
+
+def full_sort_top(scores, top_n, exclude=None):
+    order = [i for i in np.argsort(-scores, kind="stable") if i != exclude]
+    return np.array(order[:top_n], dtype=np.intp)
+
+
+@pytest.mark.parametrize("top_n", [1, 5, 37, 200])
+def test_top_n_indices_matches_full_sort(rng, top_n):
+    scores = rng.random(100)
+    for exclude in (None, 3):
+        top = top_n_indices(scores, top_n, exclude=exclude)
+        np.testing.assert_array_equal(top, full_sort_top(scores, top_n, exclude))
+
+
+def test_top_n_indices_edge_cases():
+    assert top_n_indices([0.5], 3, exclude=0).size == 0
+    assert top_n_indices([], 3).size == 0
+    assert top_n_indices([0.1, 0.9], 0).size == 0
+
+
+def engine(rng, n=60):
+    matrices = [random_similarity(n, rng) for _ in range(3)]
+    return SimilarityEngine(matrices, pd.Index([f"p{i}" for i in range(n)]))
+
+
+def test_row_matches_blended_matrix(rng):
+    e = engine(rng)
+    weights = (0.3, 1.0, 0.0)
+    row = e.row(7, weights)
+    np.testing.assert_allclose(row, e.blended(weights)[7])
+    # Served from the cached blend once it exists
+    np.testing.assert_allclose(e.row(7, weights), row)
+
+
+def test_blended_matrix_is_cached_per_weights(rng):
+    e = engine(rng)
+    weights = (1.0, 0.5, 0.0)
+    blended = e.blended(weights)
+    assert e.blended([1, 0.5, 0]) is blended
+    assert not blended.flags.writeable
+    np.testing.assert_allclose(blended, sum(w * m for w, m in zip(weights, e.matrices)))
+
+
+def test_scores_match_row_entries(rng):
+    e = engine(rng)
+    rows = np.array([0, 5, 9, 59])
+    np.testing.assert_allclose(e.scores(7, rows), e.row(7)[rows])
+
+
+def test_recommend_excludes_query(rng):
+    e = engine(rng)
+    names, scores = e.recommend("p4", top_n=10)
+    assert "p4" not in names
+    assert len(names) == 10
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_weights_length_checked(rng):
+    with pytest.raises(ValueError):
+        engine(rng).row(0, (1.0, 1.0))
+
+
+def test_sparse_engine_matches_topk_blend(rng):
+    matrices = [random_similarity(80, rng) for _ in range(3)]
+    names = pd.Index(range(80))
+    sparse_engine = SimilarityEngine([sparsify_topk(m, k=10) for m in matrices], names)
+    assert sparse_engine.is_sparse
+    row = sparse_engine.row(3)
+    np.testing.assert_allclose(sparse_engine.blended().rows([3])[0], row, atol=1e-6)
+    np.testing.assert_allclose(sparse_engine.scores(3, [1, 2, 50]), row[[1, 2, 50]], atol=1e-6)
+
+
+def test_topk_recall_on_shipped_matrices():
+    """Recall@5 of the K=50 files against the exact dense blend (0.885)."""
+    index = load_pickle("distance_location.pkl").index
+    exact = load_engine(index, use_topk=False)
+    approx = load_engine(index, use_topk=True)
+    assert approx.is_sparse and not exact.is_sparse
+
+    hits = 0
+    for pos in range(len(index)):
+        truth = top_n_indices(exact.row(pos, DEFAULT_WEIGHTS), 5, exclude=pos)
+        found = top_n_indices(approx.row(pos, DEFAULT_WEIGHTS), 5, exclude=pos)
+        hits += len(set(truth) & set(found))
+    assert hits / (5 * len(index)) >= 0.88
+
+
+def test_default_engine_is_exact_for_small_catalogues(monkeypatch):
+    index = load_pickle("distance_location.pkl").index
+    assert not load_engine(index).is_sparse
+    monkeypatch.setattr(similarity, "TOPK_MIN_ROWS", len(index))
+    assert load_engine(index).is_sparse
+
+
+def test_default_engine_falls_back_to_topk_without_dense(tmp_path, rng):
+    for name in similarity.SIMILARITY_FILES:
+        save_topk(topk_path(name, str(tmp_path)), sparsify_topk(random_similarity(12, rng), k=3))
+    assert load_engine(pd.RangeIndex(12), str(tmp_path)).is_sparse
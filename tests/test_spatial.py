@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.artifacts import load_pickle
+from core.spatial import (
+    EARTH_RADIUS_KM, MISSING_DISTANCE_M, ORIGIN_LAT, ORIGIN_LON, LandmarkDistances, SpatialIndex,
+    _from_km, _to_km, multilaterate,
+)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.fixture
+def index(rng):
+    n = 500
+    lat = ORIGIN_LAT + rng.uniform(-0.1, 0.1, n)
+    lon = ORIGIN_LON + rng.uniform(-0.1, 0.1, n)
+    return SpatialIndex([f"p{i}" for i in range(n)], lat, lon), lat, lon
+
+
+@pytest.mark.parametrize("radius", [0.5, 2.0, 8.0])
+def test_radius_query_matches_brute_force(index, radius):
+    spatial, lat, lon = index
+    distances = haversine_km(ORIGIN_LAT, ORIGIN_LON, lat, lon)
+    result = spatial.query_radius(ORIGIN_LAT, ORIGIN_LON, radius)
+
+    expected = np.flatnonzero(distances <= radius)
+    assert set(result.index) == {f"p{i}" for i in expected}
+    assert result.is_monotonic_increasing
+    np.testing.assert_allclose(result.to_numpy(), np.sort(distances[expected]), atol=1e-9)
+
+
+def test_positions_in_is_cached_per_index(index):
+    spatial = index[0]
+    names = pd.Index(["p3", "missing", "p0"])
+    positions = spatial.positions_in(names)
+    assert positions[[0, 3]].tolist() == [2, 0]
+    assert (positions == -1).sum() == len(spatial.names) - 2
+    assert spatial.positions_in(names) is positions
+
+
+def test_km_projection_round_trip():
+    lat, lon = _from_km(_to_km([28.40, 28.50], [77.00, 77.10]))
+    np.testing.assert_allclose(lat, [28.40, 28.50])
+    np.testing.assert_allclose(lon, [77.00, 77.10])
+
+
+def test_multilaterate_recovers_point(rng):
+    anchors = rng.uniform(-5, 5, (6, 2))
+    truth = np.array([1.2, -0.7])
+    distances = np.hypot(*(anchors - truth).T)
+    np.testing.assert_allclose(multilaterate(anchors, distances), truth, atol=1e-4)
+    assert multilaterate(anchors[:0], distances[:0]) is None
+
+
+@pytest.mark.parametrize("radius", [1.0, 2.0, 60.0])
+def test_landmark_queries_recall_every_scraped_distance(radius):
+    location_df = load_pickle("distance_location.pkl")
+    landmarks = LandmarkDistances(location_df)
+    for landmark in location_df.columns:
+        column = location_df[landmark]
+        expected = column[(column < radius * 1000) & (column < MISSING_DISTANCE_M)] / 1000
+        result = landmarks.query_radius(landmark, radius)
+        assert set(result.index) == set(expected.index)
+        np.testing.assert_allclose(result.to_numpy(), np.sort(expected.to_numpy()))
@@ -0,0 +1,61 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import DATA_DIR
+from core.tables import apply_schema, compact_table, parquet_path, read_table, table_path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    shutil.copy(os.path.join(DATA_DIR, "new_latlong.csv"), tmp_path)
+    return str(tmp_path)
+
+
+def test_schema_keeps_values(data_dir):
+    raw = pd.read_csv(os.path.join(data_dir, "new_latlong.csv"))
+    compact = compact_table(raw, "new_latlong.csv")
+    assert "coordinates" not in compact.columns
+    assert compact["bedRoom"].dtype == np.int8
+    assert isinstance(compact["sector"].dtype, pd.CategoricalDtype)
+    np.testing.assert_allclose(compact["price"], raw["price"], rtol=1e-6)
+    assert (compact["sector"].astype(str) == raw["sector"].astype(str)).all()
+
+
+def test_downcast_overflow_raises():
+    with pytest.raises(ValueError):
+        apply_schema(pd.DataFrame({"n": [1, 300]}), {"n": "int8"})
+    with pytest.raises(ValueError):
+        apply_schema(pd.DataFrame({"n": [1]}), {"m": "int8"})
+
+
+def test_read_table_converts_once_and_selects_columns(data_dir):
+    df = read_table("new_latlong.csv", columns=["sector", "price"], data_dir=data_dir)
+    assert list(df.columns) == ["sector", "price"]
+    parquet = parquet_path(os.path.join(data_dir, "new_latlong.csv"))
+    assert table_path("new_latlong.csv", data_dir) == parquet
+    mtime = os.path.getmtime(parquet)
+    read_table("new_latlong.csv", data_dir=data_dir)
+    assert os.path.getmtime(parquet) == mtime
+
+
+def test_newer_csv_regenerates_parquet(data_dir):
+    csv = os.path.join(data_dir, "new_latlong.csv")
+    read_table("new_latlong.csv", data_dir=data_dir)
+    df = pd.read_csv(csv).head(10)
+    df.to_csv(csv, index=False)
+    os.utime(csv, (os.path.getmtime(parquet_path(csv)) + 10,) * 2)
+    assert len(read_table("new_latlong.csv", data_dir=data_dir)) == 10
+
+
+def test_orphaned_parquet_is_not_served(data_dir):
+    csv = os.path.join(data_dir, "new_latlong.csv")
+    read_table("new_latlong.csv", data_dir=data_dir)
+    os.remove(csv)
+    assert os.path.exists(parquet_path(csv))
+    assert table_path("new_latlong.csv", data_dir) == csv
+    with pytest.raises(FileNotFoundError):
+        read_table("new_latlong.csv", data_dir=data_dir)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from core.topk import TopKMatrix, extend_topk, load_topk, save_topk, sparsify_topk
+from tests.conftest import random_similarity
+
+
+def test_sparsify_keeps_exact_top_k(rng):
+    dense = random_similarity(50, rng)
+    topk = sparsify_topk(dense, k=7, block_size=16)
+    approx = topk.rows(np.arange(50))
+    for row in range(50):
+        others = np.delete(np.arange(50), row)
+        expected = others[np.argsort(-dense[row, others])[:7]]
+        kept = topk.residuals[row].indices
+        assert set(kept) == set(expected)
+        np.testing.assert_allclose(approx[row, kept], dense[row, kept], atol=1e-6)
+        # Everything else reads as the mean of the dropped entries
+        dropped = np.setdiff1d(others, kept)
+        assert topk.fill[row] == pytest.approx(dense[row, dropped].mean())
+
+
+def test_block_size_does_not_change_result(rng):
+    dense = random_similarity(40, rng)
+    a = sparsify_topk(dense, k=5, block_size=3).rows(np.arange(40))
+    b = sparsify_topk(dense, k=5, block_size=1024).rows(np.arange(40))
+    np.testing.assert_array_equal(a, b)
+
+
+def test_entries_match_rows(rng):
+    topk = sparsify_topk(random_similarity(30, rng), k=4)
+    cols = np.array([29, 0, 5, 5, 17])
+    for row in (0, 11, 29):
+        np.testing.assert_allclose(topk.entries(row, cols), topk.rows([row])[0][cols])
+
+
+def test_entries_with_unsorted_indices(rng):
+    topk = sparsify_topk(random_similarity(20, rng), k=3)
+    shuffled = topk.residuals.copy()
+    for row in range(20):
+        start, stop = shuffled.indptr[row], shuffled.indptr[row + 1]
+        shuffled.indices[start:stop] = shuffled.indices[start:stop][::-1]
+        shuffled.data[start:stop] = shuffled.data[start:stop][::-1]
+    shuffled.has_sorted_indices = False
+    again = TopKMatrix(shuffled, topk.fill)
+    np.testing.assert_allclose(again.entries(4, np.arange(20)), topk.rows([4])[0])
+
+
+def test_blend_is_exact_in_topk_space(rng):
+    mats = [sparsify_topk(random_similarity(25, rng), k=4) for _ in range(3)]
+    weights = (0.5, 0.8, 1.0)
+    blended = TopKMatrix.blend(weights, mats)
+    expected = sum(w * m.rows(np.arange(25)) for w, m in zip(weights, mats))
+    np.testing.assert_allclose(blended.rows(np.arange(25)), expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("n, m, k", [(60, 5, 7), (40, 40, 10), (10, 3, 20), (20, 3, 5)])
+def test_extend_matches_sparsify_of_grown_matrix(rng, n, m, k):
+    full = random_similarity(n + m, rng)
+    extended = extend_topk(sparsify_topk(full[:n, :n], k=k), full[n:], k=k)
+    expected = sparsify_topk(full, k=k)
+    np.testing.assert_array_equal(extended.residuals.indices, expected.residuals.indices)
+    np.testing.assert_allclose(extended.rows(np.arange(n + m)), expected.rows(np.arange(n + m)), atol=1e-6)
+
+
+def test_extend_can_shrink_but_not_grow_k(rng):
+    full = random_similarity(25, rng)
+    shrunk = extend_topk(sparsify_topk(full[:20, :20], k=5), full[20:], k=3)
+    np.testing.assert_allclose(shrunk.rows(np.arange(25)), sparsify_topk(full, k=3).rows(np.arange(25)), atol=1e-6)
+    with pytest.raises(ValueError, match="rebuild"):
+        extend_topk(sparsify_topk(full[:20, :20], k=3), full[20:], k=5)
+    with pytest.raises(ValueError):
+        extend_topk(sparsify_topk(full[:20, :20], k=3), full[20:, :24], k=3)
+
+
+def test_save_load_round_trip(tmp_path, rng):
+    topk = sparsify_topk(random_similarity(15, rng), k=3)
+    path = str(tmp_path / "m_topk.npz")
+    save_topk(path, topk)
+    loaded = load_topk(path)
+    np.testing.assert_allclose(loaded.rows(np.arange(15)), topk.rows(np.arange(15)), atol=1e-6)
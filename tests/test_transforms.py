@@ -0,0 +1,87 @@
+"""The pipeline transforms reproduce the shipped ``dataset/`` files."""
+import io
+import os
+import pickle
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import DATA_DIR
+from core.pipeline import transforms
+from tests.conftest import RAW_DIR
+
+
+def shipped(name):
+    return os.path.join(DATA_DIR, name)
+
+
+def csv_text(df):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def apartments():
+    return pd.read_csv(os.path.join(RAW_DIR, "appartments.csv"))
+
+
+@pytest.fixture(scope="module")
+def new_latlong():
+    properties = pd.read_csv(os.path.join(RAW_DIR, "gurgaon_properties_missing_value_treated.csv"))
+    latlong = pd.read_csv(os.path.join(RAW_DIR, "latlong.csv"))
+    return transforms.attach_coordinates(properties, latlong)
+
+
+def test_new_latlong_byte_identical(new_latlong):
+    with open(shipped("new_latlong.csv"), encoding="utf-8") as f:
+        assert csv_text(new_latlong) == f.read()
+
+
+def test_sector_stats_byte_identical(new_latlong):
+    with open(shipped("sector_stats.csv"), encoding="utf-8") as f:
+        assert csv_text(transforms.sector_stats(new_latlong)) == f.read()
+
+
+def test_sector_stats_from_running_totals(new_latlong):
+    half = len(new_latlong) // 2
+    totals = transforms.add_totals(
+        transforms.sector_totals(new_latlong.iloc[:half]),
+        transforms.sector_totals(new_latlong.iloc[half:]),
+    )
+    pd.testing.assert_frame_equal(
+        transforms.stats_from_totals(totals).reset_index(drop=True),
+        transforms.sector_stats(new_latlong).reset_index(drop=True),
+        check_exact=False, rtol=1e-10,
+    )
+
+
+def test_model_features_equal_df_pkl():
+    properties = pd.read_csv(os.path.join(RAW_DIR, "gurgaon_properties_missing_value_treated.csv"))
+    pd.testing.assert_frame_equal(transforms.model_features(properties), joblib.load(shipped("df.pkl")))
+
+
+def test_landmark_distances_equal_distance_location_pkl(apartments):
+    with open(shipped("distance_location.pkl"), "rb") as f:
+        expected = pickle.load(f)
+    pd.testing.assert_frame_equal(transforms.landmark_distances(apartments), expected)
+
+
+def test_price_similarity_matches_shipped(apartments):
+    with open(shipped("price_based.pkl"), "rb") as f:
+        expected = pickle.load(f)
+    actual = transforms.standardized_cosine(transforms.price_features(apartments))
+    np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+
+def test_extend_similarity_layout(rng):
+    matrix = rng.random((3, 3))
+    new_rows = rng.random((2, 5))
+    out = transforms.extend_similarity(matrix, new_rows)
+    np.testing.assert_array_equal(out[:3, :3], matrix)
+    np.testing.assert_array_equal(out[3:], new_rows)
+    np.testing.assert_array_equal(out[:3, 3:], new_rows[:, :3].T)
+    with pytest.raises(ValueError):
+        transforms.extend_similarity(matrix, new_rows[:, :4])
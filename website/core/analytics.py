@@ -0,0 +1,164 @@
+"""Summary tables behind the Analytic page.
+
+``build_aggregates`` is pure: it never modifies its inputs and returns an
+immutable ``AnalyticsBundle``, so the page can cache it once and only
+re-render charts on reruns.
+"""
+from typing import NamedTuple
+
+import pandas as pd
+
+from core.binning import AREA_BINS, FLOOR_BINS, assign_bins
+
+AMENITY_COLS = [
+    "study room",
+    "servant room",
+    "store room",
+    "pooja room",
+    "others"
+]
+
+FURNISHING_MAP = {
+    0: "Unfurnished",
+    1: "Semi-Furnished",
+    2: "Fully Furnished"
+}
+
+# Columns of new_latlong.csv / gurgaon_properties.csv the page reads
+MAIN_COLUMNS = [
+    "sector",
+    "price",
+    "price_per_sqft",
+    "bedRoom",
+    "bathroom",
+    "balcony",
+    "floorNum",
+    "agePossession",
+    "built_up_area",
+    *AMENITY_COLS,
+    "furnishing_type",
+    "luxury_score"
+]
+
+PROPERTY_COLUMNS = ["features"]
+
+# Excluded from the correlation heatmap
+CORR_EXCLUDE_COLS = [
+    "price_per_sqft",
+    "latitude",
+    "longitude"
+]
+
+
+class AnalyticsBundle(NamedTuple):
+    floor_stats: pd.DataFrame
+    area_stats: pd.DataFrame
+    corr_matrix: pd.DataFrame
+    bhk_df: pd.DataFrame
+    furn_df: pd.DataFrame
+    age_df: pd.DataFrame
+    balcony_df: pd.DataFrame
+    amenity_stats: pd.Series
+    feature_sector_df: pd.DataFrame
+    sector_list: tuple
+
+
+# ----------------------------------
+# RANGE STATS
+# ----------------------------------
+def range_stats(main_df, column, spec, name):
+    """Listing count and average price (Cr) per range of ``column``.
+
+    Only ranges that contain listings are returned, in range order.
+    """
+    ranges = assign_bins(main_df[column], spec).rename(name)
+    # Averages in float64 whatever the stored precision
+    stats = (
+        main_df["price"]
+        .astype("float64")
+        .groupby(ranges, observed=True)
+        .agg(count="count", avg_price="mean")
+        .reset_index()
+    )
+    stats["avg_price_cr"] = stats["avg_price"].round(2)
+    return stats
+
+
+# ----------------------------------
+# DISTRIBUTIONS
+# ----------------------------------
+def value_count_frame(series, columns):
+    counts = series.value_counts().reset_index()
+    counts.columns = columns
+    return counts
+
+
+def build_aggregates(main_df, feature_df):
+    """All derived tables for the Analytic page from the raw frames."""
+    floor_stats = range_stats(main_df, "floorNum", FLOOR_BINS, "floor_range")
+    area_stats = range_stats(main_df, "built_up_area", AREA_BINS, "area_range")
+
+    corr_matrix = (
+        main_df
+        .select_dtypes(include="number")
+        .drop(columns=CORR_EXCLUDE_COLS, errors="ignore")
+        .corr()
+        .round(2)
+    )
+
+    bhk_df = (
+        main_df["bedRoom"]
+        .value_counts()
+        .sort_index()
+        .reset_index()
+    )
+    bhk_df.columns = ["BHK", "Count"]
+    bhk_df["BHK"] = bhk_df["BHK"].astype(str) + " BHK"
+
+    furn_df = value_count_frame(
+        main_df["furnishing_type"].map(FURNISHING_MAP),
+        ["Furnishing Type", "Count"]
+    )
+
+    age_df = value_count_frame(
+        main_df["agePossession"], ["Age / Possession", "Count"]
+    )
+
+    balcony_df = value_count_frame(
+        main_df["balcony"]
+        .astype(object)
+        .fillna("No Balcony")
+        .replace({
+            "0": "No Balcony",
+            "1": "Balcony",
+            0: "No Balcony",
+            1: "Balcony"
+        }),
+        ["Balcony Status", "Count"]
+    )
+
+    amenity_stats = (
+        main_df[AMENITY_COLS]
+        .mean()
+        .mul(100)
+        .round(1)
+    )
+
+    feature_sector_df = feature_df[["features"]].join(
+        main_df[["sector"]], how="inner"
+    )[["features", "sector"]]
+
+    sector_list = ("All",) + tuple(sorted(feature_sector_df["sector"].unique()))
+
+    return AnalyticsBundle(
+        floor_stats=floor_stats,
+        area_stats=area_stats,
+        corr_matrix=corr_matrix,
+        bhk_df=bhk_df,
+        furn_df=furn_df,
+        age_df=age_df,
+        balcony_df=balcony_df,
+        amenity_stats=amenity_stats,
+        feature_sector_df=feature_sector_df,
+        sector_list=sector_list,
+    )
@@ -0,0 +1,218 @@
+"""Approximate nearest-neighbour search for the content recommender.
+
+Exact recommendations score the query against every property. This
+index hashes each property's facility/price/location vectors with random
+hyperplanes (SimHash LSH): each of ``tables`` hash tables keys a property
+by the signs of ``bits`` projections, so properties at a small angle
+tend to share a bucket. A query collects its own bucket plus the
+buckets one bit flip away in every table and ranks only those
+candidates by the exact blended score.
+
+Each block is unit length, so with weights ``w`` the dot product of the
+concatenated vectors ``[√w_f·f, √w_p·p, √w_l·l]`` is the blended cosine
+score of ``core.similarity``. Buckets are hashed with the default
+weights; other weights only change the ranking of the candidates, so
+recall drops as they move away from the defaults.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.ann                       # writes dataset/recommender_ann.npz
+    python -m core.ann --tables 16 --bits 6
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from core.artifacts import cached
+from core.config import DATA_DIR
+from core.similarity import DEFAULT_WEIGHTS, top_n_indices
+
+ANN_FILE = "recommender_ann.npz"
+
+DEFAULT_TABLES = 16
+
+# Target properties per bucket when ``bits`` is not given
+BUCKET_SIZE = 16
+
+
+def default_bits(n):
+    return int(np.clip(round(np.log2(max(n, 1) / BUCKET_SIZE)), 1, 30))
+
+
+def hash_codes(blocks, planes, weights, bits):
+    """``(tables, n)`` bucket codes of the weighted concatenated vectors."""
+    projection = sum(
+        np.sqrt(w) * np.asarray(block @ p) for w, block, p in zip(weights, blocks, planes) if w
+    )
+    signs = (projection > 0).reshape(projection.shape[0], -1, bits)
+    return (signs.astype(np.int64) << np.arange(bits)).sum(axis=2).T
+
+
+def _dot(block, rows, pos):
+    """``block[rows] · block[pos]`` as float64."""
+    scores = block[rows] @ block[pos].T
+    if sparse.issparse(scores):
+        scores = scores.toarray()
+    return np.asarray(scores, dtype=np.float64).ravel()
+
+
+# --------------------------------------------------
+# INDEX
+# --------------------------------------------------
+class AnnIndex:
+    """Random-projection LSH over unit-length feature blocks.
+
+    ``blocks`` are the facility/price/location row vectors (dense or
+    scipy sparse, rows aligned to ``names``); ``planes`` the per-block
+    hyperplanes and ``codes`` the ``(tables, n)`` bucket of every row.
+    """
+
+    def __init__(self, names, blocks, planes, codes, weights=DEFAULT_WEIGHTS):
+        self.names = pd.Index(names)
+        self.blocks = tuple(blocks)
+        self.planes = tuple(planes)
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.weights = tuple(float(w) for w in weights)
+        self.bits = self.planes[0].shape[1] // self.codes.shape[0]
+
+        self._order = np.argsort(self.codes, axis=1, kind="stable")
+        self._sorted = np.take_along_axis(self.codes, self._order, axis=1)
+        self._flips = np.concatenate([[0], 1 << np.arange(self.bits, dtype=np.int64)])
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def tables(self):
+        return self.codes.shape[0]
+
+    @classmethod
+    def build(cls, names, blocks, tables=DEFAULT_TABLES, bits=None,
+              weights=DEFAULT_WEIGHTS, seed=0):
+        blocks = [
+            normalize(sparse.csr_matrix(b, dtype=np.float32)) if sparse.issparse(b)
+            else normalize(np.asarray(b, dtype=np.float32))
+            for b in blocks
+        ]
+        bits = bits or default_bits(blocks[0].shape[0])
+        rng = np.random.default_rng(seed)
+        planes = [
+            rng.standard_normal((b.shape[1], tables * bits)).astype(np.float32)
+            for b in blocks
+        ]
+        return cls(names, blocks, planes, hash_codes(blocks, planes, weights, bits), weights)
+
+    def candidates(self, pos):
+        """Rows sharing a bucket (or one bit flip) with ``pos`` in any table."""
+        probes = self.codes[:, pos][:, None] ^ self._flips
+        chunks = []
+        for order, codes, probe in zip(self._order, self._sorted, probes):
+            lo = np.searchsorted(codes, probe, side="left")
+            hi = np.searchsorted(codes, probe, side="right")
+            chunks.extend(order[a:b] for a, b in zip(lo, hi) if b > a)
+        rows = np.unique(np.concatenate(chunks))
+        return rows[rows != pos]
+
+    def scores(self, pos, rows, weights=DEFAULT_WEIGHTS):
+        """Blended cosine similarity of ``pos`` against ``rows``."""
+        out = np.zeros(len(rows), dtype=np.float64)
+        for weight, block in zip(weights, self.blocks):
+            if weight:
+                out += float(weight) * _dot(block, rows, pos)
+        return out
+
+    def recommend(self, property_name, top_n=5, weights=DEFAULT_WEIGHTS, exact=False):
+        """Top-N most similar properties as ``(names, scores)``.
+
+        ``exact`` scores every property instead of the LSH candidates;
+        it is also used when there are fewer candidates than ``top_n``.
+        """
+        pos = self.names.get_loc(property_name)
+        rows = None if exact else self.candidates(pos)
+        if rows is None or rows.size < top_n:
+            rows = np.delete(np.arange(len(self)), pos)
+        scores = self.scores(pos, rows, weights)
+        top = top_n_indices(scores, top_n)
+        return self.names[rows[top]].tolist(), scores[top]
+
+    # --------------------------------------------------
+    # STORAGE
+    # --------------------------------------------------
+    def save(self, path):
+        arrays = {
+            "names": np.asarray(self.names, dtype=str),
+            "codes": self.codes,
+            "weights": np.asarray(self.weights),
+        }
+        for i, (block, planes) in enumerate(zip(self.blocks, self.planes)):
+            arrays[f"planes{i}"] = planes
+            if sparse.issparse(block):
+                arrays[f"block{i}_data"] = block.data
+                arrays[f"block{i}_indices"] = block.indices
+                arrays[f"block{i}_indptr"] = block.indptr
+                arrays[f"block{i}_shape"] = np.array(block.shape)
+            else:
+                arrays[f"block{i}"] = block
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            blocks, planes = [], []
+            i = 0
+            while f"planes{i}" in f.files:
+                planes.append(f[f"planes{i}"])
+                if f"block{i}" in f.files:
+                    blocks.append(f[f"block{i}"])
+                else:
+                    blocks.append(sparse.csr_matrix(
+                        (f[f"block{i}_data"], f[f"block{i}_indices"], f[f"block{i}_indptr"]),
+                        shape=tuple(f[f"block{i}_shape"]),
+                    ))
+                i += 1
+            return cls(f["names"].astype(object), blocks, planes, f["codes"], f["weights"])
+
+
+def load_ann_index(data_dir=DATA_DIR):
+    """The saved index, or None when it has not been built."""
+    path = os.path.join(data_dir, ANN_FILE)
+    if not os.path.exists(path):
+        return None
+    return cached(("ann", path), lambda: AnnIndex.load(path))
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    from core.pipeline.stages import APARTMENTS_FILE, FACILITY_MODELS, ann_blocks, resolve_facility_model
+    from core.tables import NOTEBOOK_DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Build the approximate recommender index")
+    parser.add_argument("--apartments", default=os.path.join(NOTEBOOK_DATA_DIR, APARTMENTS_FILE))
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="directory with distance_location.pkl; the index is written here")
+    parser.add_argument("--facility-model", choices=FACILITY_MODELS, default="auto")
+    parser.add_argument("--tables", type=int, default=DEFAULT_TABLES)
+    parser.add_argument("--bits", type=int, default=None,
+                        help=f"hyperplanes per table (default: ~{BUCKET_SIZE} properties per bucket)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    distances = pd.read_pickle(os.path.join(args.data_dir, "distance_location.pkl"))
+    blocks = ann_blocks(pd.read_csv(args.apartments), distances,
+                        resolve_facility_model(args.facility_model))
+    index = AnnIndex.build(distances.index, blocks, args.tables, args.bits)
+    path = os.path.join(args.data_dir, ANN_FILE)
+    index.save(path)
+    print(f"{len(index)} properties, {index.tables} tables × {index.bits} bits -> {path} "
+          f"({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Process-wide, load-once access to the files in ``dataset/``.
+
+Streamlit reruns a page script on every widget interaction; loading
+through this module means each artifact is read from disk once per server
+process instead of once per click. Numeric matrices are converted to
+``.npy`` next to their pickle and opened with ``mmap_mode="r"``, so every
+process on the host shares one copy through the page cache.
+
+Usage (from the ``website`` directory), to convert ahead of time::
+
+    python -m core.artifacts
+"""
+import os
+import pickle
+import threading
+
+import joblib
+import numpy as np
+
+from core.config import DATA_DIR
+
+# Pickled numpy matrices that are served memory-mapped
+ARRAY_PICKLES = (
+    "Top_facilities.pkl",
+    "price_based.pkl",
+    "location_based.pkl",
+)
+
+_CACHE = {}
+_LOCK = threading.RLock()
+
+
+def cached(key, loader):
+    """Return ``loader()`` computed once per process for ``key``."""
+    with _LOCK:
+        if key not in _CACHE:
+            _CACHE[key] = loader()
+        return _CACHE[key]
+
+
+def clear_cache():
+    with _LOCK:
+        _CACHE.clear()
+
+
+def artifact_path(name, data_dir=DATA_DIR):
+    return os.path.join(data_dir, name)
+
+
+# --------------------------------------------------
+# LOADERS
+# --------------------------------------------------
+def _read_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_pickle(name, data_dir=DATA_DIR):
+    path = artifact_path(name, data_dir)
+    return cached(("pickle", path), lambda: _read_pickle(path))
+
+
+def load_joblib(name, data_dir=DATA_DIR):
+    path = artifact_path(name, data_dir)
+    return cached(("joblib", path), lambda: joblib.load(path))
+
+
+def npy_path(name, data_dir=DATA_DIR):
+    return os.path.splitext(artifact_path(name, data_dir))[0] + ".npy"
+
+
+def convert_to_npy(name, data_dir=DATA_DIR):
+    """Write the pickled array ``name`` as ``.npy`` and return its path."""
+    src = artifact_path(name, data_dir)
+    dst = npy_path(name, data_dir)
+    array = np.ascontiguousarray(_read_pickle(src))
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, dst)
+    return dst
+
+
+def _npy_is_fresh(name, data_dir):
+    src = artifact_path(name, data_dir)
+    dst = npy_path(name, data_dir)
+    if not os.path.exists(dst):
+        return False
+    return not os.path.exists(src) or os.path.getmtime(dst) >= os.path.getmtime(src)
+
+
+def load_array(name, data_dir=DATA_DIR):
+    """Read-only, memory-mapped array for a pickled (or ``.npy``) matrix.
+
+    The ``.npy`` is (re)generated from the pickle when missing or stale.
+    If the dataset directory is read-only the pickle is loaded instead.
+    """
+    def load():
+        if not _npy_is_fresh(name, data_dir):
+            try:
+                convert_to_npy(name, data_dir)
+            except OSError:
+                return _read_pickle(artifact_path(name, data_dir))
+        return np.load(npy_path(name, data_dir), mmap_mode="r")
+
+    return cached(("array", artifact_path(name, data_dir)), load)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main():
+    for name in ARRAY_PICKLES:
+        print(f"{name} -> {convert_to_npy(name)}")
+
+
+if __name__ == "__main__":
+    main()
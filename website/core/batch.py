@@ -0,0 +1,177 @@
+"""Batch "similar properties" export.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.batch --out recommendations.csv --top-n 5
+    python -m core.batch --out recs.parquet --properties "M3M Crown" "Ireo Skyon"
+"""
+import argparse
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.artifacts import load_array
+from core.config import DATA_DIR
+from core.similarity import DEFAULT_WEIGHTS, SIMILARITY_FILES, dense_rows, load_engine
+
+DEFAULT_BLOCK_SIZE = 256
+
+# Set once per worker process by _init_worker
+_WORKER_MATRICES = None
+_WORKER_WEIGHTS = None
+
+
+# --------------------------------------------------
+# VECTORIZED ROW BLOCKS
+# --------------------------------------------------
+def top_n_block(matrices, weights, rows, top_n):
+    """Top-N neighbours for a block of rows as ``(indices, scores)``.
+
+    Both results have shape ``(len(rows), top_n)``, best match first. The
+    query property itself is never returned.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    block = np.zeros((rows.size, matrices[0].shape[1]), dtype=np.float64)
+    for weight, sim in zip(weights, matrices):
+        if weight:
+            block += weight * dense_rows(sim, rows)
+    block[np.arange(rows.size), rows] = -np.inf
+
+    n = min(int(top_n), block.shape[1] - 1)
+    part = np.argpartition(-block, n - 1, axis=1)[:, :n]
+    part_scores = np.take_along_axis(block, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(part, order, axis=1),
+        np.take_along_axis(part_scores, order, axis=1),
+    )
+
+
+def _init_worker(matrices, weights, data_dir=None):
+    global _WORKER_MATRICES, _WORKER_WEIGHTS
+    if data_dir is not None:
+        # File names: map the shared .npy files instead of taking a copy
+        matrices = [load_array(name, data_dir) for name in matrices]
+    _WORKER_MATRICES = matrices
+    _WORKER_WEIGHTS = weights
+
+
+def _worker_block(args):
+    rows, top_n = args
+    return top_n_block(_WORKER_MATRICES, _WORKER_WEIGHTS, rows, top_n)
+
+
+# --------------------------------------------------
+# BATCH API
+# --------------------------------------------------
+def batch_recommend(engine, property_names=None, top_n=5,
+                    weights=DEFAULT_WEIGHTS, block_size=DEFAULT_BLOCK_SIZE,
+                    n_jobs=None, data_dir=None):
+    """Top-N recommendations for many properties in one long-format frame.
+
+    ``property_names`` defaults to every property known to ``engine``.
+    Rows are processed in blocks of ``block_size``; with ``n_jobs`` > 1
+    the blocks are spread over a process pool. Pass the ``data_dir`` a
+    dense engine was loaded from and the workers memory-map its ``.npy``
+    files themselves; otherwise every worker is sent a copy of the
+    matrices.
+    """
+    if property_names is None:
+        positions = np.arange(len(engine), dtype=np.intp)
+    else:
+        positions = np.array(
+            [engine.position(name) for name in property_names], dtype=np.intp
+        )
+
+    weights = engine.weights_key(weights)
+    blocks = [
+        positions[start:start + block_size]
+        for start in range(0, positions.size, block_size)
+    ]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs > 1 and len(blocks) > 1:
+        if data_dir is not None and not engine.is_sparse:
+            initargs = (SIMILARITY_FILES, weights, data_dir)
+        else:
+            initargs = (engine.matrices, weights)
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(blocks)),
+            initializer=_init_worker,
+            initargs=initargs,
+        ) as pool:
+            results = list(pool.map(_worker_block, [(b, top_n) for b in blocks]))
+    else:
+        results = [
+            top_n_block(engine.matrices, weights, b, top_n) for b in blocks
+        ]
+
+    if results:
+        indices = np.concatenate([r[0] for r in results])
+        scores = np.concatenate([r[1] for r in results])
+    else:
+        indices = np.empty((0, 0), dtype=np.intp)
+        scores = np.empty((0, 0), dtype=np.float64)
+
+    k = indices.shape[1]
+    return pd.DataFrame({
+        "PropertyName": np.repeat(engine.index[positions].to_numpy(), k),
+        "Rank": np.tile(np.arange(1, k + 1), positions.size),
+        "RecommendedProperty": engine.index[indices.ravel()].to_numpy(),
+        "SimilarityScore": scores.ravel(),
+    })
+
+
+def write_results(df, path):
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True,
+                        help="Output file (.csv or .parquet)")
+    parser.add_argument("--properties", nargs="*",
+                        help="Property names (default: every property)")
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--weights", type=float, nargs=3,
+                        default=list(DEFAULT_WEIGHTS),
+                        metavar=("FACILITIES", "PRICE", "LOCATION"))
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, "distance_location.pkl"), "rb") as f:
+        location_df = pickle.load(f)
+    with open(os.path.join(args.data_dir, "url.pkl"), "rb") as f:
+        url_df = pickle.load(f)
+
+    engine = load_engine(location_df.index, args.data_dir)
+    df = batch_recommend(
+        engine,
+        property_names=args.properties or None,
+        top_n=args.top_n,
+        weights=args.weights,
+        block_size=args.block_size,
+        n_jobs=args.jobs,
+        data_dir=args.data_dir,
+    )
+    url_dict = url_df.set_index("PropertyName")["Link"].to_dict()
+    df["Link"] = df["RecommendedProperty"].map(url_dict).fillna("")
+
+    write_results(df, args.out)
+    print(f"Wrote {len(df)} recommendations to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Vectorized range bucketing for numeric columns.
+
+Bin edges and labels are defined once in a ``BinSpec`` and values are
+assigned with a single ``np.searchsorted`` pass, giving an ordered
+categorical that sorts and groups in range order.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class BinSpec(NamedTuple):
+    """Ordered ranges split at ``edges``.
+
+    ``upper_inclusive[i]`` says whether a value equal to ``edges[i]``
+    belongs to the range below it (``x <= edge``) or above it
+    (``x < edge``). There is one more label than there are edges.
+    """
+    edges: tuple
+    labels: tuple
+    upper_inclusive: tuple
+
+    @property
+    def order(self):
+        return list(self.labels)
+
+
+def _fmt(value):
+    return f"{value:g}"
+
+
+def make_spec(edges, labels=None, upper_inclusive=True):
+    """``BinSpec`` from sorted ``edges`` with generated labels by default."""
+    edges = tuple(float(e) for e in edges)
+    if list(edges) != sorted(set(edges)):
+        raise ValueError("Bin edges must be strictly increasing")
+
+    if isinstance(upper_inclusive, bool):
+        upper_inclusive = (upper_inclusive,) * len(edges)
+    if labels is None:
+        first = ("≤" if upper_inclusive[0] else "<") + _fmt(edges[0]) if edges else "All"
+        labels = [first]
+        labels += [f"{_fmt(lo)}–{_fmt(hi)}" for lo, hi in zip(edges, edges[1:])]
+        if edges:
+            labels.append(f"{_fmt(edges[-1])}+")
+
+    if len(labels) != len(edges) + 1:
+        raise ValueError("Need exactly one more label than bin edges")
+    return BinSpec(edges, tuple(labels), tuple(upper_inclusive))
+
+
+def parse_edges(text):
+    """Bin edges from user text such as ``"500, 1000, 1500"``."""
+    return sorted({float(part) for part in text.replace(";", ",").split(",") if part.strip()})
+
+
+def assign_bins(values, spec):
+    """Ordered categorical of range labels for ``values`` (NaN stays NaN)."""
+    values = pd.Series(values)
+    x = values.to_numpy(dtype=np.float64)
+    edges = np.asarray(spec.edges, dtype=np.float64)
+
+    # Number of edges strictly below x, plus edges equal to x that open
+    # the next range
+    codes = np.searchsorted(edges, x, side="left")
+    exclusive = edges[~np.asarray(spec.upper_inclusive, dtype=bool)]
+    if exclusive.size:
+        codes += np.isin(x, exclusive)
+    codes[np.isnan(x)] = -1
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=list(spec.labels), ordered=True),
+        index=values.index,
+        name=values.name,
+    )
+
+
+# ----------------------------------
+# PAGE BINS
+# ----------------------------------
+FLOOR_BINS = make_spec(
+    [2, 5, 10, 15, 20],
+    labels=["Ground–2", "3–5", "6–10", "11–15", "16–20", "21+"],
+)
+
+# Under 500 sqft is strictly below; every other range includes its top edge
+AREA_BINS = make_spec(
+    [500, 1000, 1500, 2000, 2500],
+    labels=["<500", "500–1000", "1000–1500", "1500–2000", "2000–2500", "2500+"],
+    upper_inclusive=(False, True, True, True, True),
+)
@@ -0,0 +1,7 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # /app/website
+DATA_DIR = os.path.join(BASE_DIR, "dataset")
+
+# Generated, rebuildable files (figure JSON, ...); safe to delete
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
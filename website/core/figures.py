@@ -0,0 +1,265 @@
+"""Plotly figures for the Analytic page, built once per data version.
+
+``FigureCache`` keeps each figure's JSON in memory and under
+``.cache/figures`` keyed on ``data_version`` (a content hash of the input
+files, the source of the modules that build the figures and
+``FIGURES_VERSION``). A rerun, or a fresh server process with the same
+data and code, deserializes the stored JSON instead of rebuilding the
+figure.
+"""
+import hashlib
+import importlib
+import os
+import threading
+
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from core.artifacts import cached
+from core.config import CACHE_DIR
+
+# Modules whose source is part of every figure key: the builders below
+# and the aggregates they are given
+FIGURE_CODE = ("core.figures", "core.analytics", "core.binning", "core.geo")
+
+# Bump when the page changes the arguments it passes to the builders
+FIGURES_VERSION = 1
+
+FIGURE_CACHE_DIR = os.path.join(CACHE_DIR, "figures")
+
+MAP_CENTER = {"lat": 28.4595, "lon": 77.0266}
+
+CHART_MARGIN = dict(t=40, b=40, l=40, r=40)
+
+
+# --------------------------------------------------
+# DATA VERSION
+# --------------------------------------------------
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def data_version(paths, code=FIGURE_CODE):
+    """Short hash of the contents of ``paths``, the ``code`` modules' source and ``FIGURES_VERSION``.
+
+    Each file is only re-read when its size or mtime changes, so calling
+    this on every rerun costs a few ``stat`` calls.
+    """
+    combined = hashlib.sha256(f"figures-v{FIGURES_VERSION}".encode())
+    sources = [importlib.import_module(name).__file__ for name in code]
+    for path in list(paths) + sources:
+        st = os.stat(path)
+        key = ("file_digest", path, st.st_size, st.st_mtime_ns)
+        combined.update(cached(key, lambda: _file_digest(path)).encode())
+    return combined.hexdigest()[:16]
+
+
+# --------------------------------------------------
+# CACHE
+# --------------------------------------------------
+class FigureCache:
+    """Figure JSON by ``(name, version)``, in memory and on disk.
+
+    The disk tier is best effort: an unwritable ``cache_dir`` leaves the
+    cache memory-only.
+    """
+
+    def __init__(self, cache_dir=FIGURE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.builds = 0
+        self._json = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name, version):
+        return os.path.join(self.cache_dir, f"{name}-{version}.json")
+
+    def _read(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, path, text):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def get_json(self, name, version, build):
+        """JSON of the figure ``build()`` returns, built at most once."""
+        key = (name, version)
+        with self._lock:
+            if key in self._json:
+                return self._json[key]
+            path = self._path(name, version)
+            text = self._read(path)
+            if text is None:
+                text = build().to_json()
+                self.builds += 1
+                self._write(path, text)
+            self._json[key] = text
+            return text
+
+    def get(self, name, version, build):
+        """Fresh ``go.Figure`` for ``name`` (safe for the caller to modify)."""
+        return pio.from_json(self.get_json(name, version, build))
+
+
+# --------------------------------------------------
+# BUILDERS
+# --------------------------------------------------
+def choropleth_figure(sector_stats, geojson):
+    fig = px.choropleth_map(
+        sector_stats,
+        geojson=geojson,
+        locations="sector",
+        featureidkey="properties.sector",
+        color="avg_price_per_sqft",
+        color_continuous_scale="Viridis",
+        map_style="open-street-map",
+        zoom=11,
+        center=MAP_CENTER,
+        opacity=0.75,
+        hover_name="sector",
+        hover_data={
+            "avg_price": ':.2f',
+            "avg_price_per_sqft": ':.0f',
+            "avg_area": ':.0f',
+            "listings": True
+        },
+        title="Gurugram Sector-wise Average Price per Sqft"
+    )
+    fig.update_layout(
+        height=700,
+        margin={"r": 0, "t": 50, "l": 0, "b": 0}
+    )
+    fig.update_traces(marker_line_width=1, marker_line_color="black")
+    return fig
+
+
+def radar_figure(amenity_stats):
+    categories = amenity_stats.index.tolist()
+    values = amenity_stats.values.tolist()
+
+    categories += [categories[0]]
+    values += [values[0]]
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatterpolar(
+            r=values,
+            theta=categories,
+            fill="toself",
+            line=dict(color="#2E86C1", width=3),
+            fillcolor="rgba(46,134,193,0.35)"
+        )
+    )
+    fig.update_layout(
+        polar=dict(
+            gridshape="linear",
+            radialaxis=dict(
+                range=[0, max(values) * 1.2],
+                showticklabels=True
+            )
+        ),
+        height=650,
+        margin=dict(t=30, b=30, l=30, r=30),
+        showlegend=False
+    )
+    return fig
+
+
+def range_figure(stats, range_col, xaxis_title, bar_color, line_color, fit_price_axis=True):
+    """Listing count bars with an average-price step line on a second axis."""
+    fig = go.Figure()
+
+    # Bars → count
+    fig.add_bar(
+        x=stats[range_col],
+        y=stats["count"],
+        name="Property Count",
+        marker_color=bar_color,
+        yaxis="y"
+    )
+
+    # Step line → avg price (Cr)
+    fig.add_scatter(
+        x=stats[range_col],
+        y=stats["avg_price_cr"],
+        name="Avg Price (Cr)",
+        mode="lines+markers+text",
+        text=stats["avg_price_cr"],
+        textposition="top center",
+        line=dict(color=line_color, width=3, shape="hv"),
+        marker=dict(size=8),
+        yaxis="y2"
+    )
+
+    yaxis2 = dict(
+        title="Average Price (Cr)",
+        overlaying="y",
+        side="right",
+        showgrid=False
+    )
+    if fit_price_axis:
+        yaxis2["range"] = [
+            stats["avg_price_cr"].min() * 0.9,
+            stats["avg_price_cr"].max() * 1.1
+        ]
+
+    fig.update_layout(
+        height=450,
+        xaxis_title=xaxis_title,
+        yaxis=dict(title="Property Count", showgrid=False),
+        yaxis2=yaxis2,
+        legend=dict(orientation="h", y=1.15, x=0.5, xanchor="center"),
+        margin=CHART_MARGIN
+    )
+    return fig
+
+
+def correlation_figure(corr_matrix):
+    fig = px.imshow(
+        corr_matrix,
+        text_auto=True,
+        color_continuous_scale="RdBu",
+        zmin=-1,
+        zmax=1
+    )
+    fig.update_layout(
+        height=1000,
+        xaxis_title="Features",
+        yaxis_title="Features",
+        margin=CHART_MARGIN
+    )
+    return fig
+
+
+def donut_figure(counts, names, colors, legend_title):
+    fig = px.pie(
+        counts,
+        names=names,
+        values="Count",
+        hole=0.4,
+        color_discrete_sequence=colors
+    )
+    fig.update_traces(
+        textinfo="percent+label",
+        textfont_size=14
+    )
+    fig.update_layout(
+        height=450,
+        margin=CHART_MARGIN,
+        legend_title_text=legend_title
+    )
+    return fig
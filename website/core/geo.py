@@ -0,0 +1,441 @@
+"""Compact, multi-resolution GeoJSON for the sector map.
+
+Sector boundaries are stored with 7 decimal places (~1 cm) and every
+shared border twice, once per neighbouring sector. ``Topology`` quantizes
+the coordinates onto an integer grid, cuts every ring into arcs at the
+points where neighbours meet (as TopoJSON does) and simplifies each arc
+once with Douglas–Peucker, so adjacent sectors stay gap-free at any
+tolerance. ``LEVELS`` are the levels of detail written for the page;
+``lod_for_zoom`` picks the coarsest one that is still sub-pixel at a
+given map zoom.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.geo
+    python -m core.geo --source ../data/export.geojson --out-dir ../data
+"""
+import argparse
+import json
+import math
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from core.config import DATA_DIR
+
+SOURCE_GEOJSON = "gurugram_sectors_clean.geojson"
+
+# Decimal places kept when no level is involved; 4 is ~11 m here
+DEFAULT_PRECISION = 4
+
+METRES_PER_DEGREE = 111_320.0
+
+# Web-mercator ground resolution at zoom 0 on the equator (m / px)
+EQUATOR_METRES_PER_PIXEL = 156_543.03
+
+
+class Level(NamedTuple):
+    tolerance_m: float
+    precision: int
+
+
+# Finest first; level i is written as ``<stem>_lod<i>.geojson``
+LEVELS = (
+    Level(0.0, 5),
+    Level(5.0, 5),
+    Level(15.0, 4),
+    Level(40.0, 4),
+)
+
+
+# --------------------------------------------------
+# DOUGLAS–PEUCKER
+# --------------------------------------------------
+def _segment_distance(points, a, b):
+    """Distance (same units) from each of ``points`` to segment ``a``-``b``."""
+    ab = b - a
+    length2 = float(ab @ ab)
+    if length2 == 0.0:
+        return np.hypot(*(points - a).T)
+    t = np.clip((points - a) @ ab / length2, 0.0, 1.0)
+    return np.hypot(*(points - (a + t[:, None] * ab)).T)
+
+
+def douglas_peucker(xy, tolerance):
+    """Boolean keep-mask for an ``(n, 2)`` polyline; endpoints always kept."""
+    n = len(xy)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    if tolerance <= 0 or n < 3:
+        keep[:] = True
+        return keep
+
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        d = _segment_distance(xy[i + 1:j], xy[i], xy[j])
+        k = int(np.argmax(d))
+        if d[k] > tolerance:
+            k += i + 1
+            keep[k] = True
+            stack.append((i, k))
+            stack.append((k, j))
+    return keep
+
+
+# --------------------------------------------------
+# TOPOLOGY
+# --------------------------------------------------
+def _dedupe(keys):
+    out = []
+    for key in keys:
+        if not out or key != out[-1]:
+            out.append(key)
+    return out
+
+
+class Topology:
+    """Quantized features whose lines and rings are stored as shared arcs.
+
+    ``precision`` is the number of decimal places kept. ``properties``
+    limits the feature properties carried over (None keeps all).
+    """
+
+    def __init__(self, geojson, precision=DEFAULT_PRECISION, properties=None):
+        self.precision = precision
+        self.scale = 10 ** precision
+        self.arcs = []
+        self._arc_ids = {}
+
+        parsed = [
+            (self._properties(f.get("properties") or {}, properties),
+             self._quantize(f["geometry"]))
+            for f in geojson["features"]
+        ]
+        rings = [ring for _, (kind, parts) in parsed if kind in ("Polygon", "MultiPolygon")
+                 for ring in self._rings(kind, parts)]
+        self._junctions = self._find_junctions(rings)
+        self.features = [(props, self._to_arcs(geometry)) for props, geometry in parsed
+                         if geometry[1] is not None]
+
+        lats = [k[1] for arc in self.arcs for k in arc]
+        mean_lat = float(np.mean(lats)) / self.scale if lats else 0.0
+        self._x_scale = METRES_PER_DEGREE * math.cos(math.radians(mean_lat)) / self.scale
+        self._y_scale = METRES_PER_DEGREE / self.scale
+
+    @staticmethod
+    def _properties(props, keep):
+        return dict(props) if keep is None else {k: props[k] for k in keep if k in props}
+
+    # ---- quantization -------------------------------------------------
+    def _key(self, position):
+        return (round(position[0] * self.scale), round(position[1] * self.scale))
+
+    def _ring(self, ring):
+        keys = _dedupe(self._key(p) for p in ring)
+        if len(keys) > 1 and keys[0] == keys[-1]:
+            keys.pop()
+        # Three distinct corners make the smallest ring
+        return keys if len(set(keys)) >= 3 else None
+
+    def _polygon(self, polygon):
+        rings = [self._ring(r) for r in polygon]
+        if rings[0] is None:
+            return None
+        return [rings[0]] + [r for r in rings[1:] if r is not None]
+
+    def _line(self, line):
+        keys = _dedupe(self._key(p) for p in line)
+        return keys if len(keys) >= 2 else None
+
+    def _quantize(self, geometry):
+        kind, coords = geometry["type"], geometry["coordinates"]
+        if kind == "Point":
+            parts = self._key(coords)
+        elif kind == "MultiPoint":
+            parts = [self._key(p) for p in coords] or None
+        elif kind == "LineString":
+            parts = self._line(coords)
+        elif kind == "MultiLineString":
+            parts = [ln for ln in map(self._line, coords) if ln is not None] or None
+        elif kind == "Polygon":
+            parts = self._polygon(coords)
+        elif kind == "MultiPolygon":
+            parts = [p for p in map(self._polygon, coords) if p is not None] or None
+        else:
+            raise ValueError(f"Unsupported geometry type: {kind}")
+        return kind, parts
+
+    @staticmethod
+    def _rings(kind, parts):
+        if parts is None:
+            return []
+        polygons = [parts] if kind == "Polygon" else parts
+        return [ring for polygon in polygons for ring in polygon]
+
+    # ---- arcs ---------------------------------------------------------
+    @staticmethod
+    def _find_junctions(rings):
+        """Points whose neighbours differ between the rings that use them."""
+        neighbours = {}
+        for ring in rings:
+            m = len(ring)
+            for i, key in enumerate(ring):
+                pair = frozenset((ring[i - 1], ring[(i + 1) % m]))
+                neighbours.setdefault(key, set()).add(pair)
+        return {key for key, pairs in neighbours.items() if len(pairs) > 1}
+
+    def _arc_ref(self, keys):
+        """Index of the arc through ``keys`` (``~index`` when reversed)."""
+        keys = tuple(keys)
+        flipped = keys[::-1]
+        canonical = min(keys, flipped)
+        arc_id = self._arc_ids.get(canonical)
+        if arc_id is None:
+            arc_id = self._arc_ids[canonical] = len(self.arcs)
+            self.arcs.append(canonical)
+        return arc_id if canonical == keys else ~arc_id
+
+    def _cut_ring(self, ring):
+        cuts = [i for i, key in enumerate(ring) if key in self._junctions]
+        if not cuts:
+            # Unshared ring: start at its smallest point so identical rings
+            # (an enclave and its hole) cut the same way
+            cuts = [ring.index(min(ring))]
+        if len(cuts) == 1:
+            # Pin a second point so no arc starts and ends at one point
+            start = ring[cuts[0]]
+            far = max(range(len(ring)),
+                      key=lambda i: ((ring[i][0] - start[0]) ** 2
+                                     + (ring[i][1] - start[1]) ** 2, ring[i]))
+            cuts = sorted({cuts[0], far})
+
+        first = cuts[0]
+        rotated = ring[first:] + ring[:first] + [ring[first]]
+        bounds = [c - first for c in cuts] + [len(ring)]
+        return [self._arc_ref(rotated[lo:hi + 1]) for lo, hi in zip(bounds, bounds[1:])]
+
+    def _to_arcs(self, geometry):
+        kind, parts = geometry
+        if parts is None or kind in ("Point", "MultiPoint"):
+            return kind, parts
+        if kind == "LineString":
+            return kind, [self._arc_ref(parts)]
+        if kind == "MultiLineString":
+            return kind, [[self._arc_ref(ln)] for ln in parts]
+        if kind == "Polygon":
+            return kind, [self._cut_ring(r) for r in parts]
+        return kind, [[self._cut_ring(r) for r in polygon] for polygon in parts]
+
+    # ---- simplification -----------------------------------------------
+    def simplified_arcs(self, tolerance_m):
+        """Every arc after Douglas–Peucker at ``tolerance_m`` metres."""
+        if tolerance_m <= 0:
+            return [list(arc) for arc in self.arcs]
+        out = []
+        for arc in self.arcs:
+            xy = np.asarray(arc, dtype=np.float64) * (self._x_scale, self._y_scale)
+            keep = douglas_peucker(xy, tolerance_m)
+            out.append([key for key, k in zip(arc, keep) if k])
+        return out
+
+    @staticmethod
+    def _join(arcs, refs):
+        keys = []
+        for ref in refs:
+            arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+            keys.extend(arc if not keys else arc[1:])
+        return keys
+
+    def _ring_keys(self, arcs, refs):
+        keys = self._join(arcs, refs)
+        if len(set(keys)) < 3:
+            # Collapsed below the tolerance: keep the quantized ring
+            keys = self._join(self.arcs, refs)
+        return keys
+
+    # ---- output -------------------------------------------------------
+    def _position(self, key):
+        return [round(key[0] / self.scale, self.precision),
+                round(key[1] / self.scale, self.precision)]
+
+    def to_geojson(self, tolerance_m=0.0):
+        arcs = self.simplified_arcs(tolerance_m)
+
+        def ring(refs):
+            return [self._position(k) for k in self._ring_keys(arcs, refs)]
+
+        def line(refs):
+            return [self._position(k) for k in self._join(arcs, refs)]
+
+        features = []
+        for props, (kind, parts) in self.features:
+            if kind == "Point":
+                coords = self._position(parts)
+            elif kind == "MultiPoint":
+                coords = [self._position(p) for p in parts]
+            elif kind == "LineString":
+                coords = line(parts)
+            elif kind == "MultiLineString":
+                coords = [line(refs) for refs in parts]
+            elif kind == "Polygon":
+                coords = [ring(refs) for refs in parts]
+            else:
+                coords = [[ring(refs) for refs in polygon] for polygon in parts]
+            features.append({
+                "type": "Feature",
+                "properties": props,
+                "geometry": {"type": kind, "coordinates": coords},
+            })
+        return {"type": "FeatureCollection", "features": features}
+
+    def to_topojson(self, tolerance_m=0.0, object_name="sectors"):
+        """TopoJSON ``Topology`` with delta-encoded integer arcs."""
+        arcs = self.simplified_arcs(tolerance_m)
+        xs = [k[0] for arc in self.arcs for k in arc]
+        ys = [k[1] for arc in self.arcs for k in arc]
+        for _, (kind, parts) in self.features:
+            if kind == "Point":
+                xs.append(parts[0])
+                ys.append(parts[1])
+            elif kind == "MultiPoint":
+                xs.extend(p[0] for p in parts)
+                ys.extend(p[1] for p in parts)
+        x0, y0 = (min(xs), min(ys)) if xs else (0, 0)
+
+        def delta(arc):
+            prev = (x0, y0)
+            out = []
+            for key in arc:
+                out.append([key[0] - prev[0], key[1] - prev[1]])
+                prev = key
+            return out
+
+        def point(key):
+            return [key[0] - x0, key[1] - y0]
+
+        geometries = []
+        for props, (kind, parts) in self.features:
+            geometry = {"type": kind, "properties": props}
+            if kind == "Point":
+                geometry["coordinates"] = point(parts)
+            elif kind == "MultiPoint":
+                geometry["coordinates"] = [point(p) for p in parts]
+            else:
+                geometry["arcs"] = parts
+            geometries.append(geometry)
+
+        return {
+            "type": "Topology",
+            "transform": {
+                "scale": [1 / self.scale, 1 / self.scale],
+                "translate": [x0 / self.scale, y0 / self.scale],
+            },
+            "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}},
+            "arcs": [delta(arc) for arc in arcs],
+        }
+
+
+def simplify_geojson(geojson, tolerance_m=0.0, precision=DEFAULT_PRECISION, properties=None):
+    """Quantized (and, for ``tolerance_m > 0``, simplified) FeatureCollection."""
+    return Topology(geojson, precision, properties).to_geojson(tolerance_m)
+
+
+# --------------------------------------------------
+# LEVELS OF DETAIL
+# --------------------------------------------------
+def lod_path(source_name, level, data_dir=DATA_DIR):
+    stem = os.path.splitext(source_name)[0]
+    return os.path.join(data_dir, f"{stem}_lod{level}.geojson")
+
+
+def metres_per_pixel(zoom, latitude):
+    return EQUATOR_METRES_PER_PIXEL * math.cos(math.radians(latitude)) / 2 ** zoom
+
+
+def lod_for_zoom(zoom, latitude, levels=LEVELS):
+    """Coarsest level whose tolerance stays under half a pixel at ``zoom``."""
+    limit = metres_per_pixel(zoom, latitude) / 2
+    best = 0
+    for i, level in enumerate(levels):
+        if level.tolerance_m <= limit:
+            best = i
+    return best
+
+
+def build_levels(geojson, levels=LEVELS, properties=None):
+    """One FeatureCollection per level (topologies shared by precision)."""
+    topologies = {}
+    out = []
+    for level in levels:
+        if level.precision not in topologies:
+            topologies[level.precision] = Topology(geojson, level.precision, properties)
+        out.append(topologies[level.precision].to_geojson(level.tolerance_m))
+    return out
+
+
+# --------------------------------------------------
+# IO
+# --------------------------------------------------
+def read_geojson(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_geojson(geojson, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(geojson, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def count_points(geojson):
+    """Number of positions in all features."""
+    def count(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            return 1
+        return sum(count(c) for c in coords)
+    return sum(count(f["geometry"]["coordinates"]) for f in geojson["features"])
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write simplified levels of detail for a GeoJSON file")
+    parser.add_argument("--source", default=os.path.join(DATA_DIR, SOURCE_GEOJSON))
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    parser.add_argument("--properties", nargs="*", default=None,
+                        help="feature properties to keep (default: all)")
+    parser.add_argument("--topojson", action="store_true",
+                        help="also write <stem>_lod<i>.topojson")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    source = read_geojson(args.source)
+    name = os.path.basename(args.source)
+    print(f"{name}: {count_points(source)} points, {os.path.getsize(args.source) / 1e3:.0f} KB")
+
+    topologies = {}
+    for i, level in enumerate(LEVELS):
+        if level.precision not in topologies:
+            topologies[level.precision] = Topology(source, level.precision, args.properties)
+        topology = topologies[level.precision]
+
+        path = lod_path(name, i, args.out_dir)
+        lod = topology.to_geojson(level.tolerance_m)
+        write_geojson(lod, path)
+        line = (f"  lod{i} (±{level.tolerance_m:g} m, {level.precision} dp): "
+                f"{count_points(lod)} points, {os.path.getsize(path) / 1e3:.0f} KB")
+        if args.topojson:
+            topo_path = os.path.splitext(path)[0] + ".topojson"
+            with open(topo_path, "w", encoding="utf-8") as f:
+                json.dump(topology.to_topojson(level.tolerance_m), f,
+                          separators=(",", ":"), ensure_ascii=False)
+            line += f", TopoJSON {os.path.getsize(topo_path) / 1e3:.0f} KB"
+        print(f"{line} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
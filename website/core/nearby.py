@@ -0,0 +1,99 @@
+"""Radius search and similarity ranking in one query.
+
+The "Search Nearby" radius query (``core.spatial``) prunes the catalogue
+to the properties within R km of a landmark or point; optional
+configuration/price filters prune further, and only the survivors are
+scored against the chosen apartment (``SimilarityEngine.scores``). A
+query costs O(log N + C log C) for C candidates (O(N + C log C) around a
+landmark) instead of a full N-wide similarity row.
+
+``project_prices.csv`` (one row per listed configuration of a project,
+prices in crore) is built offline from ``appartments.csv`` by
+``python -m core.pipeline``.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.config import DATA_DIR
+from core.similarity import DEFAULT_WEIGHTS
+
+PROJECT_PRICES_FILE = "project_prices.csv"
+
+
+# --------------------------------------------------
+# CONFIGURATION / PRICE FILTER
+# --------------------------------------------------
+class PriceFilter:
+    """Listed configurations and price ranges per property, rows aligned to ``index``."""
+
+    def __init__(self, prices, index):
+        self.configs = tuple(pd.unique(prices["config"]))
+        rows = pd.Index(index).get_indexer(prices["PropertyName"])
+        cols = pd.Index(self.configs).get_indexer(prices["config"])
+        keep = rows >= 0
+        rows, cols = rows[keep], cols[keep]
+
+        shape = (len(index), len(self.configs))
+        self.listed = np.zeros(shape, dtype=bool)
+        self.low = np.full(shape, np.nan)
+        self.high = np.full(shape, np.nan)
+        self.listed[rows, cols] = True
+        self.low[rows, cols] = prices["price_low"].to_numpy(dtype=float)[keep]
+        self.high[rows, cols] = prices["price_high"].to_numpy(dtype=float)[keep]
+
+    @classmethod
+    def from_csv(cls, index, path=None):
+        return cls(pd.read_csv(path or os.path.join(DATA_DIR, PROJECT_PRICES_FILE)), index)
+
+    def mask(self, rows, configs=None, min_price=None, max_price=None):
+        """Which ``rows`` list one of ``configs`` with a price range overlapping the bounds.
+
+        A configuration without a listed price never passes a price bound.
+        """
+        cols = [self.configs.index(c) for c in configs if c in self.configs] if configs else slice(None)
+        rows = np.asarray(rows, dtype=np.intp)
+        ok = self.listed[rows][:, cols]
+        if min_price is not None:
+            ok &= self.high[rows][:, cols] >= min_price
+        if max_price is not None:
+            ok &= self.low[rows][:, cols] <= max_price
+        return ok.any(axis=1)
+
+
+# --------------------------------------------------
+# COMBINED QUERY
+# --------------------------------------------------
+def nearby_recommendations(engine, spatial_index, property_name, center, radius_km,
+                           top_n=5, weights=DEFAULT_WEIGHTS, price_filter=None,
+                           configs=None, min_price=None, max_price=None):
+    """Properties within ``radius_km`` of ``center``, most similar to ``property_name`` first.
+
+    ``center`` is what ``spatial_index.query_radius_rows`` takes before
+    the radius: ``(latitude, longitude)`` for a ``SpatialIndex``,
+    ``(landmark,)`` for a ``LandmarkDistances``. Returns a frame of
+    ``PropertyName``, ``SimilarityScore`` and ``distance_km``. ``configs``
+    and the price bounds (crore) need a ``price_filter`` (``ValueError``
+    otherwise); the query property itself is never returned.
+    """
+    filtered = configs or min_price is not None or max_price is not None
+    if filtered and price_filter is None:
+        raise ValueError("configs, min_price and max_price need a price_filter")
+    pos = engine.position(property_name)
+    nearby, distances = spatial_index.query_radius_rows(*center, radius_km)
+    rows = spatial_index.positions_in(engine.index)[nearby]
+
+    keep = (rows >= 0) & (rows != pos)
+    if filtered:
+        keep[keep] = price_filter.mask(rows[keep], configs, min_price, max_price)
+    rows, distances = rows[keep], distances[keep]
+
+    scores = engine.scores(pos, rows, weights)
+    # Equal scores (common with top-K fill values) rank the closer property first
+    top = np.lexsort((distances, -scores))[:max(top_n, 0)]
+    return pd.DataFrame({
+        "PropertyName": engine.index[rows[top]],
+        "SimilarityScore": scores[top],
+        "distance_km": distances[top],
+    })
@@ -0,0 +1,26 @@
+"""Offline build of the ``dataset/`` artifacts from the notebook data.
+
+The notebooks' preprocessing, feature and recommender steps as importable
+stages (``core.pipeline.transforms``), wired into a file-level graph
+(``core.pipeline.stages``) that ``core.pipeline.engine`` runs. Stages
+rerun only when their code, parameters or input contents change, and
+independent stages run in parallel. ``core.pipeline.ingest`` appends
+newly scraped listings and projects without a full rebuild.
+``core.pipeline.cosine`` writes the recommender top-K files in row
+tiles, without the N×N matrices.
+
+``core.pipeline.cleaning`` streams a raw flat/house scrape through the
+notebook 01/02 cleaning in bounded memory. It is a standalone command,
+not a stage: the cleaned scrapes feed the notebooks' merge and
+feature-engineering steps, which the graph does not run (it starts from
+their ``gurgaon_properties_missing_value_treated.csv`` output).
+
+Usage (from the ``website`` directory)::
+
+    python -m core.pipeline                  # rebuild what changed
+    python -m core.pipeline --dry-run        # show what would run
+    python -m core.pipeline --only sector_stats --jobs 1
+    python -m core.pipeline --no-dense       # top-K files only, for large project counts
+    python -m core.pipeline.ingest --listings new_listings.csv
+    python -m core.pipeline.cleaning houses ../data/independent-house.csv ../data/house_cleaned.csv
+"""
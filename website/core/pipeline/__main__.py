@@ -0,0 +1,49 @@
+import argparse
+import sys
+
+from core.config import DATA_DIR
+from core.pipeline.engine import plan, run, select, summarize
+from core.pipeline.stages import DEFAULT_FACILITY_MODEL, FACILITY_MODELS, build_stages
+from core.tables import NOTEBOOK_DATA_DIR
+from core.topk import DEFAULT_K
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the website dataset from the notebook data")
+    parser.add_argument("--data-dir", default=NOTEBOOK_DATA_DIR,
+                        help="raw inputs (default: the notebooks' data/ directory)")
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (1 = run in this process)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild even when inputs are unchanged")
+    parser.add_argument("--only", nargs="*", default=None,
+                        help="stages to build (plus what they depend on)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="list stages and whether they would run")
+    parser.add_argument("--facility-model", choices=FACILITY_MODELS, default=DEFAULT_FACILITY_MODEL)
+    parser.add_argument("--k", type=int, default=DEFAULT_K,
+                        help="neighbours kept in the top-K similarity files")
+    parser.add_argument("--no-dense", dest="dense", action="store_false",
+                        help="build the top-K files in row tiles without the N×N pickles")
+    args = parser.parse_args(argv)
+
+    try:
+        stages = build_stages(args.data_dir, args.out_dir, args.facility_model, args.k, args.dense)
+    except ImportError as exc:
+        parser.error(str(exc))
+    if args.only:
+        stages = select(stages, args.only)
+
+    if args.dry_run:
+        for stage, reason in plan(stages, args.out_dir):
+            print(f"{stage.name:<24} {reason}")
+        return 0
+
+    results = run(stages, args.out_dir, jobs=args.jobs, force=args.force)
+    summarize(results)
+    return 1 if any(r.status in ("failed", "blocked") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
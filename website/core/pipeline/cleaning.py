@@ -0,0 +1,207 @@
+"""Streaming cleaner for the raw 99acres flat and house scrapes.
+
+The notebook 01 (flats) and 02 (houses) preprocessing, applied to one
+chunk of rows at a time: the raw CSV is read as a generator of
+``chunksize``-row frames, chunks are cleaned in a process pool and the
+results are appended to the output in input order. At most ``2 * jobs``
+chunks are in flight, so memory stays bounded by the chunk size rather
+than the file size. The house notebook's ``drop_duplicates`` becomes a
+set of raw-row hashes kept by the writer (8 bytes per distinct row).
+
+Usage (from the ``website`` directory)::
+
+    python -m core.pipeline.cleaning houses ../data/independent-house.csv ../data/house_cleaned.csv
+    python -m core.pipeline.cleaning flats flats.csv flats_cleaned.csv --chunksize 2000 --jobs 4
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple
+
+import pandas as pd
+
+from core.pipeline.engine import tmp_path
+
+# Raw rows carry long descriptions (~2 KB each)
+DEFAULT_CHUNKSIZE = 1000
+
+_RATING_RE = r"\d+(\.\d+)?\s?★"
+
+
+# --------------------------------------------------
+# COLUMN TRANSFORMS
+# --------------------------------------------------
+def _token(series, sep, i=0):
+    """``series.str.split(sep).str.get(i)``, also when a chunk's column is all missing."""
+    return series.str.split(sep).astype(object).str.get(i)
+
+
+def _society(series):
+    """Drop the "4.2 ★" rating suffix and lowercase (missing becomes "nan")."""
+    return series.map(str).str.replace(_RATING_RE, "", regex=True).str.strip().str.lower()
+
+
+def _price(series):
+    """``"5.25 Crore"`` → 5.25, ``"95 Lac"`` → 0.95 (crore, 2 decimals)."""
+    value = pd.to_numeric(_token(series, " "), errors="coerce")
+    value = value.where(_token(series, " ", 1) != "Lac", value / 100)
+    return pd.Series([round(v, 2) for v in value], index=series.index, dtype="float64")
+
+
+def _rate(series):
+    """``"₹ 20,115/sq.ft."`` → 20115.0"""
+    return (
+        _token(series, "/")
+        .str.replace("₹", "").str.replace(",", "").str.strip()
+        .astype("float")
+    )
+
+
+def _leading_int(series):
+    """``"5 Bedrooms"`` → 5"""
+    return _token(series, " ").astype("int")
+
+
+def _common(df):
+    """Steps shared by both notebooks, after the rate column is renamed."""
+    df = df[df["price"] != "Price on Request"].copy()
+    df["price"] = _price(df["price"])
+    df["price_per_sqft"] = _rate(df["price_per_sqft"])
+
+    df = df[df["bedRoom"].notna() & df["bathroom"].notna()].copy()
+    df["bedRoom"] = _leading_int(df["bedRoom"])
+    df["bathroom"] = _leading_int(df["bathroom"])
+    df["balcony"] = _token(df["balcony"], " ").str.replace("No", "0")
+    df["additionalRoom"] = df["additionalRoom"].fillna("not available").str.lower()
+    return df
+
+
+def _area(df):
+    return round((df["price"] * 10000000) / df["price_per_sqft"])
+
+
+# --------------------------------------------------
+# CHUNK CLEANERS
+# --------------------------------------------------
+def clean_flats(chunk):
+    """Notebook 01 on one chunk of ``flats.csv``."""
+    df = chunk.drop(columns=["link", "property_id"]).rename(columns={"area": "price_per_sqft"})
+    df["society"] = _society(df["society"])
+    df = _common(df[df["price"] != "price"])
+    df["floorNum"] = (
+        _token(df["floorNum"], " ")
+        .replace("Ground", "0").str.replace("Basement", "-1").str.replace("Lower", "0")
+        .str.extract(r"(\d+)", expand=False)
+    )
+    df["facing"] = df["facing"].fillna("NA")
+    df.insert(loc=4, column="area", value=_area(df))
+    df.insert(loc=1, column="property_type", value="flat")
+    return df
+
+
+def clean_houses(chunk):
+    """Notebook 02 on one chunk of ``independent-house.csv``."""
+    df = chunk.drop(columns=["link", "property_id"]).rename(columns={"rate": "price_per_sqft"})
+    # Substring replace as in the notebook (missing societies were "nan")
+    df["society"] = _society(df["society"]).str.replace("nan", "independent")
+    df = _common(df)
+    df["noOfFloor"] = _token(df["noOfFloor"], " ")
+    df = df.rename(columns={"noOfFloor": "floorNum"})
+    df["facing"] = df["facing"].fillna("NA")
+    df["area"] = _area(df)
+    df.insert(loc=1, column="property_type", value="house")
+    return df
+
+
+class Cleaner(NamedTuple):
+    clean: Callable
+    dedupe: bool  # drop repeated raw rows across the whole file
+
+
+CLEANERS = {
+    "flats": Cleaner(clean_flats, dedupe=False),
+    "houses": Cleaner(clean_houses, dedupe=True),
+}
+
+
+# --------------------------------------------------
+# STREAMING
+# --------------------------------------------------
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Raw rows as text; a column that is empty in one chunk stays text."""
+    return pd.read_csv(path, dtype=str, chunksize=chunksize)
+
+
+def clean_chunk(kind, chunk):
+    """``(cleaned, raw_row_hashes)``; hashes only for de-duplicated kinds."""
+    cleaner = CLEANERS[kind]
+    cleaned = cleaner.clean(chunk)
+    if not cleaner.dedupe:
+        return cleaned, None
+    hashes = pd.util.hash_pandas_object(chunk, index=False)
+    return cleaned, hashes.loc[cleaned.index].to_numpy()
+
+
+def stream_clean(src, dst, kind, chunksize=DEFAULT_CHUNKSIZE, jobs=None):
+    """Clean ``src`` into ``dst`` chunk by chunk; returns the rows written."""
+    if kind not in CLEANERS:
+        raise ValueError(f"Unknown kind {kind!r}; expected one of {', '.join(CLEANERS)}")
+    jobs = jobs or os.cpu_count() or 1
+    seen = set()
+    written = 0
+    header = True
+
+    def write(result, out):
+        nonlocal written, header
+        cleaned, hashes = result
+        if hashes is not None:
+            keep = [h not in seen and not seen.add(h) for h in hashes]
+            cleaned = cleaned[keep]
+        cleaned.to_csv(out, header=header, index=False)
+        written += len(cleaned)
+        header = False
+
+    tmp = tmp_path(dst)
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="") as out:
+            if jobs == 1:
+                for chunk in iter_chunks(src, chunksize):
+                    write(clean_chunk(kind, chunk), out)
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    pending = deque()
+                    for chunk in iter_chunks(src, chunksize):
+                        pending.append(pool.submit(clean_chunk, kind, chunk))
+                        if len(pending) >= 2 * jobs:
+                            write(pending.popleft().result(), out)
+                    while pending:
+                        write(pending.popleft().result(), out)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return written
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean a raw flats/houses scrape in chunks")
+    parser.add_argument("kind", choices=sorted(CLEANERS))
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (1 = clean in this process)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = stream_clean(args.src, args.dst, args.kind, args.chunksize, args.jobs)
+    print(f"{args.kind}: {rows} rows -> {args.dst} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Recommender similarity straight to top-K files, one row tile at a time.
+
+The notebook 12 facilities/price/location features are turned into
+float32 row vectors scaled to unit length, so cosine similarity is a
+plain dot product. Rows are processed in tiles of ``tile_rows``: each
+tile's scores against every project are computed, reduced to the top-K
+neighbours (``core.topk.topk_rows``) and dropped, so the N×N matrix never
+exists. Memory is one ``tile_rows × N`` block per worker plus the N·K
+result, e.g. about 0.3 GB per worker for 50k projects.
+
+With ``jobs`` > 1 the tiles are spread over a process pool; dense
+feature matrices are shared with the workers as a memory-mapped ``.npy``
+instead of being copied into each of them.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.pipeline.cosine --jobs 4
+    python -m core.pipeline.cosine --apartments big.csv --out-dir /tmp/topk --tile-rows 512
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from core.config import DATA_DIR
+from core.pipeline import transforms
+from core.similarity import SIMILARITY_FILES
+from core.tables import NOTEBOOK_DATA_DIR
+from core.topk import DEFAULT_K, save_topk, topk_matrix, topk_path, topk_rows
+
+# 256 rows × 50k projects is a 100 MB float64 block per worker
+DEFAULT_TILE_ROWS = 256
+
+# Columns standardized per pass (bounds the float64 temporaries)
+_COLUMN_BLOCK = 256
+
+_WORKER_VECTORS = None
+
+
+# --------------------------------------------------
+# FEATURE VECTORS
+# --------------------------------------------------
+def standardized(features):
+    """``StandardScaler().fit_transform(features)`` as float32.
+
+    Means and variances are accumulated in float64 a block of columns at
+    a time, so no float64 copy of the whole matrix is made.
+    """
+    values = np.array(features, dtype=np.float32)
+    for start in range(0, values.shape[1], _COLUMN_BLOCK):
+        cols = values[:, start:start + _COLUMN_BLOCK].astype(np.float64)
+        mean = cols.mean(axis=0)
+        std = cols.std(axis=0)
+        std[std < 10 * np.finfo(np.float64).eps] = 1.0
+        values[:, start:start + _COLUMN_BLOCK] = (cols - mean) / std
+    return values
+
+
+def unit_rows(vectors):
+    """float32 ``vectors`` with every non-zero row scaled to length 1."""
+    if sparse.issparse(vectors):
+        return normalize(sparse.csr_matrix(vectors, dtype=np.float32))
+    return normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def facility_vectors(apartments, model="tfidf"):
+    return transforms.facility_vectors(transforms.facility_texts(apartments), model)
+
+
+def price_vectors(apartments):
+    return standardized(transforms.price_features(apartments))
+
+
+def location_vectors(distances):
+    """Standardized landmark distances (``distance_location.pkl``)."""
+    return standardized(distances)
+
+
+# --------------------------------------------------
+# TILED TOP-K
+# --------------------------------------------------
+def topk_tile(vectors, start, stop, k):
+    """``topk_rows`` for rows ``start:stop`` of ``vectors @ vectors.T``."""
+    tile = vectors[start:stop] @ vectors.T
+    if sparse.issparse(tile):
+        tile = tile.toarray()
+    return topk_rows(np.asarray(tile, dtype=np.float64), start, k)
+
+
+def _init_worker(vectors):
+    global _WORKER_VECTORS
+    if isinstance(vectors, str):
+        vectors = np.load(vectors, mmap_mode="r")
+    _WORKER_VECTORS = vectors
+
+
+def _worker_tile(args):
+    start, stop, k = args
+    return topk_tile(_WORKER_VECTORS, start, stop, k)
+
+
+def topk_cosine(vectors, k=DEFAULT_K, tile_rows=DEFAULT_TILE_ROWS, jobs=None):
+    """``TopKMatrix`` of the row-wise cosine similarity of ``vectors``.
+
+    Equal to ``sparsify_topk(cosine_similarity(vectors), k)`` up to
+    float32 rounding. ``vectors`` may be dense or scipy sparse.
+    """
+    vectors = unit_rows(vectors)
+    n = vectors.shape[0]
+    k = min(int(k), n - 1)
+
+    indices = np.empty((n, k), dtype=np.int32)
+    data = np.empty((n, k), dtype=np.float32)
+    fill = np.zeros(n, dtype=np.float64)
+    tiles = [(start, min(start + tile_rows, n), k) for start in range(0, n, tile_rows)]
+
+    def store(tile, result):
+        start, stop, _ = tile
+        indices[start:stop], data[start:stop], fill[start:stop] = result
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tiles) == 1:
+        for tile in tiles:
+            store(tile, topk_tile(vectors, *tile))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            shared = vectors
+            if not sparse.issparse(vectors):
+                shared = os.path.join(tmp, "vectors.npy")
+                np.save(shared, vectors)
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(tiles)),
+                initializer=_init_worker,
+                initargs=(shared,),
+            ) as pool:
+                for tile, result in zip(tiles, pool.map(_worker_tile, tiles)):
+                    store(tile, result)
+    return topk_matrix(indices, data, fill, n)
+
+
+# --------------------------------------------------
+# BUILD
+# --------------------------------------------------
+def build_topk(apartments, out_dir=DATA_DIR, facility_model="tfidf", k=DEFAULT_K,
+               tile_rows=DEFAULT_TILE_ROWS, jobs=None, log=print):
+    """Write ``distance_location.pkl`` and the three ``*_topk.npz`` files.
+
+    Returns the top-K paths in ``SIMILARITY_FILES`` order.
+    """
+    distances = transforms.landmark_distances(apartments)
+    with open(os.path.join(out_dir, "distance_location.pkl"), "wb") as f:
+        pickle.dump(distances, f)
+
+    features = {
+        SIMILARITY_FILES[0]: lambda: facility_vectors(apartments, facility_model),
+        SIMILARITY_FILES[1]: lambda: price_vectors(apartments),
+        SIMILARITY_FILES[2]: lambda: location_vectors(distances),
+    }
+    paths = []
+    for name, vectors in features.items():
+        start = time.perf_counter()
+        path = topk_path(name, out_dir)
+        save_topk(path, topk_cosine(vectors(), k, tile_rows, jobs))
+        log(f"{name}: top-{k} -> {path} ({time.perf_counter() - start:.2f}s)")
+        paths.append(path)
+    return paths
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    from core.pipeline.stages import (
+        APARTMENTS_FILE, DEFAULT_FACILITY_MODEL, FACILITY_MODELS, resolve_facility_model,
+    )
+
+    parser = argparse.ArgumentParser(description="Build the recommender top-K files in row tiles")
+    parser.add_argument("--apartments", default=os.path.join(NOTEBOOK_DATA_DIR, APARTMENTS_FILE))
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    parser.add_argument("--facility-model", choices=FACILITY_MODELS, default=DEFAULT_FACILITY_MODEL)
+    parser.add_argument("--k", type=int, default=DEFAULT_K)
+    parser.add_argument("--tile-rows", type=int, default=DEFAULT_TILE_ROWS)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (1 = run in this process)")
+    args = parser.parse_args(argv)
+    try:
+        facility_model = resolve_facility_model(args.facility_model)
+    except ImportError as exc:
+        parser.error(str(exc))
+
+    build_topk(pd.read_csv(args.apartments), args.out_dir,
+               facility_model, args.k, args.tile_rows, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""Stage graph runner with content-hash skipping and parallel execution.
+
+A ``Stage`` declares the files it reads and writes; dependencies are the
+stages that write its inputs. Before running a stage the runner hashes
+its code, parameters and input files. If the key and the output hashes
+match what the last run recorded, the stage is skipped. Stages whose
+upstream work is finished run concurrently in a process pool.
+Outputs are written to temporary files and moved into place only when
+the whole stage succeeds.
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+from core.config import CACHE_DIR
+
+STATE_DIR = os.path.join(CACHE_DIR, "pipeline")
+
+# Bump to invalidate every recorded stage key
+ENGINE_VERSION = 1
+
+
+class Stage:
+    """One step: ``func(inputs, outputs, **params)``.
+
+    ``inputs`` and ``outputs`` map names to file paths. ``code`` names
+    modules whose source is part of the stage key, besides ``func``.
+    """
+
+    def __init__(self, name, func, inputs=None, outputs=None, params=None, code=()):
+        self.name = name
+        self.func = func
+        self.inputs = dict(inputs or {})
+        self.outputs = dict(outputs or {})
+        self.params = dict(params or {})
+        self.code = tuple(code)
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+class StageResult(NamedTuple):
+    name: str
+    status: str  # "built", "cached", "failed" or "blocked"
+    seconds: float
+    error: str = ""
+
+
+# --------------------------------------------------
+# GRAPH
+# --------------------------------------------------
+def dependencies(stages):
+    """``{stage name: set of upstream stage names}``."""
+    writers = {}
+    for stage in stages:
+        for path in stage.outputs.values():
+            path = os.path.abspath(path)
+            if path in writers:
+                raise ValueError(f"{path} is written by both {writers[path]} and {stage.name}")
+            writers[path] = stage.name
+    return {
+        stage.name: {writers[p] for p in map(os.path.abspath, stage.inputs.values()) if p in writers}
+        for stage in stages
+    }
+
+
+def topological_order(stages):
+    deps = dependencies(stages)
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique")
+
+    order, done = [], set()
+    remaining = list(by_name)
+    while remaining:
+        ready = [n for n in remaining if deps[n] <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle between {', '.join(remaining)}")
+        for name in ready:
+            order.append(by_name[name])
+            done.add(name)
+        remaining = [n for n in remaining if n not in done]
+    return order
+
+
+def select(stages, names):
+    """``names`` plus everything upstream of them, in the original order."""
+    deps = dependencies(stages)
+    unknown = set(names) - set(deps)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+    keep, todo = set(), list(names)
+    while todo:
+        name = todo.pop()
+        if name not in keep:
+            keep.add(name)
+            todo.extend(deps[name])
+    return [s for s in stages if s.name in keep]
+
+
+# --------------------------------------------------
+# HASHING
+# --------------------------------------------------
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(path, memo):
+    """Content hash of ``path``; ``memo`` reuses it while size/mtime are unchanged."""
+    st = os.stat(path)
+    stamp = [st.st_size, st.st_mtime_ns]
+    entry = memo.get(path)
+    if entry and entry[:2] == stamp:
+        return entry[2]
+    digest = _sha256_file(path)
+    memo[path] = stamp + [digest]
+    return digest
+
+
+def _source(obj):
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return repr(obj)
+
+
+def stage_key(stage, memo):
+    """Hash of the stage's code, parameters and input contents."""
+    digest = hashlib.sha256()
+    digest.update(f"{ENGINE_VERSION}\0{stage.name}\0".encode())
+    digest.update(_source(stage.func).encode())
+    for module in stage.code:
+        digest.update(_source(importlib.import_module(module)).encode())
+    digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+    for name, path in sorted(stage.inputs.items()):
+        digest.update(f"\0{name}={file_digest(os.path.abspath(path), memo)}".encode())
+    return digest.hexdigest()
+
+
+# --------------------------------------------------
+# STATE
+# --------------------------------------------------
+def state_path(out_dir):
+    """Per-output-directory state file under ``CACHE_DIR``."""
+    tag = hashlib.sha256(os.path.abspath(out_dir).encode()).hexdigest()[:12]
+    return os.path.join(STATE_DIR, f"state-{tag}.json")
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {"stages": {}, "files": {}}
+    state.setdefault("stages", {})
+    state.setdefault("files", {})
+    return state
+
+
+def save_state(state, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _outputs_match(stage, record, memo):
+    recorded = record.get("outputs", {})
+    for name, path in stage.outputs.items():
+        path = os.path.abspath(path)
+        if not os.path.exists(path) or recorded.get(name) != file_digest(path, memo):
+            return False
+    return True
+
+
+def is_fresh(stage, key, state):
+    record = state["stages"].get(stage.name)
+    return bool(record) and record.get("key") == key and _outputs_match(stage, record, state["files"])
+
+
+# --------------------------------------------------
+# EXECUTION
+# --------------------------------------------------
+def tmp_path(path):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid()}.tmp{ext}"
+
+
+def execute(stage):
+    """Run ``stage`` writing to temporary files, then move them into place."""
+    tmp = {name: tmp_path(path) for name, path in stage.outputs.items()}
+    for path in tmp.values():
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    try:
+        stage.func(dict(stage.inputs), tmp, **stage.params)
+        missing = [name for name, path in tmp.items() if not os.path.exists(path)]
+        if missing:
+            raise RuntimeError(f"{stage.name} did not write {', '.join(missing)}")
+        for name, path in tmp.items():
+            os.replace(path, stage.outputs[name])
+    finally:
+        for path in tmp.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _timed_execute(stage):
+    start = time.perf_counter()
+    execute(stage)
+    return time.perf_counter() - start
+
+
+def run(stages, out_dir, jobs=None, force=False, log=print):
+    """Bring every stage's outputs up to date; returns ``StageResult`` s.
+
+    ``jobs=1`` runs stages in this process, otherwise independent stages
+    run in up to ``jobs`` worker processes (default: CPU count). A failed
+    stage blocks its downstream stages but not unrelated ones.
+    """
+    order = topological_order(stages)
+    deps = dependencies(order)
+    path = state_path(out_dir)
+    state = load_state(path)
+    jobs = jobs or os.cpu_count() or 1
+
+    results = {}
+    keys = {}
+    running = {}
+    waiting = [s.name for s in order]
+    by_name = {s.name: s for s in order}
+
+    def finish(name, status, seconds=0.0, error=""):
+        results[name] = StageResult(name, status, seconds, error)
+        stage = by_name[name]
+        if status == "built":
+            memo = state["files"]
+            state["stages"][name] = {
+                "key": keys[name],
+                "outputs": {k: file_digest(os.path.abspath(p), memo) for k, p in stage.outputs.items()},
+            }
+            save_state(state, path)
+        suffix = f" ({seconds:.2f}s)" if status == "built" else ""
+        log(f"{name}: {status}{suffix}{' - ' + error if error else ''}")
+
+    def launch_ready(pool):
+        for name in list(waiting):
+            upstream = deps[name]
+            if not upstream <= set(results):
+                continue
+            waiting.remove(name)
+            if any(results[u].status in ("failed", "blocked") for u in upstream):
+                finish(name, "blocked", error="upstream failed")
+                continue
+            stage = by_name[name]
+            try:
+                keys[name] = stage_key(stage, state["files"])
+            except OSError as exc:
+                finish(name, "failed", error=f"missing input {exc.filename}")
+                continue
+            if not force and is_fresh(stage, keys[name], state):
+                finish(name, "cached")
+            elif pool is None:
+                try:
+                    finish(name, "built", _timed_execute(stage))
+                except Exception as exc:  # noqa: BLE001 - reported per stage
+                    finish(name, "failed", error=f"{type(exc).__name__}: {exc}")
+            else:
+                running[pool.submit(_timed_execute, stage)] = name
+
+    if jobs == 1:
+        while waiting:
+            launch_ready(None)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            launch_ready(pool)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        finish(name, "built", future.result())
+                    except Exception as exc:  # noqa: BLE001 - reported per stage
+                        finish(name, "failed", error=f"{type(exc).__name__}: {exc}")
+                launch_ready(pool)
+
+    save_state(state, path)
+    return [results[s.name] for s in order]
+
+
+def plan(stages, out_dir):
+    """``[(stage, reason)]`` without running anything ("fresh" when skippable)."""
+    order = topological_order(stages)
+    deps = dependencies(order)
+    state = load_state(state_path(out_dir))
+    stale = set()
+    out = []
+    for stage in order:
+        if deps[stage.name] & stale:
+            reason = "upstream changes"
+        elif any(not os.path.exists(p) for p in stage.inputs.values()):
+            reason = "missing input"
+        elif not is_fresh(stage, stage_key(stage, state["files"]), state):
+            reason = "changed" if stage.name in state["stages"] else "never built"
+        else:
+            reason = "fresh"
+        if reason != "fresh":
+            stale.add(stage.name)
+        out.append((stage, reason))
+    return out
+
+
+def summarize(results, stream=sys.stdout):
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    total = sum(r.seconds for r in results)
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"{summary}; {total:.2f}s of stage time", file=stream)
@@ -0,0 +1,249 @@
+"""Incremental ingest of newly scraped listings and projects.
+
+New listings (rows in the ``gurgaon_properties_missing_value_treated.csv``
+schema) are cleaned on their own and appended to the property table,
+``new_latlong.csv`` and ``df.pkl``. ``sector_stats.csv`` is recomputed
+from running per-sector sums and counts (``sector_totals.csv``).
+
+New projects (rows in the ``appartments.csv`` schema) get similarity
+rows against the existing projects and each other. The existing N×N
+block is kept as is: scalers and the TF-IDF vocabulary are fitted on
+the existing projects, so a batch of M projects costs O(M·N) instead of
+a full O(N²) rebuild. The new rows and columns are merged into the
+top-K files (``core.topk.extend_topk``) and the approximate index is
+rebuilt from the feature vectors, which is linear in N. The dense
+similarity pickles are extended only when the build wrote them (they
+are N² by nature); after ``--no-dense`` only the top-K files exist. The
+new rows are appended to the raw files too, so the next
+``python -m core.pipeline`` run refits everything from scratch.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.pipeline.ingest --listings new_listings.csv
+    python -m core.pipeline.ingest --projects new_projects.csv --facility-model tfidf
+"""
+import argparse
+import os
+import pickle
+import time
+
+import joblib
+import pandas as pd
+
+from core.ann import ANN_FILE, AnnIndex
+from core.config import DATA_DIR
+from core.nearby import PROJECT_PRICES_FILE
+from core.pipeline import transforms
+from core.pipeline.engine import tmp_path
+from core.pipeline.stages import (
+    APARTMENTS_FILE, DEFAULT_FACILITY_MODEL, FACILITY_MODELS, LATLONG_FILE, PROJECTS_FILE,
+    PROPERTIES_FILE, SECTOR_TOTALS_FILE, ann_blocks, resolve_facility_model,
+)
+from core.similarity import SIMILARITY_FILES
+from core.spatial import LANDMARKS_FILE, PROPERTY_COORDS_FILE, build_spatial_tables
+from core.tables import NOTEBOOK_DATA_DIR
+from core.topk import DEFAULT_K, extend_topk, load_topk, save_topk, topk_path
+
+
+def _replace(path, write):
+    """Call ``write(tmp)`` and move the result over ``path``."""
+    tmp = tmp_path(path)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _dump_pickle(obj, path):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+
+def _read_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _append_csv(df, path):
+    df.to_csv(path, mode="a", header=False, index=False)
+
+
+# --------------------------------------------------
+# LISTINGS
+# --------------------------------------------------
+def ingest_listings(new, raw_dir=NOTEBOOK_DATA_DIR, out_dir=DATA_DIR):
+    """Append the usable rows of ``new``; returns how many were added."""
+    properties_path = os.path.join(raw_dir, PROPERTIES_FILE)
+    new_latlong_path = os.path.join(out_dir, "new_latlong.csv")
+    totals_path = os.path.join(out_dir, SECTOR_TOTALS_FILE)
+    df_path = os.path.join(out_dir, "df.pkl")
+
+    rows = transforms.clean_listings(new, pd.read_csv(properties_path))
+    if rows.empty:
+        return 0
+
+    latlong = pd.read_csv(os.path.join(raw_dir, LATLONG_FILE))
+    located = transforms.attach_coordinates(rows, latlong)
+    header = pd.read_csv(new_latlong_path, nrows=0).columns
+
+    if os.path.exists(totals_path):
+        totals = pd.read_csv(totals_path)
+    else:
+        # First ingest after a build that predates sector_totals.csv
+        totals = transforms.sector_totals(pd.read_csv(new_latlong_path))
+    totals = transforms.add_totals(totals, transforms.sector_totals(located))
+
+    features = pd.concat([joblib.load(df_path), transforms.model_features(rows)], ignore_index=True)
+
+    _replace(totals_path, lambda p: totals.to_csv(p, index=False))
+    _replace(os.path.join(out_dir, "sector_stats.csv"),
+             lambda p: transforms.stats_from_totals(totals).to_csv(p, index=False))
+    _replace(df_path, lambda p: joblib.dump(transforms.object_strings(features), p))
+    _append_csv(located[header], new_latlong_path)
+    _append_csv(rows, properties_path)
+    return len(rows)
+
+
+# --------------------------------------------------
+# PROJECTS
+# --------------------------------------------------
+def _new_projects(new, existing):
+    missing = [c for c in existing.columns if c not in new.columns]
+    if missing:
+        raise ValueError(f"New projects are missing columns: {', '.join(missing)}")
+    new = new[list(existing.columns)].dropna(subset=["PropertyName"])
+    new = new[~new["PropertyName"].isin(existing["PropertyName"])]
+    return new.drop_duplicates("PropertyName").reset_index(drop=True)
+
+
+def _similarity_files(out_dir):
+    """``{name: (top-K path, dense path or None)}``; raises when the build is incomplete."""
+    topk = {name: topk_path(name, out_dir) for name in SIMILARITY_FILES}
+    dense = {name: os.path.join(out_dir, name) for name in SIMILARITY_FILES}
+    missing = [p for p in topk.values() if not os.path.exists(p)]
+    if missing:
+        raise FileNotFoundError(f"Missing {', '.join(missing)}; build the dataset with "
+                                "`python -m core.pipeline` before ingesting projects")
+    present = [p for p in dense.values() if os.path.exists(p)]
+    if present and len(present) != len(dense):
+        absent = [p for p in dense.values() if p not in present]
+        raise FileNotFoundError(f"Missing {', '.join(absent)} next to {', '.join(present)}; "
+                                "rebuild with `python -m core.pipeline` (or --no-dense)")
+    return {name: (topk[name], dense[name] if present else None) for name in SIMILARITY_FILES}
+
+
+def ingest_projects(new, raw_dir=NOTEBOOK_DATA_DIR, out_dir=DATA_DIR, facility_model=DEFAULT_FACILITY_MODEL,
+                    k=DEFAULT_K):
+    """Add similarity rows for the projects in ``new``; returns how many were added.
+
+    Nothing is written when the dataset is incomplete (``FileNotFoundError``),
+    the inputs do not line up (``ValueError``) or the facility model is
+    not installed (``ImportError``).
+    """
+    model = resolve_facility_model(facility_model)
+    apartments_path = os.path.join(raw_dir, APARTMENTS_FILE)
+    distances_path = os.path.join(out_dir, "distance_location.pkl")
+    urls_path = os.path.join(out_dir, "url.pkl")
+    ann_path = os.path.join(out_dir, ANN_FILE)
+
+    files = _similarity_files(out_dir)
+    existing = pd.read_csv(apartments_path)
+    distances = _read_pickle(distances_path)
+    if list(existing["PropertyName"]) != list(distances.index):
+        raise ValueError(f"{distances_path} does not match {apartments_path}; "
+                         "rebuild it with `python -m core.pipeline` first")
+
+    new = _new_projects(new, existing)
+    if new.empty:
+        return 0
+
+    # Location: new landmarks join the merged columns they match
+    aligned, unmatched = transforms.align_landmarks(transforms.location_distances(new), distances.columns)
+    aligned = aligned.fillna(transforms.MISSING_DISTANCE_M)
+    price = transforms.price_features(existing)
+    rows = {
+        SIMILARITY_FILES[0]: transforms.appended_facility_similarity(
+            transforms.facility_texts(existing), transforms.facility_texts(new), model=model),
+        SIMILARITY_FILES[1]: transforms.appended_cosine(
+            price, transforms.price_features_like(new, price.columns)),
+        SIMILARITY_FILES[2]: transforms.appended_cosine(distances, aligned),
+    }
+    # The merged top-K files are ready before anything is replaced
+    topk = {name: extend_topk(load_topk(files[name][0]), new_rows, k=k) for name, new_rows in rows.items()}
+
+    all_distances = pd.concat([distances, pd.concat([aligned, unmatched], axis=1)])
+    all_distances = transforms.object_strings(all_distances.fillna(transforms.MISSING_DISTANCE_M))
+    urls = pd.concat([_read_pickle(urls_path), new[["PropertyName", "Link"]]], ignore_index=True)
+
+    all_apartments = pd.concat([existing, new], ignore_index=True)
+    ann = None
+    if os.path.exists(ann_path):
+        blocks = ann_blocks(all_apartments, all_distances, model)
+        ann = AnnIndex.build(all_distances.index, blocks, AnnIndex.load(ann_path).tables)
+
+    for name, (path, dense_path) in files.items():
+        _replace(path, lambda p: save_topk(p, topk[name]))
+        if dense_path is not None:
+            # One similarity matrix in memory at a time
+            matrix = transforms.extend_similarity(_read_pickle(dense_path), rows[name])
+            _replace(dense_path, lambda p: _dump_pickle(matrix, p))
+            del matrix
+    _replace(distances_path, lambda p: _dump_pickle(all_distances, p))
+    _replace(urls_path, lambda p: _dump_pickle(transforms.object_strings(urls), p))
+    if ann is not None:
+        _replace(ann_path, ann.save)
+
+    projects = pd.concat([pd.read_csv(os.path.join(raw_dir, PROJECTS_FILE)), new])
+    subnames = projects.drop_duplicates("PropertyName").set_index("PropertyName")["PropertySubName"].to_dict()
+    property_coords, landmarks = build_spatial_tables(
+        all_distances, pd.read_csv(os.path.join(out_dir, "new_latlong.csv")), subnames
+    )
+    _replace(os.path.join(out_dir, PROPERTY_COORDS_FILE),
+             lambda p: property_coords.round(6).to_csv(p, index=False))
+    _replace(os.path.join(out_dir, LANDMARKS_FILE),
+             lambda p: landmarks.round(6).to_csv(p, index=False))
+
+    prices_path = os.path.join(out_dir, PROJECT_PRICES_FILE)
+    if os.path.exists(prices_path):
+        _append_csv(transforms.price_ranges(new), prices_path)
+    _append_csv(new, apartments_path)
+    return len(new)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append newly scraped listings and projects")
+    parser.add_argument("--listings", help="CSV of new listings (property-table columns)")
+    parser.add_argument("--projects", help="CSV of new projects (appartments.csv columns)")
+    parser.add_argument("--data-dir", default=NOTEBOOK_DATA_DIR,
+                        help="raw inputs the new rows are appended to")
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    parser.add_argument("--facility-model", choices=FACILITY_MODELS, default=DEFAULT_FACILITY_MODEL)
+    parser.add_argument("--k", type=int, default=DEFAULT_K,
+                        help="neighbours kept in the top-K similarity files")
+    args = parser.parse_args(argv)
+    if not args.listings and not args.projects:
+        parser.error("nothing to ingest: pass --listings and/or --projects")
+    if args.projects:
+        try:
+            resolve_facility_model(args.facility_model)
+        except ImportError as exc:
+            parser.error(str(exc))
+
+    if args.listings:
+        start = time.perf_counter()
+        added = ingest_listings(pd.read_csv(args.listings), args.data_dir, args.out_dir)
+        print(f"listings: {added} added ({time.perf_counter() - start:.2f}s)")
+    if args.projects:
+        start = time.perf_counter()
+        added = ingest_projects(pd.read_csv(args.projects), args.data_dir, args.out_dir,
+                                args.facility_model, args.k)
+        print(f"projects: {added} added ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""The website's build graph: raw notebook data in, ``dataset/`` files out.
+
+Stage functions take ``(inputs, outputs, **params)`` path dicts, read
+their inputs, call ``core.pipeline.transforms`` and write every output;
+they are module-level so worker processes can import them.
+"""
+import importlib.util
+import json
+import os
+import pickle
+
+import joblib
+import pandas as pd
+
+from core.ann import ANN_FILE, DEFAULT_TABLES, AnnIndex
+from core.config import DATA_DIR
+from core.nearby import PROJECT_PRICES_FILE
+from core.geo import LEVELS, SOURCE_GEOJSON, build_levels, lod_path, read_geojson, write_geojson
+from core.pipeline import cosine, transforms
+from core.pipeline.engine import Stage
+from core.similarity import SIMILARITY_FILES
+from core.spatial import LANDMARKS_FILE, PROPERTY_COORDS_FILE, build_spatial_tables
+from core.tables import NOTEBOOK_DATA_DIR
+from core.topk import DEFAULT_K, save_topk, sparsify_topk, topk_path
+
+# Raw inputs (notebook ``data/`` directory)
+PROPERTIES_FILE = "gurgaon_properties_missing_value_treated.csv"
+LATLONG_FILE = "latlong.csv"
+APARTMENTS_FILE = "appartments.csv"
+PROJECTS_FILE = "real_estate_data.csv"
+BOUNDARIES_FILE = "export.geojson"
+
+# Running per-sector sums/counts that incremental ingest updates
+SECTOR_TOTALS_FILE = "sector_totals.csv"
+
+# SBERT built the shipped Top_facilities.pkl; TF-IDF only on request
+FACILITY_MODELS = ("sbert", "tfidf")
+DEFAULT_FACILITY_MODEL = "sbert"
+
+_TRANSFORMS = ("core.pipeline.transforms",)
+
+
+def _write_pickle(obj, path):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+
+def _read_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# --------------------------------------------------
+# STAGE FUNCTIONS
+# --------------------------------------------------
+def sector_coordinates(inputs, outputs):
+    properties = pd.read_csv(inputs["properties"])
+    latlong = pd.read_csv(inputs["latlong"])
+    transforms.attach_coordinates(properties, latlong).to_csv(outputs["new_latlong"], index=False)
+
+
+def sector_stats(inputs, outputs):
+    new_latlong = pd.read_csv(inputs["new_latlong"])
+    transforms.sector_stats(new_latlong).to_csv(outputs["sector_stats"], index=False)
+    transforms.sector_totals(new_latlong).to_csv(outputs["sector_totals"], index=False)
+
+
+def model_features(inputs, outputs):
+    features = transforms.model_features(pd.read_csv(inputs["properties"]))
+    with open(outputs["df"], "wb") as f:
+        joblib.dump(features, f)
+
+
+def sector_geojson(inputs, outputs):
+    clean = transforms.clean_sector_geojson(read_geojson(inputs["boundaries"]))
+    with open(outputs["geojson"], "w", encoding="utf-8") as f:
+        json.dump(clean, f, indent=2)
+
+
+def sector_lods(inputs, outputs):
+    source = read_geojson(inputs["geojson"])
+    for i, lod in enumerate(build_levels(source)):
+        write_geojson(lod, outputs[f"lod{i}"])
+
+
+def property_urls(inputs, outputs):
+    apartments = pd.read_csv(inputs["apartments"])
+    _write_pickle(transforms.object_strings(apartments[["PropertyName", "Link"]]), outputs["urls"])
+
+
+def project_prices(inputs, outputs):
+    apartments = pd.read_csv(inputs["apartments"])
+    transforms.price_ranges(apartments).to_csv(outputs["prices"], index=False)
+
+
+def facility_similarity(inputs, outputs, model="tfidf"):
+    apartments = pd.read_csv(inputs["apartments"])
+    matrix = transforms.facility_similarity(transforms.facility_texts(apartments), model=model)
+    _write_pickle(matrix, outputs["similarity"])
+
+
+def price_similarity(inputs, outputs):
+    apartments = pd.read_csv(inputs["apartments"])
+    matrix = transforms.standardized_cosine(transforms.price_features(apartments))
+    _write_pickle(matrix, outputs["similarity"])
+
+
+def location_similarity(inputs, outputs):
+    distances = transforms.landmark_distances(pd.read_csv(inputs["apartments"]))
+    _write_pickle(distances, outputs["distances"])
+    _write_pickle(transforms.standardized_cosine(distances), outputs["similarity"])
+
+
+def location_distances(inputs, outputs):
+    _write_pickle(transforms.landmark_distances(pd.read_csv(inputs["apartments"])), outputs["distances"])
+
+
+def similarity_topk(inputs, outputs, k=DEFAULT_K):
+    save_topk(outputs["topk"], sparsify_topk(_read_pickle(inputs["similarity"]), k=k))
+
+
+def tiled_topk(inputs, outputs, features, k=DEFAULT_K, model="tfidf"):
+    """Top-K file straight from the feature vectors (no N×N matrix)."""
+    if features == "location":
+        vectors = cosine.location_vectors(_read_pickle(inputs["distances"]))
+    elif features == "facilities":
+        vectors = cosine.facility_vectors(pd.read_csv(inputs["apartments"]), model)
+    else:
+        vectors = cosine.price_vectors(pd.read_csv(inputs["apartments"]))
+    # Stages already run in parallel; tile each matrix in its own worker
+    save_topk(outputs["topk"], cosine.topk_cosine(vectors, k, jobs=1))
+
+
+def ann_blocks(apartments, distances, model="tfidf"):
+    """Facility/price/location vectors for ``core.ann``, rows aligned to ``distances``."""
+    return [
+        cosine.facility_vectors(apartments, model),
+        cosine.price_vectors(apartments),
+        cosine.location_vectors(distances),
+    ]
+
+
+def recommender_ann(inputs, outputs, model="tfidf", tables=DEFAULT_TABLES):
+    distances = _read_pickle(inputs["distances"])
+    blocks = ann_blocks(pd.read_csv(inputs["apartments"]), distances, model)
+    AnnIndex.build(distances.index, blocks, tables).save(outputs["index"])
+
+
+def spatial_tables(inputs, outputs):
+    projects = pd.read_csv(inputs["projects"])
+    subnames = (
+        projects.drop_duplicates("PropertyName")
+        .set_index("PropertyName")["PropertySubName"]
+        .to_dict()
+    )
+    property_coords, landmarks = build_spatial_tables(
+        _read_pickle(inputs["distances"]), pd.read_csv(inputs["new_latlong"]), subnames
+    )
+    property_coords.round(6).to_csv(outputs["property_coords"], index=False)
+    landmarks.round(6).to_csv(outputs["landmarks"], index=False)
+
+
+# --------------------------------------------------
+# GRAPH
+# --------------------------------------------------
+def resolve_facility_model(model):
+    """``model`` once it is known to be usable.
+
+    SBERT never falls back to TF-IDF: the two give different facility
+    similarities, so a silent switch would change the recommendations.
+    """
+    if model not in FACILITY_MODELS:
+        raise ValueError(f"Unknown facility model {model!r}")
+    if model == "sbert" and importlib.util.find_spec("sentence_transformers") is None:
+        raise ImportError("Facility similarity uses SBERT, which needs sentence_transformers; "
+                          "install it or pass --facility-model tfidf")
+    return model
+
+
+def _dense_similarity_stages(raw, out, facility_model, k, out_dir):
+    facilities, prices, locations = SIMILARITY_FILES
+    stages = [
+        Stage("facility_similarity", facility_similarity,
+              inputs={"apartments": raw(APARTMENTS_FILE)},
+              outputs={"similarity": out(facilities)},
+              params={"model": facility_model}, code=_TRANSFORMS),
+        Stage("price_similarity", price_similarity,
+              inputs={"apartments": raw(APARTMENTS_FILE)},
+              outputs={"similarity": out(prices)}, code=_TRANSFORMS),
+        Stage("location_similarity", location_similarity,
+              inputs={"apartments": raw(APARTMENTS_FILE)},
+              outputs={"distances": out("distance_location.pkl"), "similarity": out(locations)},
+              code=_TRANSFORMS),
+    ]
+    for name in SIMILARITY_FILES:
+        stem = os.path.splitext(name)[0]
+        stages.append(Stage(f"{stem}_topk", similarity_topk,
+                            inputs={"similarity": out(name)},
+                            outputs={"topk": topk_path(name, out_dir)},
+                            params={"k": k}, code=("core.topk",)))
+    return stages
+
+
+def _tiled_similarity_stages(raw, out, facility_model, k, out_dir):
+    code = _TRANSFORMS + ("core.pipeline.cosine", "core.topk")
+    apartments = {"apartments": raw(APARTMENTS_FILE)}
+    sources = {
+        "facilities": (apartments, {"model": facility_model}),
+        "price": (apartments, {}),
+        "location": ({"distances": out("distance_location.pkl")}, {}),
+    }
+    stages = [
+        Stage("location_distances", location_distances,
+              inputs=apartments, outputs={"distances": out("distance_location.pkl")}, code=_TRANSFORMS),
+    ]
+    for name, (features, (inputs, params)) in zip(SIMILARITY_FILES, sources.items()):
+        stem = os.path.splitext(name)[0]
+        stages.append(Stage(f"{stem}_topk", tiled_topk,
+                            inputs=inputs, outputs={"topk": topk_path(name, out_dir)},
+                            params={"features": features, "k": k, **params}, code=code))
+    return stages
+
+
+def build_stages(raw_dir=NOTEBOOK_DATA_DIR, out_dir=DATA_DIR, facility_model=DEFAULT_FACILITY_MODEL, k=DEFAULT_K,
+                 dense=True):
+    """The build graph; ``dense=False`` skips the N×N similarity pickles.
+
+    Without the dense matrices the top-K files are computed in row tiles
+    from the feature vectors (``core.pipeline.cosine``), which is what
+    keeps large project counts in memory.
+    """
+    facility_model = resolve_facility_model(facility_model)
+
+    def raw(name):
+        return os.path.join(raw_dir, name)
+
+    def out(name):
+        return os.path.join(out_dir, name)
+
+    stages = [
+        Stage("sector_coordinates", sector_coordinates,
+              inputs={"properties": raw(PROPERTIES_FILE), "latlong": raw(LATLONG_FILE)},
+              outputs={"new_latlong": out("new_latlong.csv")}, code=_TRANSFORMS),
+        Stage("sector_stats", sector_stats,
+              inputs={"new_latlong": out("new_latlong.csv")},
+              outputs={"sector_stats": out("sector_stats.csv"), "sector_totals": out(SECTOR_TOTALS_FILE)},
+              code=_TRANSFORMS),
+        Stage("model_features", model_features,
+              inputs={"properties": raw(PROPERTIES_FILE)},
+              outputs={"df": out("df.pkl")}, code=_TRANSFORMS),
+        Stage("sector_geojson", sector_geojson,
+              inputs={"boundaries": raw(BOUNDARIES_FILE)},
+              outputs={"geojson": out(SOURCE_GEOJSON)}, code=_TRANSFORMS),
+        Stage("sector_lods", sector_lods,
+              inputs={"geojson": out(SOURCE_GEOJSON)},
+              outputs={f"lod{i}": lod_path(SOURCE_GEOJSON, i, out_dir) for i in range(len(LEVELS))},
+              code=("core.geo",)),
+        Stage("property_urls", property_urls,
+              inputs={"apartments": raw(APARTMENTS_FILE)},
+              outputs={"urls": out("url.pkl")}, code=_TRANSFORMS),
+        Stage("project_prices", project_prices,
+              inputs={"apartments": raw(APARTMENTS_FILE)},
+              outputs={"prices": out(PROJECT_PRICES_FILE)}, code=_TRANSFORMS),
+        Stage("spatial_tables", spatial_tables,
+              inputs={"distances": out("distance_location.pkl"),
+                      "new_latlong": out("new_latlong.csv"),
+                      "projects": raw(PROJECTS_FILE)},
+              outputs={"property_coords": out(PROPERTY_COORDS_FILE), "landmarks": out(LANDMARKS_FILE)},
+              code=("core.spatial",)),
+        Stage("recommender_ann", recommender_ann,
+              inputs={"apartments": raw(APARTMENTS_FILE), "distances": out("distance_location.pkl")},
+              outputs={"index": out(ANN_FILE)},
+              params={"model": facility_model},
+              code=_TRANSFORMS + ("core.pipeline.cosine", "core.ann")),
+    ]
+    similarity_stages = _dense_similarity_stages if dense else _tiled_similarity_stages
+    stages += similarity_stages(raw, out, facility_model, k, out_dir)
+    return stages
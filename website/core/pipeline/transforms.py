@@ -0,0 +1,535 @@
+"""DataFrame transforms behind the website artifacts.
+
+Each function is the vectorized/importable form of a notebook step
+(notebook numbers in the section banners) and returns new objects rather
+than modifying its inputs.
+"""
+import ast
+import difflib
+import json
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import StandardScaler
+
+# Distance used for landmarks a project does not list (metres)
+MISSING_DISTANCE_M = 54000
+
+# Landmark columns whose normalized names are at least this similar
+# (difflib ratio, percent) are merged into one
+LANDMARK_MERGE_THRESHOLD = 85
+
+PRICE_CONFIGS = ["1 BHK", "2 BHK", "3 BHK", "4 BHK", "5 BHK", "6 BHK", "1 RK", "Land"]
+
+FURNISHING_LABELS = {0.0: "unfurnished", 1.0: "semifurnished", 2.0: "furnished"}
+
+# sector_stats.csv column -> new_latlong.csv column it averages
+STAT_COLUMNS = {
+    "avg_price": "price",
+    "avg_price_per_sqft": "price_per_sqft",
+    "avg_area": "built_up_area",
+}
+
+# Dropped before training (notebook 10 feature selection)
+UNUSED_MODEL_COLUMNS = ["pooja room", "study room", "others", "price_per_sqft", "society"]
+
+
+def object_strings(df):
+    """Copy with string columns as ``object`` so pickles load on pandas 2."""
+    out = df.copy()
+    for col in out.columns:
+        if pd.api.types.is_string_dtype(out[col]) and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(object)
+    if pd.api.types.is_string_dtype(out.index):
+        out.index = out.index.astype(object)
+    if pd.api.types.is_string_dtype(out.columns):
+        out.columns = out.columns.astype(object)
+    return out
+
+
+# --------------------------------------------------
+# LISTINGS
+# --------------------------------------------------
+def clean_listings(new, template):
+    """New property-table rows shaped like ``template`` (the existing table).
+
+    Columns are reordered and cast to ``template``'s dtypes, text keys are
+    normalized and rows that are incomplete, repeated or already present
+    in ``template`` are dropped.
+    """
+    missing = [c for c in template.columns if c not in new.columns]
+    if missing:
+        raise ValueError(f"New listings are missing columns: {', '.join(missing)}")
+
+    rows = new[list(template.columns)].copy()
+    for col in ("property_type", "society", "sector"):
+        rows[col] = rows[col].str.strip().str.lower()
+    for col, dtype in template.dtypes.items():
+        if pd.api.types.is_numeric_dtype(dtype):
+            rows[col] = pd.to_numeric(rows[col], errors="coerce")
+
+    integer = [c for c, dtype in template.dtypes.items() if pd.api.types.is_integer_dtype(dtype)]
+    rows = rows.dropna(subset=["sector", "price", "price_per_sqft", "built_up_area", *integer])
+    rows = rows.astype(template.dtypes.to_dict()).drop_duplicates()
+
+    seen = set(pd.util.hash_pandas_object(template, index=False))
+    fresh = ~pd.util.hash_pandas_object(rows, index=False).isin(seen)
+    return rows[fresh.to_numpy()].reset_index(drop=True)
+
+
+# --------------------------------------------------
+# SECTORS (14)
+# --------------------------------------------------
+def parse_coordinates(latlong):
+    """``latlong.csv`` with numeric latitude/longitude parsed from ``coordinates``."""
+    out = latlong.copy()
+    out["coordinates"] = out["coordinates"].astype(str)
+    parts = out["coordinates"].str.split(",", expand=True)
+    out["latitude"] = (
+        parts[0].str.replace("° N", "", regex=False).str.replace("° S", "", regex=False).astype(float)
+    )
+    out["longitude"] = (
+        parts[1].str.replace("° E", "", regex=False).str.replace("° W", "", regex=False).astype(float)
+    )
+    return out
+
+
+def attach_coordinates(properties, latlong):
+    """Listings joined with their sector's coordinates (``new_latlong.csv``)."""
+    return properties.merge(parse_coordinates(latlong), on="sector")
+
+
+def sector_stats(new_latlong):
+    return (
+        new_latlong
+        .groupby("sector", as_index=False)
+        .agg(
+            avg_price=("price", "mean"),
+            avg_price_per_sqft=("price_per_sqft", "mean"),
+            avg_area=("built_up_area", "mean"),
+            listings=("price", "count")
+        )
+    )
+
+
+def sector_totals(new_latlong):
+    """Per-sector sums and counts behind ``sector_stats`` (for incremental updates)."""
+    grouped = new_latlong.groupby("sector")
+    totals = {}
+    for col in STAT_COLUMNS.values():
+        totals[f"{col}_sum"] = grouped[col].sum()
+        totals[f"{col}_count"] = grouped[col].count()
+    return pd.DataFrame(totals).reset_index()
+
+
+def add_totals(totals, more):
+    """Element-wise sum of two ``sector_totals`` frames (sectors may differ)."""
+    return pd.concat([totals, more]).groupby("sector", as_index=False).sum()
+
+
+def stats_from_totals(totals):
+    """``sector_stats`` rows computed from running sums and counts."""
+    stats = pd.DataFrame({"sector": totals["sector"]})
+    for name, col in STAT_COLUMNS.items():
+        stats[name] = totals[f"{col}_sum"] / totals[f"{col}_count"]
+    stats["listings"] = totals["price_count"]
+    return stats.sort_values("sector", ignore_index=True)
+
+
+def clean_sector_geojson(geojson):
+    """One polygon per ``sector <n>`` boundary, keyed by a ``sector`` property."""
+    features = []
+    seen = set()
+    for feature in geojson["features"]:
+        name = feature.get("properties", {}).get("name", "")
+        if not isinstance(name, str):
+            continue
+        match = re.fullmatch(r"(sector\s*\d+[a-z]?)", name.lower().strip())
+        if not match:
+            continue
+        sector = match.group(1).replace("sector", "sector ").replace("  ", " ")
+        if sector in seen:
+            continue
+        seen.add(sector)
+        features.append({
+            "type": "Feature",
+            "properties": {"sector": sector},
+            "geometry": feature["geometry"],
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+# --------------------------------------------------
+# MODEL FEATURES (11)
+# --------------------------------------------------
+def floor_category(floor):
+    floor = pd.Series(floor, dtype=np.float64)
+    return pd.Series(np.select(
+        [floor.between(0, 2), floor.between(3, 10), floor.between(11, 51)],
+        ["Low Floor", "Mid Floor", "High Floor"],
+        default=None,
+    ), index=floor.index, dtype=object)
+
+
+def luxury_category(score):
+    score = pd.Series(score, dtype=np.float64)
+    return pd.Series(np.select(
+        [(score >= 0) & (score < 50), (score >= 50) & (score < 150), score.between(150, 175)],
+        ["Low", "Medium", "High"],
+        default=None,
+    ), index=score.index, dtype=object)
+
+
+def model_features(properties):
+    """Training inputs of ``price_prediction.pkl`` (``df.pkl``)."""
+    train = properties.drop(columns=UNUSED_MODEL_COLUMNS)
+    train["furnishing_type"] = train["furnishing_type"].astype(np.float64).map(FURNISHING_LABELS)
+    train["floor_category"] = floor_category(train["floorNum"])
+    train["luxury_category"] = luxury_category(train["luxury_score"])
+    train = train.drop(columns=["floorNum", "luxury_score", "price"])
+    return object_strings(train)
+
+
+# --------------------------------------------------
+# RECOMMENDER: PRICE DETAILS (12)
+# --------------------------------------------------
+def _area_value(text):
+    return float(text.replace(",", "").replace(" sq.ft.", "").strip())
+
+
+def _price_value(text):
+    return float(text.replace("₹", "").replace(" Cr", "").replace(" L", "").strip())
+
+
+def parse_price_details(text):
+    """Flat ``{"area low 2 BHK": ..., "price high 2 BHK": ...}`` for one project."""
+    try:
+        details = json.loads(text.replace("'", "\""))
+    except (AttributeError, ValueError):
+        return {}
+
+    out = {}
+    for bhk, detail in details.items():
+        out[f"building type_{bhk}"] = detail.get("building_type")
+
+        area = detail.get("area", "").split("-")
+        try:
+            low, high = (area[0], area[0]) if len(area) == 1 else area
+            out[f"area low {bhk}"] = _area_value(low)
+            out[f"area high {bhk}"] = _area_value(high)
+        except ValueError:
+            out[f"area low {bhk}"] = out[f"area high {bhk}"] = None
+
+        price = detail.get("price-range", "").split("-")
+        if len(price) == 2:
+            try:
+                low, high = _price_value(price[0]), _price_value(price[1])
+                out[f"price low {bhk}"] = low / 100 if "L" in price[0] else low
+                out[f"price high {bhk}"] = high / 100 if "L" in price[1] else high
+            except ValueError:
+                out[f"price low {bhk}"] = out[f"price high {bhk}"] = None
+    return out
+
+
+def price_table(apartments):
+    """Building type and area/price range per configuration, indexed by project."""
+    rows = []
+    for name, text in zip(apartments["PropertyName"], apartments["PriceDetails"]):
+        parsed = parse_price_details(text)
+        row = {"PropertyName": name}
+        for config in PRICE_CONFIGS:
+            for key in (f"building type_{config}", f"area low {config}", f"area high {config}",
+                        f"price low {config}", f"price high {config}"):
+                row[key] = parsed.get(key)
+        rows.append(row)
+
+    wide = pd.DataFrame(rows).set_index("PropertyName")
+    wide["building type_Land"] = wide["building type_Land"].replace({"": "Land"})
+    return wide
+
+
+def price_ranges(apartments):
+    """Listed configurations as ``PropertyName, config, price_low, price_high`` (crore)."""
+    wide = price_table(apartments)
+    parts = []
+    for config in PRICE_CONFIGS:
+        listed = wide[f"building type_{config}"].notna().to_numpy()
+        parts.append(pd.DataFrame({
+            "PropertyName": wide.index[listed],
+            "config": config,
+            "price_low": wide[f"price low {config}"].to_numpy(dtype=float)[listed],
+            "price_high": wide[f"price high {config}"].to_numpy(dtype=float)[listed],
+            "order": np.flatnonzero(listed),
+        }))
+    long = pd.concat(parts, ignore_index=True).sort_values("order", kind="stable")
+    return long.drop(columns="order").reset_index(drop=True)
+
+
+def _categorical_columns(wide):
+    return [c for c in wide.columns if not pd.api.types.is_numeric_dtype(wide[c])]
+
+
+def price_features(apartments):
+    """One-hot building types plus area/price ranges, indexed by project."""
+    wide = price_table(apartments)
+    return pd.get_dummies(wide, columns=_categorical_columns(wide), drop_first=True).fillna(0)
+
+
+def price_features_like(apartments, columns):
+    """``price_features`` for new projects, encoded onto existing ``columns``.
+
+    Categories outside ``columns`` (including the one ``drop_first``
+    dropped) become all-zero, as they are for the existing projects.
+    """
+    wide = price_table(apartments)
+    encoded = pd.get_dummies(wide, columns=_categorical_columns(wide))
+    return encoded.reindex(columns=columns).fillna(0).astype(np.float64)
+
+
+def standardized_cosine(features):
+    """Cosine similarity between rows after per-column standardization."""
+    return cosine_similarity(StandardScaler().fit_transform(features))
+
+
+def appended_cosine(features, new_features):
+    """Similarity rows of ``new_features`` against ``features`` then themselves.
+
+    The scaler is fitted on the existing ``features`` only, so the scores
+    between existing rows (and their scaled vectors) stay as they were.
+    """
+    scaler = StandardScaler().fit(features)
+    existing = scaler.transform(features)
+    new = scaler.transform(new_features[list(features.columns)])
+    return cosine_similarity(new, np.vstack([existing, new]))
+
+
+def extend_similarity(matrix, new_rows):
+    """``matrix`` (N×N) grown with ``new_rows`` (M×(N+M)) and their transpose."""
+    n = matrix.shape[0]
+    m = new_rows.shape[0]
+    if new_rows.shape[1] != n + m:
+        raise ValueError(f"Expected {n + m} columns in the new rows, got {new_rows.shape[1]}")
+    out = np.empty((n + m, n + m), dtype=np.result_type(matrix, new_rows))
+    out[:n, :n] = matrix
+    out[n:] = new_rows
+    out[:n, n:] = new_rows[:, :n].T
+    return out
+
+
+# --------------------------------------------------
+# RECOMMENDER: LOCATION ADVANTAGES (12)
+# --------------------------------------------------
+_NUMBER_RE = re.compile(r"[-+]?\d[\d,\.]*")
+
+
+def _parse_dict(text):
+    if isinstance(text, dict):
+        return text
+    if pd.isna(text):
+        return {}
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        # Crude ``'key': 'value'`` fallback for malformed rows
+        items = [it for it in str(text).strip().strip("{} ").split(", '") if ":" in it or "'" in it]
+        out = {}
+        for item in items:
+            if ":" in item:
+                k, v = item.split(":", 1)
+                out[k.strip().strip(" '\"")] = v.strip().strip(" '\"")
+        return out
+
+
+def distance_to_metres(text):
+    """``"2.5 KM"`` → 2500.0, ``"800 Meter"`` → 800.0, NaN when unparseable."""
+    if text is None:
+        return np.nan
+    text = str(text).strip().lower()
+    match = _NUMBER_RE.search(text)
+    if not match:
+        return np.nan
+    try:
+        value = float(match.group(0).replace(",", ""))
+    except ValueError:
+        return np.nan
+    if "km" in text or "kilomet" in text:
+        return value * 1000.0
+    if "m" in text:
+        return value if value > 0 else np.nan
+    return value
+
+
+def _location_name(name):
+    if not isinstance(name, str):
+        return name
+    name = re.sub(r"[\.\,]+$", "", name.strip())
+    return re.sub(r"\s+", " ", name).strip()
+
+
+def location_distances(apartments):
+    """Project × landmark distance table in metres (NaN when not listed)."""
+    # Filled straight into one float64 array: a frame built from 50k
+    # dicts peaks at several times the size of the table
+    columns = {}
+    rows, cols, values = [], [], []
+    for row, text in enumerate(apartments["LocationAdvantages"]):
+        for k, v in _parse_dict(text).items():
+            if k is not None:
+                rows.append(row)
+                cols.append(columns.setdefault(_location_name(k), len(columns)))
+                values.append(distance_to_metres(v))
+    table = np.full((len(apartments), len(columns)), np.nan)
+    table[rows, cols] = values
+    return pd.DataFrame(table, index=apartments["PropertyName"], columns=list(columns))
+
+
+def _landmark_key(name):
+    name = re.sub(r"[^a-z0-9 ]+", " ", str(name).lower().strip())
+    return re.sub(r"\s+", " ", name)
+
+
+def merge_similar_columns(df, threshold=LANDMARK_MERGE_THRESHOLD):
+    """Merge near-duplicate landmark columns, keeping the closest distance.
+
+    Same greedy grouping as the notebook (each column takes every later
+    unused column it matches), but difflib's ratio only runs on pairs
+    whose character-multiset bound (``quick_ratio``), computed for all
+    columns at once, can still reach ``threshold``.
+    """
+    cols = list(df.columns)
+    keys = [_landmark_key(c) for c in cols]
+    lengths = np.array([len(k) for k in keys])
+    alphabet = {ch: i for i, ch in enumerate(sorted(set("".join(keys))))}
+    counts = np.zeros((len(keys), len(alphabet)), dtype=np.int32)
+    for row, key in enumerate(keys):
+        for ch in key:
+            counts[row, alphabet[ch]] += 1
+
+    groups = []
+    used = np.zeros(len(cols), dtype=bool)
+    for i in range(len(cols)):
+        if used[i]:
+            continue
+        used[i] = True
+        group = [i]
+        total = lengths[i] + lengths
+        shared = np.minimum(counts[i], counts).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = np.where(total > 0, 2.0 * shared / total, 1.0) * 100
+        for j in np.flatnonzero(~used & (bound >= threshold)):
+            ratio = difflib.SequenceMatcher(None, keys[i], keys[j]).ratio() * 100
+            if ratio >= threshold:
+                group.append(j)
+                used[j] = True
+        groups.append([cols[k] for k in group])
+
+    mapping = {max(group, key=len): group for group in groups}
+    merged = df[[c for c in cols if c in mapping]].copy()
+    for canonical, group in mapping.items():
+        if len(group) > 1:
+            merged[canonical] = df[group].min(axis=1)
+    return merged, mapping
+
+
+def align_landmarks(wide, columns, threshold=LANDMARK_MERGE_THRESHOLD):
+    """``wide`` landmark distances mapped onto existing merged ``columns``.
+
+    Each new landmark joins the existing column it matches best (same
+    difflib rule as ``merge_similar_columns``); several landmarks on one
+    column keep the closest distance. Returns ``(aligned, unmatched)``,
+    the second holding landmarks no existing column matches.
+    """
+    keys = {c: _landmark_key(c) for c in columns}
+    target = {}
+    for name in wide.columns:
+        if name in keys:
+            target[name] = name
+            continue
+        key = _landmark_key(name)
+        best, best_ratio = None, threshold
+        for col, col_key in keys.items():
+            matcher = difflib.SequenceMatcher(None, col_key, key)
+            if matcher.real_quick_ratio() * 100 < best_ratio or matcher.quick_ratio() * 100 < best_ratio:
+                continue
+            ratio = matcher.ratio() * 100
+            if ratio >= best_ratio and (best is None or ratio > best_ratio):
+                best, best_ratio = col, ratio
+        if best is not None:
+            target[name] = best
+
+    matched = [c for c in wide.columns if c in target]
+    aligned = (
+        wide[matched].T.groupby(pd.Index([target[c] for c in matched])).min().T
+        if matched else pd.DataFrame(index=wide.index)
+    )
+    aligned = aligned.reindex(columns=list(columns))
+    unmatched = wide[[c for c in wide.columns if c not in target]]
+    return aligned, unmatched
+
+
+def landmark_distances(apartments):
+    """``distance_location.pkl``: merged landmarks, missing = ``MISSING_DISTANCE_M``."""
+    merged, _ = merge_similar_columns(location_distances(apartments).fillna(MISSING_DISTANCE_M))
+    return object_strings(merged.fillna(MISSING_DISTANCE_M))
+
+
+# --------------------------------------------------
+# RECOMMENDER: TOP FACILITIES (12)
+# --------------------------------------------------
+def parse_facilities(value):
+    if isinstance(value, list):
+        return [str(x).strip() for x in value]
+    if pd.isna(value):
+        return []
+    text = str(value).strip()
+    if text.startswith("[") and text.endswith("]"):
+        try:
+            return [str(x).strip() for x in json.loads(text.replace("'", '"'))]
+        except ValueError:
+            return [x.strip().strip("'\"") for x in text[1:-1].split(",") if x.strip()]
+    for sep in ("|", ","):
+        if sep in text:
+            return [x.strip() for x in text.split(sep)]
+    return [text]
+
+
+def facility_texts(apartments):
+    """One document per project; multi-word facilities become single tokens."""
+    return apartments["TopFacilities"].map(
+        lambda value: " ".join(f.replace(" ", "_") for f in parse_facilities(value))
+    )
+
+
+def facility_vectors(texts, model="tfidf", fit_texts=None, sbert_model="all-MiniLM-L6-v2"):
+    """Row vectors for facility documents (TF-IDF or SBERT embeddings).
+
+    The TF-IDF vocabulary and weights come from ``fit_texts`` when given
+    (default: ``texts`` itself).
+    """
+    texts = list(pd.Series(texts, dtype=object).fillna(""))
+    if model == "sbert":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(sbert_model).encode(texts, convert_to_numpy=True)
+    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))
+    if fit_texts is None:
+        return vectorizer.fit_transform(texts)
+    vectorizer.fit(list(pd.Series(fit_texts, dtype=object).fillna("")))
+    return vectorizer.transform(texts)
+
+
+def facility_similarity(texts, model="tfidf"):
+    """Cosine similarity of facility documents."""
+    vectors = facility_vectors(texts, model)
+    return cosine_similarity(vectors, vectors)
+
+
+def appended_facility_similarity(texts, new_texts, model="tfidf"):
+    """Rows for ``new_texts`` against ``texts`` then themselves (vocabulary from ``texts``)."""
+    existing = facility_vectors(texts, model)
+    new = facility_vectors(new_texts, model, fit_texts=texts)
+    stack = sparse.vstack if sparse.issparse(new) else np.vstack
+    return cosine_similarity(new, stack([existing, new]))
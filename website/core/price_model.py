@@ -0,0 +1,468 @@
+"""Compact, NumPy-only form of ``price_prediction.pkl``.
+
+The fitted pipeline (``ColumnTransformer`` → ``XGBRegressor``) is exported
+to ``price_model.npz``: the preprocessing becomes one recipe per model
+input column (scaling constants or a category → value lookup table) and
+the boosted trees become flat node arrays, evaluated one tree level at a
+time for all trees at once. Loading it needs NumPy only, not
+scikit-learn or xgboost, and single rows skip pandas entirely.
+
+Supported steps: ``StandardScaler``, ``OrdinalEncoder``, ``OneHotEncoder``,
+``TargetEncoder`` (scikit-learn's or ``category_encoders``') and
+passthrough columns, followed by an ``XGBRegressor`` (gbtree booster,
+identity-link objective) or a linear model with ``coef_``. Anything else
+raises ``ValueError`` and the app keeps using the pickle.
+
+The export is checked against ``pipeline.predict`` on ``df.pkl`` (plus
+rows with shuffled categories) and is only written when every log-price
+prediction agrees within ``--tolerance``.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.price_model
+    python -m core.price_model --model /path/to/price_prediction.pkl --output /tmp/price_model.npz
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+
+from core.config import DATA_DIR
+
+MODEL_FILE = "price_prediction.pkl"
+COMPACT_FILE = "price_model.npz"
+
+# Largest |difference| in log price accepted by the export check
+DEFAULT_TOLERANCE = 1e-4
+
+# Rows per tree-evaluation block; rows × trees node indices stay in cache
+_BLOCK_ROWS = 256
+
+# Probe value no encoder has seen, to read off its unknown-category output
+_UNSEEN = "\x00unseen"
+
+# Objectives whose prediction is the raw margin
+_IDENTITY_OBJECTIVES = {
+    "reg:squarederror", "reg:linear", "reg:absoluteerror", "reg:pseudohubererror",
+}
+
+
+# --------------------------------------------------
+# EXPORT: PREPROCESSING
+# --------------------------------------------------
+def _numeric(column, shift=0.0, scale=1.0):
+    return {"column": column, "shift": float(shift), "scale": float(scale)}
+
+
+def _lookup(column, categories, values, unknown, handle_unknown="value"):
+    # handle_unknown is "error" when the encoder rejects unseen categories
+    return {
+        "column": column,
+        "categories": [str(c).strip() for c in categories],
+        "values": [float(v) for v in values],
+        "unknown": float(unknown),
+        "handle_unknown": handle_unknown,
+    }
+
+
+def _is_nan(value):
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _encoder_categories(encoder, i, column):
+    if hasattr(encoder, "categories_"):
+        return [c for c in encoder.categories_[i] if not _is_nan(c)]
+    # category_encoders keep their categories in an inner OrdinalEncoder
+    for mapping in getattr(getattr(encoder, "ordinal_encoder", None), "category_mapping", []):
+        if mapping["col"] == column:
+            return [c for c in mapping["mapping"].index if not _is_nan(c)]
+    raise ValueError(f"Cannot read the categories of {type(encoder).__name__} for {column!r}")
+
+
+def _probed(encoder, columns):
+    """Lookups of a one-column-per-feature encoder, read off its own ``transform``."""
+    import pandas as pd
+
+    categories = [_encoder_categories(encoder, i, c) for i, c in enumerate(columns)]
+    strict = getattr(encoder, "handle_unknown", None) == "error"
+    recipes = []
+    for i, column in enumerate(columns):
+        probe = categories[i] + ([] if strict else [_UNSEEN])
+        frame = pd.DataFrame({
+            c: probe if j == i else [categories[j][0]] * len(probe)
+            for j, c in enumerate(columns)
+        })
+        out = np.asarray(encoder.transform(frame), dtype=np.float64)
+        if out.shape[1] != len(columns):
+            raise ValueError(f"{type(encoder).__name__} does not output one column per feature")
+        if strict:
+            recipes.append(_lookup(column, categories[i], out[:, i], np.nan, "error"))
+        else:
+            recipes.append(_lookup(column, categories[i], out[:-1, i], out[-1, i]))
+    return recipes
+
+
+def _step_recipes(name, transformer, columns):
+    if isinstance(transformer, str):
+        if transformer == "drop":
+            return []
+        if transformer == "passthrough":
+            return [_numeric(c) for c in columns]
+        raise ValueError(f"Unsupported transformer {name!r}: {transformer!r}")
+
+    kind = type(transformer).__name__
+    if getattr(transformer, "_infrequent_enabled", False):
+        raise ValueError(f"{kind} {name!r} groups infrequent categories, which is not supported")
+
+    if kind == "StandardScaler":
+        n = len(columns)
+        mean = transformer.mean_ if transformer.mean_ is not None else np.zeros(n)
+        scale = transformer.scale_ if transformer.scale_ is not None else np.ones(n)
+        return [_numeric(c, m, s) for c, m, s in zip(columns, mean, scale)]
+
+    if kind == "OrdinalEncoder":
+        policy = "error" if transformer.handle_unknown == "error" else "value"
+        unknown = (transformer.unknown_value
+                   if transformer.handle_unknown == "use_encoded_value" else np.nan)
+        recipes = []
+        for column, cats in zip(columns, transformer.categories_):
+            codes = [transformer.encoded_missing_value if _is_nan(c) else i for i, c in enumerate(cats)]
+            recipes.append(_lookup(column, cats, codes, unknown, policy))
+        return recipes
+
+    if kind == "OneHotEncoder":
+        drop = transformer.drop_idx_
+        strict = transformer.handle_unknown == "error"
+        recipes = []
+        for i, (column, cats) in enumerate(zip(columns, transformer.categories_)):
+            for k, cat in enumerate(cats):
+                if drop is not None and drop[i] is not None and k == drop[i]:
+                    continue
+                if strict:
+                    # Every category of the column, so unseen ones can be told apart
+                    recipes.append(_lookup(column, cats, np.arange(len(cats)) == k, 0.0, "error"))
+                else:
+                    recipes.append(_lookup(column, [cat], [1.0], 0.0))
+        return recipes
+
+    if kind == "TargetEncoder":
+        return _probed(transformer, columns)
+
+    raise ValueError(f"Unsupported transformer {name!r}: {kind}")
+
+
+def _column_names(preprocessor, spec):
+    names = list(preprocessor.feature_names_in_)
+    spec = np.atleast_1d(spec)
+    if spec.dtype == bool:
+        spec = np.flatnonzero(spec)
+    return [names[c] if isinstance(c, (int, np.integer)) else str(c) for c in spec]
+
+
+def preprocessing_recipes(preprocessor):
+    """One recipe per output column of a fitted ``ColumnTransformer``, in order."""
+    if type(preprocessor).__name__ != "ColumnTransformer":
+        raise ValueError(f"Expected a ColumnTransformer, got {type(preprocessor).__name__}")
+    recipes = []
+    for name, transformer, spec in preprocessor.transformers_:
+        columns = _column_names(preprocessor, spec)
+        if columns:
+            recipes.extend(_step_recipes(name, transformer, columns))
+    return recipes
+
+
+# --------------------------------------------------
+# EXPORT: REGRESSOR
+# --------------------------------------------------
+def _tree_depth(parents):
+    depth = np.zeros(len(parents), dtype=np.int32)
+    # xgboost numbers children after their parent
+    for node in range(1, len(parents)):
+        depth[node] = depth[parents[node]] + 1
+    return int(depth.max())
+
+
+def xgboost_arrays(model):
+    """Flat node arrays and ``base_score`` of a fitted ``XGBRegressor``."""
+    learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    params = learner["learner_model_param"]
+    booster = learner["gradient_booster"]
+    if objective not in _IDENTITY_OBJECTIVES or int(params.get("num_target", 1)) != 1:
+        raise ValueError(f"Unsupported xgboost objective: {objective}")
+    if booster["name"] != "gbtree":
+        raise ValueError(f"Unsupported xgboost booster: {booster['name']}")
+
+    trees = booster["model"]["trees"]
+    try:
+        # sklearn's predict stops at the early-stopping iteration
+        per_round = int(booster["model"]["gbtree_model_param"].get("num_parallel_tree", 1))
+        trees = trees[:(model.best_iteration + 1) * per_round]
+    except AttributeError:
+        pass
+
+    parts = {k: [] for k in ("feature", "threshold", "left", "right", "default_left", "value")}
+    roots, depth, offset = [], 0, 0
+    for tree in trees:
+        if any(tree.get("split_type", [])):
+            raise ValueError("Categorical xgboost splits are not supported")
+        left = np.asarray(tree["left_children"], dtype=np.int32)
+        right = np.asarray(tree["right_children"], dtype=np.int32)
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        leaf = left == -1
+        ids = np.arange(len(left), dtype=np.int32)
+        # Leaves point at themselves, so every row can take the same number of steps
+        parts["left"].append(np.where(leaf, ids, left) + offset)
+        parts["right"].append(np.where(leaf, ids, right) + offset)
+        parts["feature"].append(np.where(leaf, 0, tree["split_indices"]).astype(np.int32))
+        parts["threshold"].append(conditions)
+        parts["default_left"].append(np.asarray(tree["default_left"], dtype=bool))
+        parts["value"].append(np.where(leaf, conditions, 0).astype(np.float32))
+        roots.append(offset)
+        depth = max(depth, _tree_depth(tree["parents"]))
+        offset += len(left)
+
+    arrays = {k: np.concatenate(v) for k, v in parts.items()}
+    arrays["roots"] = np.asarray(roots, dtype=np.int32)
+    return arrays, float(params["base_score"].strip("[]")), depth
+
+
+def export_pipeline(pipeline, source_hash=None):
+    """``CompactModel`` equivalent to a fitted price pipeline."""
+    steps = getattr(pipeline, "steps", None)
+    if not steps or len(steps) != 2:
+        raise ValueError("Expected a Pipeline of a ColumnTransformer and a regressor")
+    preprocessor, model = steps[0][1], steps[1][1]
+    recipes = preprocessing_recipes(preprocessor)
+
+    meta = {
+        "columns": [str(c) for c in preprocessor.feature_names_in_],
+        "recipes": recipes,
+        # Sparse ColumnTransformer output reaches xgboost with zeros as missing
+        "zero_is_missing": bool(getattr(preprocessor, "sparse_output_", False)),
+        "source_hash": source_hash,
+    }
+    if hasattr(model, "get_booster"):
+        arrays, base_score, depth = xgboost_arrays(model)
+        missing = model.missing
+        meta.update(kind="trees", base_score=base_score, depth=depth,
+                    missing=None if missing is None or _is_nan(float(missing)) else float(missing))
+    elif hasattr(model, "coef_"):
+        coef = np.ravel(model.coef_).astype(np.float64)
+        if coef.size != len(recipes):
+            raise ValueError(f"{type(model).__name__} has {coef.size} coefficients for {len(recipes)} inputs")
+        arrays = {"coef": coef}
+        meta.update(kind="linear", intercept=float(np.ravel(model.intercept_)[0]))
+    else:
+        raise ValueError(f"Unsupported regressor: {type(model).__name__}")
+    return CompactModel(meta, arrays)
+
+
+# --------------------------------------------------
+# EVALUATION
+# --------------------------------------------------
+class CompactModel:
+    """Exported price pipeline; ``predict`` returns what ``pipeline.predict`` does (log price)."""
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.arrays = arrays
+        self.columns = meta["columns"]
+        self.source_hash = meta.get("source_hash")
+        self._recipes = []
+        for recipe in meta["recipes"]:
+            if "scale" in recipe:
+                self._recipes.append((recipe["column"], recipe["shift"], recipe["scale"], False))
+            else:
+                codes = {c: i for i, c in enumerate(recipe["categories"])}
+                # Unknown categories look up the last entry
+                values = np.append(np.asarray(recipe["values"]), recipe["unknown"])
+                strict = recipe.get("handle_unknown") == "error"
+                self._recipes.append((recipe["column"], codes, values, strict))
+        for name, array in arrays.items():
+            setattr(self, "_" + name, array)
+        if "roots" in arrays:
+            self._roots = self._roots.astype(np.intp)
+            self._feature = self._feature.astype(np.intp)
+            # Left and right child of node i at 2i and 2i + 1
+            self._children = np.stack([self._left, self._right], axis=1).ravel().astype(np.intp)
+
+    def __len__(self):
+        return len(self._recipes)
+
+    # ---- input ----
+    def matrix(self, values, n):
+        """Model input matrix from a column → sequence map of ``n`` rows."""
+        missing = [c for c in self.columns if c not in values]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        out = np.empty((n, len(self._recipes)), dtype=np.float64)
+        categories = {}
+        for j, (column, first, second, strict) in enumerate(self._recipes):
+            if isinstance(first, dict):
+                if column not in categories:
+                    # Look up each distinct value once
+                    categories[column] = np.unique(np.asarray(values[column], dtype=str), return_inverse=True)
+                distinct, inverse = categories[column]
+                codes = np.array([first.get(v.strip(), -1) for v in distinct], dtype=np.intp)
+                if strict and (codes < 0).any():
+                    unknown = sorted(distinct[codes < 0].tolist())
+                    raise ValueError(f"Found unknown categories {unknown} in column {column!r} during transform")
+                out[:, j] = second[codes[inverse]]
+            else:
+                out[:, j] = (np.asarray(values[column], dtype=np.float64) - first) / second
+        return out
+
+    # ---- models ----
+    def _predict_matrix(self, X):
+        if self.meta["kind"] == "linear":
+            return X @ self._coef + self.meta["intercept"]
+
+        if self.meta["zero_is_missing"]:
+            X[X == 0] = np.nan
+        if self.meta.get("missing") is not None:
+            X[X == self.meta["missing"]] = np.nan
+        # xgboost compares float32 features with float32 thresholds
+        X = X.astype(np.float32)
+        if np.isnan(X).any():
+            return self._trees_with_missing(X) + self.meta["base_score"]
+
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), _BLOCK_ROWS):
+            block = X[start:start + _BLOCK_ROWS]
+            flat = block.ravel()
+            row_offsets = (np.arange(len(block)) * block.shape[1])[:, None]
+            node = np.repeat(self._roots[None, :], len(block), axis=0)
+            for _ in range(self.meta["depth"]):
+                x = flat.take(row_offsets + self._feature.take(node))
+                node = self._children.take(2 * node + (x >= self._threshold.take(node)))
+            out[start:start + len(block)] = self._value.take(node).sum(axis=1, dtype=np.float64)
+        return out + self.meta["base_score"]
+
+    def _trees_with_missing(self, X):
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), _BLOCK_ROWS):
+            block = X[start:start + _BLOCK_ROWS]
+            rows = np.arange(len(block))[:, None]
+            node = np.repeat(self._roots[None, :], len(block), axis=0)
+            for _ in range(self.meta["depth"]):
+                x = block[rows, self._feature[node]]
+                go_right = np.where(np.isnan(x), ~self._default_left[node], x >= self._threshold[node])
+                node = self._children[2 * node + go_right]
+            out[start:start + len(block)] = self._value[node].sum(axis=1, dtype=np.float64)
+        return out
+
+    def predict(self, X):
+        """Log-price predictions for a frame (or column → sequence map)."""
+        n = len(X[self.columns[0]]) if self.columns[0] in X else 0
+        return self._predict_matrix(self.matrix(X, n))
+
+    def predict_rows(self, rows, columns):
+        """Log-price predictions for value tuples laid out as ``columns``."""
+        positions = {c: columns.index(c) for c in self.columns if c in columns}
+        values = {c: [row[p] for row in rows] for c, p in positions.items()}
+        return self._predict_matrix(self.matrix(values, len(rows)))
+
+    # ---- storage ----
+    def save(self, path):
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, meta=np.array(json.dumps(self.meta)), **self.arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {k: data[k] for k in data.files if k != "meta"}
+            meta = json.loads(str(data["meta"]))
+        return cls(meta, arrays)
+
+
+# --------------------------------------------------
+# LOADING
+# --------------------------------------------------
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_model(path):
+    """A ``CompactModel`` for ``.npz`` exports, else the pickled pipeline."""
+    if path.endswith(".npz"):
+        return CompactModel.load(path)
+    import joblib
+
+    return joblib.load(path)
+
+
+def export_source_hash(path):
+    """``source_hash`` of a saved export, reading only its metadata."""
+    with np.load(path, allow_pickle=False) as data:
+        return json.loads(str(data["meta"])).get("source_hash")
+
+
+def default_model_path(data_dir=DATA_DIR):
+    """The compact export when it was exported from the current pickle, else the pickle.
+
+    Matched on the pickle's sha256, so an export is never preferred over
+    a pickle replaced after it, whatever the file times say.
+    """
+    compact = os.path.join(data_dir, COMPACT_FILE)
+    pickled = os.path.join(data_dir, MODEL_FILE)
+    if not os.path.exists(compact):
+        return pickled
+    if not os.path.exists(pickled) or export_source_hash(compact) == file_sha256(pickled):
+        return compact
+    return pickled
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def check_frame(df, seed=0):
+    """``df`` plus a copy with each categorical column shuffled (unseen combinations)."""
+    import pandas as pd
+
+    from core.pricing import CATEGORICAL_COLUMNS, validate_features
+
+    features = validate_features(df)
+    shuffled = features.copy()
+    rng = np.random.default_rng(seed)
+    for col in CATEGORICAL_COLUMNS:
+        shuffled[col] = rng.permutation(shuffled[col].to_numpy())
+    return pd.concat([features, shuffled], ignore_index=True)
+
+
+def main(argv=None):
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Export price_prediction.pkl to a compact NumPy model")
+    parser.add_argument("--model", default=os.path.join(DATA_DIR, MODEL_FILE))
+    parser.add_argument("--output", default=os.path.join(DATA_DIR, COMPACT_FILE))
+    parser.add_argument("--data", default=os.path.join(DATA_DIR, "df.pkl"),
+                        help="feature frame to compare predictions on")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    pipeline = joblib.load(args.model)
+    compact = export_pipeline(pipeline, file_sha256(args.model))
+
+    features = check_frame(joblib.load(args.data))
+    expected = pipeline.predict(features)
+    diff = float(np.max(np.abs(compact.predict(features) - expected)))
+    if not diff <= args.tolerance:
+        raise SystemExit(f"Export differs from the pipeline by {diff:.3g} (> {args.tolerance:g}); not written")
+
+    compact.save(args.output)
+    print(f"{len(compact)} inputs, {os.path.getsize(args.output) / 1e3:.1f} KB "
+          f"(pickle {os.path.getsize(args.model) / 1e3:.1f} KB), "
+          f"max |Δ log price| {diff:.2e} on {len(features)} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Precomputed price surface for instant what-if exploration.
+
+The model is evaluated offline over every sector × property type × BHK ×
+built-up-area grid point; the page then interpolates along the area axis
+without calling the model. Features outside the grid are held at the
+most common value in ``df.pkl`` (bathrooms follow the BHK count).
+
+Usage (from the ``website`` directory)::
+
+    python -m core.price_surface --max-bhk 6 --areas 48
+"""
+import argparse
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from core.config import DATA_DIR
+from core.price_model import default_model_path, load_model
+from core.pricing import FEATURE_COLUMNS, file_sha256, predict_frame
+
+SURFACE_FILE = "price_surface.npz"
+
+DEFAULT_MAX_BHK = 6
+DEFAULT_AREA_RANGE = (300.0, 6000.0)
+DEFAULT_AREA_POINTS = 48
+
+
+# --------------------------------------------------
+# SURFACE
+# --------------------------------------------------
+class PriceSurface:
+    """Prices (Cr) on a ``(sector, property_type, bhk, area)`` grid."""
+
+    def __init__(self, prices, sectors, property_types, bedrooms, areas,
+                 baseline=None, model_hash=None):
+        self.prices = np.asarray(prices, dtype=np.float32)
+        self.sectors = list(sectors)
+        self.property_types = list(property_types)
+        self.bedrooms = np.asarray(bedrooms, dtype=np.int16)
+        self.areas = np.asarray(areas, dtype=np.float32)
+        self.baseline = baseline or {}
+        self.model_hash = model_hash
+        self._sector_pos = {s: i for i, s in enumerate(self.sectors)}
+        self._type_pos = {t: i for i, t in enumerate(self.property_types)}
+
+    def curve(self, sector, property_type, bedrooms, areas):
+        """Interpolated prices for ``areas`` (clamped to the grid range)."""
+        bhk_pos = int(np.searchsorted(self.bedrooms, bedrooms))
+        if bhk_pos >= len(self.bedrooms) or self.bedrooms[bhk_pos] != bedrooms:
+            raise KeyError(f"{bedrooms} BHK is not on the price surface")
+        row = self.prices[
+            self._sector_pos[sector], self._type_pos[property_type], bhk_pos
+        ]
+        return np.interp(np.asarray(areas, dtype=np.float64), self.areas, row)
+
+    def curves(self, sector, property_type, areas, bedrooms=None):
+        """DataFrame of prices indexed by area, one column per BHK."""
+        bedrooms = self.bedrooms if bedrooms is None else bedrooms
+        return pd.DataFrame(
+            {f"{b} BHK": self.curve(sector, property_type, b, areas) for b in bedrooms},
+            index=pd.Index(areas, name="built_up_area"),
+        )
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            prices=self.prices,
+            sectors=np.array(self.sectors),
+            property_types=np.array(self.property_types),
+            bedrooms=self.bedrooms,
+            areas=self.areas,
+            meta=np.array(json.dumps({
+                "baseline": self.baseline,
+                "model_hash": self.model_hash,
+            })),
+        )
+
+    @classmethod
+    def load(cls, path=None):
+        with np.load(path or os.path.join(DATA_DIR, SURFACE_FILE)) as f:
+            meta = json.loads(str(f["meta"]))
+            return cls(
+                f["prices"], f["sectors"].tolist(), f["property_types"].tolist(),
+                f["bedrooms"], f["areas"],
+                baseline=meta["baseline"], model_hash=meta["model_hash"],
+            )
+
+
+# --------------------------------------------------
+# OFFLINE BUILD
+# --------------------------------------------------
+def baseline_features(df):
+    """Most common value of every feature, used for the non-grid columns."""
+    return {col: df[col].mode().iloc[0] for col in FEATURE_COLUMNS}
+
+
+def build_surface(pipeline, df, max_bhk=DEFAULT_MAX_BHK,
+                  area_range=DEFAULT_AREA_RANGE, area_points=DEFAULT_AREA_POINTS):
+    sectors = sorted(df["sector"].unique().tolist())
+    property_types = sorted(df["property_type"].unique().tolist())
+    bedrooms = np.arange(1, max_bhk + 1)
+    areas = np.linspace(*area_range, area_points)
+
+    baseline = {
+        k: (v.item() if hasattr(v, "item") else v)
+        for k, v in baseline_features(df).items()
+    }
+    grid = pd.MultiIndex.from_product(
+        [sectors, property_types, bedrooms, areas],
+        names=["sector", "property_type", "bedRoom", "built_up_area"],
+    ).to_frame(index=False)
+    for col, value in baseline.items():
+        if col not in grid.columns:
+            grid[col] = value
+    grid["bathroom"] = grid["bedRoom"].astype(np.float64)
+
+    priced, _ = predict_frame(pipeline, grid[FEATURE_COLUMNS])
+    prices = priced["predicted_price"].to_numpy(dtype=np.float32).reshape(
+        len(sectors), len(property_types), len(bedrooms), len(areas)
+    )
+    return PriceSurface(prices, sectors, property_types, bedrooms, areas, baseline)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the price surface artifact")
+    parser.add_argument("--model", default=default_model_path(),
+                        help="price_prediction.pkl or its compact export (.npz)")
+    parser.add_argument("--max-bhk", type=int, default=DEFAULT_MAX_BHK)
+    parser.add_argument("--min-area", type=float, default=DEFAULT_AREA_RANGE[0])
+    parser.add_argument("--max-area", type=float, default=DEFAULT_AREA_RANGE[1])
+    parser.add_argument("--areas", type=int, default=DEFAULT_AREA_POINTS)
+    parser.add_argument("--out", default=os.path.join(DATA_DIR, SURFACE_FILE))
+    args = parser.parse_args(argv)
+
+    pipeline = load_model(args.model)
+    df = joblib.load(os.path.join(DATA_DIR, "df.pkl"))
+    surface = build_surface(
+        pipeline, df, max_bhk=args.max_bhk,
+        area_range=(args.min_area, args.max_area), area_points=args.areas,
+    )
+    surface.model_hash = getattr(pipeline, "source_hash", None) or file_sha256(args.model)
+    surface.save(args.out)
+    print(f"Price surface {surface.prices.shape} "
+          f"({surface.prices.size} points, {os.path.getsize(args.out) / 1e3:.0f} KB) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
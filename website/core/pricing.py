@@ -0,0 +1,278 @@
+"""Price prediction helpers shared by the Price Predictor page and the CLI.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.pricing listings.csv priced.csv --chunk-size 50000
+"""
+import argparse
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.config import DATA_DIR
+from core.price_model import COMPACT_FILE, MODEL_FILE, default_model_path, file_sha256, load_model
+
+# Input schema of price_prediction.pkl (same order as the page's input_df)
+FEATURE_COLUMNS = [
+    'property_type', 'sector', 'bedRoom', 'bathroom', 'balcony',
+    'agePossession', 'built_up_area', 'servant room', 'store room',
+    'furnishing_type', 'luxury_category', 'floor_category'
+]
+
+NUMERIC_COLUMNS = ['bedRoom', 'bathroom', 'built_up_area', 'servant room', 'store room']
+
+CATEGORICAL_COLUMNS = [c for c in FEATURE_COLUMNS if c not in NUMERIC_COLUMNS]
+
+_NUMERIC_POSITIONS = [FEATURE_COLUMNS.index(c) for c in NUMERIC_COLUMNS]
+
+_CATEGORICAL_POSITIONS = [FEATURE_COLUMNS.index(c) for c in CATEGORICAL_COLUMNS]
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Half-width of the price band shown around the estimate (Cr)
+PRICE_BAND = 0.22
+
+
+# --------------------------------------------------
+# VALIDATION
+# --------------------------------------------------
+def validate_features(df):
+    """Model-ready copy of ``df`` with exactly ``FEATURE_COLUMNS``.
+
+    Raises ``ValueError`` naming missing columns, the rows whose
+    numeric fields are empty or not numbers, or the rows with an empty
+    categorical field.
+    """
+    missing = [c for c in FEATURE_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    out = df[FEATURE_COLUMNS].copy()
+    for col in NUMERIC_COLUMNS:
+        out[col] = pd.to_numeric(out[col], errors="coerce").astype(np.float64)
+    # Checked before the text conversion, which would turn NaN into 'nan'
+    empty = out[CATEGORICAL_COLUMNS].isna()
+    for col in CATEGORICAL_COLUMNS:
+        # Balcony is stored as text ('0'...'3+'); CSV readers turn it into ints
+        out[col] = out[col].astype(str).str.strip()
+    empty |= out[CATEGORICAL_COLUMNS] == ""
+
+    bad = out[NUMERIC_COLUMNS].isna().any(axis=1)
+    if bad.any():
+        rows = ", ".join(str(i) for i in out.index[bad][:10])
+        raise ValueError(
+            f"{int(bad.sum())} row(s) with empty or non-numeric values "
+            f"in {', '.join(NUMERIC_COLUMNS)} (first rows: {rows})"
+        )
+    bad = empty.any(axis=1)
+    if bad.any():
+        rows = ", ".join(str(i) for i in out.index[bad][:10])
+        columns = [c for c in CATEGORICAL_COLUMNS if empty[c].any()]
+        raise ValueError(
+            f"{int(bad.sum())} row(s) with empty values "
+            f"in {', '.join(columns)} (first rows: {rows})"
+        )
+    return out
+
+
+# --------------------------------------------------
+# PREDICTION
+# --------------------------------------------------
+def predict_prices(pipeline, df):
+    """Predicted prices (Cr) for a validated feature frame."""
+    return np.expm1(pipeline.predict(df))
+
+
+def predict_key(pipeline, key):
+    """Predicted price (Cr) for one ``feature_key`` tuple.
+
+    A ``CompactModel`` takes the tuple directly; a pickled pipeline gets
+    a one-row validated frame.
+    """
+    if not hasattr(pipeline, "predict_rows"):
+        features = validate_features(pd.DataFrame([key], columns=FEATURE_COLUMNS))
+        return float(predict_prices(pipeline, features)[0])
+    if any(math.isnan(key[i]) for i in _NUMERIC_POSITIONS):
+        raise ValueError(f"1 row(s) with empty or non-numeric values in {', '.join(NUMERIC_COLUMNS)}")
+    empty = [FEATURE_COLUMNS[i] for i in _CATEGORICAL_POSITIONS if key[i] == ""]
+    if empty:
+        raise ValueError(f"1 row(s) with empty values in {', '.join(empty)}")
+    return float(np.expm1(pipeline.predict_rows([key], FEATURE_COLUMNS)[0]))
+
+
+def iter_predictions(pipeline, chunks):
+    """Yield each input chunk with a ``predicted_price`` column appended."""
+    for chunk in chunks:
+        features = validate_features(chunk)
+        out = chunk.copy()
+        out["predicted_price"] = predict_prices(pipeline, features)
+        yield out
+
+
+def predict_frame(pipeline, df, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Price every row of ``df`` in chunks of ``chunk_size`` rows.
+
+    Returns ``(priced_df, rows_per_second)``.
+    """
+    start = time.perf_counter()
+    chunks = (df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size))
+    parts = list(iter_predictions(pipeline, chunks))
+    priced = pd.concat(parts) if parts else df.assign(predicted_price=[])
+    elapsed = time.perf_counter() - start
+    return priced, len(df) / elapsed if elapsed else float("inf")
+
+
+# --------------------------------------------------
+# PREDICTION CACHE
+# --------------------------------------------------
+def feature_key(values):
+    """Normalized 12-field tuple used as the cache key for one property.
+
+    ``values`` maps column name to value. Numeric fields become floats
+    and categorical fields stripped strings (``""`` when missing), so
+    ``3``, ``3.0`` and ``"3"`` share an entry.
+    """
+    return tuple(
+        float(values[col]) if col in NUMERIC_COLUMNS
+        else "" if pd.isna(values[col]) else str(values[col]).strip()
+        for col in FEATURE_COLUMNS
+    )
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class CachedPredictor:
+    """Single-property predictions behind a bounded LRU cache.
+
+    The cache is keyed on ``feature_key`` and is thread-safe, so one
+    instance can be shared by every session of the app. The model file
+    is re-hashed whenever its size or mtime changes; a new hash reloads
+    the pipeline and empties the cache. ``model_path`` may be the pickle
+    or its compact export (``core.price_model``); ``model_hash`` is the
+    pickle's hash either way.
+
+    Without ``model_path`` both files in ``data_dir`` are watched and
+    ``default_model_path`` picks between them again whenever either
+    changes, so replacing the pickle after an export switches back to
+    it until the export is redone.
+    """
+
+    def __init__(self, model_path=None, maxsize=DEFAULT_CACHE_SIZE, loader=None, data_dir=DATA_DIR):
+        self.model_path = model_path
+        self.data_dir = data_dir
+        self.maxsize = maxsize
+        self.loader = loader or load_model
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stat = None
+        self._file_hash = None
+        self.model_hash = None
+        self.active_path = None
+        self.pipeline = None
+        self._refresh_model()
+
+    def _watched(self):
+        if self.model_path is not None:
+            return [self.model_path]
+        return [os.path.join(self.data_dir, name) for name in (MODEL_FILE, COMPACT_FILE)]
+
+    def _refresh_model(self):
+        stat = tuple(_file_stamp(path) for path in self._watched())
+        if stat == self._stat:
+            return
+        path = self.model_path or default_model_path(self.data_dir)
+        file_hash = file_sha256(path)
+        if file_hash != self._file_hash:
+            self.pipeline = self.loader(path)
+            self.active_path = path
+            self._file_hash = file_hash
+            # A compact export answers for the pickle it was exported from
+            self.model_hash = getattr(self.pipeline, "source_hash", None) or file_hash
+            self._entries.clear()
+        self._stat = stat
+
+    def predict_one(self, values):
+        """Predicted price (Cr) for one property given as a column → value map."""
+        key = feature_key(values)
+        with self._lock:
+            self._refresh_model()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            pipeline, model_hash = self.pipeline, self.model_hash
+
+        price = predict_key(pipeline, key)
+
+        with self._lock:
+            if model_hash != self.model_hash:
+                return price
+            self._entries[key] = price
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return price
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "model_hash": self.model_hash,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk property price prediction")
+    parser.add_argument("input", help="CSV with the 12 feature columns")
+    parser.add_argument("output", help="CSV to write with predicted_price")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--model", default=default_model_path(),
+                        help="price_prediction.pkl or its compact export (.npz)")
+    args = parser.parse_args(argv)
+
+    pipeline = load_model(args.model)
+
+    start = time.perf_counter()
+    rows = 0
+    chunks = pd.read_csv(args.input, chunksize=args.chunk_size)
+    for i, priced in enumerate(iter_predictions(pipeline, chunks)):
+        priced.to_csv(args.output, mode="w" if i == 0 else "a",
+                      header=i == 0, index=False)
+        rows += len(priced)
+    elapsed = time.perf_counter() - start
+
+    rate = rows / elapsed if elapsed else float("inf")
+    print(f"Priced {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
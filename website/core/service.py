@@ -0,0 +1,260 @@
+"""Lightweight HTTP price prediction service (plain ASGI, no Streamlit).
+
+The model is loaded once per process and concurrent requests are
+micro-batched into a single ``pipeline.predict`` call.
+
+Run with any ASGI server (from the ``website`` directory)::
+
+    uvicorn core.service:app --port 8000
+
+Endpoints:
+
+* ``GET /health``
+* ``POST /predict`` with one record, a list of records or
+  ``{"instances": [...]}``; every record uses the ``input_df`` schema
+  (see ``core.pricing.FEATURE_COLUMNS``). Returns
+  ``{"predictions": [...]}`` in Cr.
+
+Errors are returned as ``{"error": "..."}``: 400 for records that fail
+validation or that the model rejects, 500 when the model fails.
+"""
+import asyncio
+import json
+
+import pandas as pd
+
+from core.price_model import default_model_path, load_model
+from core.pricing import predict_prices, validate_features
+
+DEFAULT_MAX_BATCH_ROWS = 4096
+DEFAULT_MAX_WAIT_MS = 2.0
+
+
+# --------------------------------------------------
+# MICRO-BATCHING
+# --------------------------------------------------
+class MicroBatcher:
+    """Coalesces concurrent prediction requests into one model call.
+
+    The first queued request opens a batch; the batch is closed after
+    ``max_wait_ms`` or once ``max_batch_rows`` rows are waiting, then all
+    rows are scored with a single ``predict`` in a worker thread. If that
+    call fails, each request of the batch is retried on its own, so an
+    error only reaches the callers whose rows cause it.
+    """
+
+    def __init__(self, pipeline, max_batch_rows=DEFAULT_MAX_BATCH_ROWS,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.pipeline = pipeline
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self._queue = None
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def predict(self, features):
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while rows < self.max_batch_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+
+            try:
+                prices = await self._score([features for features, _ in batch])
+            except Exception as e:  # noqa: BLE001 - handed to the callers
+                if len(batch) == 1:
+                    _resolve(batch[0][1], error=e)
+                else:
+                    await self._score_each(batch)
+                continue
+
+            self.batches += 1
+            start = 0
+            for features, future in batch:
+                stop = start + len(features)
+                _resolve(future, prices[start:stop].tolist())
+                start = stop
+
+    async def _score(self, frames):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, predict_prices, self.pipeline, pd.concat(frames, ignore_index=True)
+        )
+
+    async def _score_each(self, batch):
+        for features, future in batch:
+            try:
+                prices = await self._score([features])
+            except Exception as e:  # noqa: BLE001 - handed to this caller only
+                _resolve(future, error=e)
+            else:
+                _resolve(future, prices.tolist())
+
+
+def _resolve(future, result=None, error=None):
+    # The caller may have gone away (cancelled) while the batch was scored
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+# --------------------------------------------------
+# ASGI APP
+# --------------------------------------------------
+def parse_records(payload):
+    if isinstance(payload, dict) and "instances" in payload:
+        payload = payload["instances"]
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Expected a record, a list of records or {'instances': [...]}")
+    if not all(isinstance(r, dict) for r in payload):
+        raise ValueError("Every record must be a JSON object")
+    return validate_features(pd.DataFrame.from_records(payload))
+
+
+class PredictionService:
+    """ASGI application serving ``/predict`` and ``/health``."""
+
+    def __init__(self, pipeline=None, model_path=None,
+                 max_batch_rows=DEFAULT_MAX_BATCH_ROWS,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.model_path = model_path
+        self.batch_options = dict(max_batch_rows=max_batch_rows, max_wait_ms=max_wait_ms)
+        self.batcher = MicroBatcher(pipeline, **self.batch_options) if pipeline else None
+
+    def load(self):
+        if self.batcher is None:
+            from core.artifacts import cached
+
+            # Picked when the model is first loaded, not at import
+            path = self.model_path or default_model_path()
+            pipeline = cached(("model", path), lambda: load_model(path))
+            self.batcher = MicroBatcher(pipeline, **self.batch_options)
+        return self.batcher
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"]
+        if path == "/health" and method == "GET":
+            await _send_json(send, 200, {"status": "ok"})
+        elif path == "/predict" and method == "POST":
+            await self._predict(receive, send)
+        else:
+            await _send_json(send, 404, {"error": f"No route for {method} {path}"})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    self.load()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _predict(self, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        try:
+            features = parse_records(json.loads(body or b"null"))
+        except (ValueError, TypeError) as e:
+            await _send_json(send, 400, {"error": str(e)})
+            return
+
+        try:
+            predictions = await self.load().predict(features)
+        except ValueError as e:  # rows the model cannot encode (e.g. unknown categories)
+            await _send_json(send, 400, {"error": str(e)})
+            return
+        except Exception as e:  # noqa: BLE001 - reported to the client as JSON
+            await _send_json(send, 500, {"error": f"Prediction failed: {type(e).__name__}: {e}"})
+            return
+        await _send_json(send, 200, {"predictions": predictions})
+
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# --------------------------------------------------
+# IN-PROCESS CLIENT (NO NETWORK)
+# --------------------------------------------------
+class LocalClient:
+    """Calls an ASGI app directly; used by tests and benchmarks."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method, path, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        scope = {"type": "http", "method": method, "path": path, "headers": []}
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        response = {}
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            else:
+                response["body"] = response.get("body", b"") + message.get("body", b"")
+
+        await self.app(scope, receive, send)
+        return response["status"], json.loads(response["body"])
+
+    async def post(self, path, payload):
+        return await self.request("POST", path, payload)
+
+    async def get(self, path):
+        return await self.request("GET", path)
+
+
+app = PredictionService()
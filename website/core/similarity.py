@@ -0,0 +1,196 @@
+import os
+import threading
+
+import numpy as np
+from core.artifacts import artifact_path, cached, load_array, npy_path
+from core.config import DATA_DIR
+from core.topk import TopKMatrix, load_topk, topk_path
+
+# Facilities, price and location similarity weights used by the recommender page
+DEFAULT_WEIGHTS = (0.5, 0.8, 1.0)
+
+SIMILARITY_FILES = (
+    "Top_facilities.pkl",
+    "price_based.pkl",
+    "location_based.pkl",
+)
+
+# Catalogue size from which the top-K files replace the dense matrices.
+# The dense files grow as 8·N² bytes each (3 × 800 MB at 10,000 rows) and
+# have to be built, shipped and kept on disk; queries only read the rows
+# they blend. Below this size that is still affordable and top-K would
+# only cost recall (0.885 at K=50 today); above it the files are too big.
+TOPK_MIN_ROWS = 10_000
+
+
+# --------------------------------------------------
+# ROW ACCESS (DENSE OR SPARSE TOP-K)
+# --------------------------------------------------
+def dense_rows(matrix, rows):
+    """Rows of a dense array or ``TopKMatrix`` as a float64 ndarray."""
+    if isinstance(matrix, TopKMatrix):
+        return matrix.rows(rows)
+    return np.asarray(matrix[rows], dtype=np.float64)
+
+
+def row_entries(matrix, row, cols):
+    """``matrix[row, cols]`` of a dense array or ``TopKMatrix`` as float64."""
+    if isinstance(matrix, TopKMatrix):
+        return matrix.entries(row, cols)
+    return np.asarray(matrix[row, cols], dtype=np.float64)
+
+
+# --------------------------------------------------
+# TOP-N SELECTION
+# --------------------------------------------------
+def top_n_indices(scores, top_n, exclude=None):
+    """Indices of the ``top_n`` highest ``scores``, best first.
+
+    Uses ``argpartition`` so only the selected candidates are sorted.
+    ``exclude`` is a position (usually the query property itself) that
+    must never be returned.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if exclude is not None:
+        scores = scores.copy()
+        scores[exclude] = -np.inf
+
+    available = scores.size - (0 if exclude is None else 1)
+    n = min(int(top_n), available)
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    candidates = np.argpartition(-scores, n - 1)[:n]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+# --------------------------------------------------
+# SIMILARITY ENGINE
+# --------------------------------------------------
+class SimilarityEngine:
+    """Blends the facilities/price/location similarity matrices.
+
+    ``blended`` builds a full matrix once per weight set and reuses it
+    for every caller; ``row`` answers ad-hoc weight sets by blending a
+    single row. Matrices may be dense arrays or ``TopKMatrix`` instances
+    (see ``core.topk``); blending top-K inputs stays sparse.
+    """
+
+    def __init__(self, matrices, index):
+        self.matrices = tuple(matrices)
+        self.index = index
+        self._blended = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def is_sparse(self):
+        return all(isinstance(m, TopKMatrix) for m in self.matrices)
+
+    def weights_key(self, weights):
+        key = tuple(float(w) for w in weights)
+        if len(key) != len(self.matrices):
+            raise ValueError(
+                f"Expected {len(self.matrices)} weights, got {len(key)}"
+            )
+        return key
+
+    def blended(self, weights=DEFAULT_WEIGHTS):
+        key = self.weights_key(weights)
+
+        with self._lock:
+            matrix = self._blended.get(key)
+            if matrix is None:
+                if self.is_sparse:
+                    matrix = TopKMatrix.blend(key, self.matrices)
+                else:
+                    matrix = np.zeros(self.matrices[0].shape, dtype=np.float64)
+                    for weight, sim in zip(key, self.matrices):
+                        if weight:
+                            matrix += weight * np.asarray(sim, dtype=np.float64)
+                    matrix.setflags(write=False)
+                self._blended[key] = matrix
+        return matrix
+
+    def row(self, pos, weights=DEFAULT_WEIGHTS):
+        """Blended similarity of one property against all others.
+
+        Served from an already blended matrix when one exists for these
+        weights, otherwise only the requested row is blended, which is
+        O(N) and leaves no N×N matrix behind for ad-hoc weight sets.
+        """
+        key = self.weights_key(weights)
+        matrix = self._blended.get(key)
+        if matrix is not None:
+            return dense_rows(matrix, [pos])[0]
+
+        row = np.zeros(len(self), dtype=np.float64)
+        for weight, sim in zip(key, self.matrices):
+            if weight:
+                row += weight * dense_rows(sim, [pos])[0]
+        return row
+
+    def scores(self, pos, rows, weights=DEFAULT_WEIGHTS):
+        """Blended similarity of ``pos`` against ``rows`` only.
+
+        Costs O(len(rows)) (plus K for top-K matrices) rather than a
+        full row, for callers that have already pruned the candidates.
+        """
+        key = self.weights_key(weights)
+        rows = np.asarray(rows, dtype=np.intp)
+        matrix = self._blended.get(key)
+        if matrix is not None:
+            return row_entries(matrix, pos, rows)
+
+        out = np.zeros(rows.size, dtype=np.float64)
+        for weight, sim in zip(key, self.matrices):
+            if weight:
+                out += weight * row_entries(sim, pos, rows)
+        return out
+
+    def position(self, property_name):
+        return self.index.get_loc(property_name)
+
+    def recommend(self, property_name, top_n=5, weights=DEFAULT_WEIGHTS):
+        """Top-N most similar properties as ``(names, scores)``."""
+        pos = self.position(property_name)
+        row = self.row(pos, weights)
+        top = top_n_indices(row, top_n, exclude=pos)
+        return self.index[top].tolist(), row[top]
+
+
+# --------------------------------------------------
+# LOADING
+# --------------------------------------------------
+def dense_available(data_dir=DATA_DIR):
+    """Whether every dense matrix exists (as a pickle or ``.npy``)."""
+    return all(
+        os.path.exists(artifact_path(name, data_dir)) or os.path.exists(npy_path(name, data_dir))
+        for name in SIMILARITY_FILES
+    )
+
+
+def load_engine(index, data_dir=DATA_DIR, use_topk=None):
+    """Engine over the similarity matrices, rows aligned to ``index``.
+
+    The dense matrices are opened memory-mapped through
+    ``core.artifacts`` and give exact scores. The sparse top-K ``.npz``
+    files are approximate; by default (``use_topk=None``) they are used
+    only from ``TOPK_MIN_ROWS`` properties on, or when the dense
+    matrices were not built. ``True``/``False`` force either choice
+    (``True`` still needs every top-K file). Check ``is_sparse`` to
+    tell which one was loaded.
+    """
+    topk_files = [topk_path(name, data_dir) for name in SIMILARITY_FILES]
+    if use_topk is None:
+        use_topk = len(index) >= TOPK_MIN_ROWS or not dense_available(data_dir)
+    if use_topk and all(os.path.exists(path) for path in topk_files):
+        return SimilarityEngine(
+            [cached(("topk", p), lambda p=p: load_topk(p)) for p in topk_files],
+            index
+        )
+
+    matrices = [load_array(name, data_dir) for name in SIMILARITY_FILES]
+    return SimilarityEngine(matrices, index)
@@ -0,0 +1,303 @@
+"""Radius queries for "Search Nearby": around a landmark or a point.
+
+A landmark query is answered from the scraped property→landmark
+distances in ``distance_location.pkl`` (``LandmarkDistances``). A point
+(latitude/longitude) query uses a haversine BallTree (``SpatialIndex``)
+over ``property_coords.csv``.
+
+``property_coords.csv`` (one row per recommender property) and
+``landmarks.csv`` (estimated landmark coordinates) are built offline
+from ``new_latlong.csv``:
+
+* a property takes the mean coordinates of the matching society, else the
+  centroid of its sector;
+* every landmark is located by multilateration from the scraped
+  property→landmark distances of the properties placed so far (or placed
+  on its nearest property when fewer than three distances are known);
+* the remaining properties are then located the same way from the
+  landmarks.
+
+The estimated coordinates are too coarse to stand in for the scraped
+distances (54% recall at 1 km, 68% at 2 km), so landmark queries never
+go through the BallTree.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.spatial --real-estate-data ../data/real_estate_data.csv
+"""
+import argparse
+import os
+import pickle
+import re
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+from sklearn.neighbors import BallTree
+
+from core.config import DATA_DIR
+
+EARTH_RADIUS_KM = 6371.0088
+
+# distance_location.pkl uses this value for "not listed"
+MISSING_DISTANCE_M = 54000.0
+
+# Local projection origin (centre of Gurugram)
+ORIGIN_LAT, ORIGIN_LON = 28.4595, 77.0266
+
+PROPERTY_COORDS_FILE = "property_coords.csv"
+LANDMARKS_FILE = "landmarks.csv"
+
+_SECTOR_RE = re.compile(r"sector[\s-]*(\d+)\s*([a-z])?\b")
+
+
+# --------------------------------------------------
+# INDEXES
+# --------------------------------------------------
+def _positions_in(names, index, aligned):
+    """``(index, positions of names in index)``, reusing ``aligned`` when it matches."""
+    if aligned is None or aligned[0] is not index:
+        aligned = (index, pd.Index(index).get_indexer(names))
+    return aligned
+
+
+class SpatialIndex:
+    """BallTree over latitude/longitude with radius queries in km."""
+
+    def __init__(self, names, latitude, longitude):
+        self.names = pd.Index(names)
+        coords = np.column_stack([latitude, longitude]).astype(np.float64)
+        self.tree = BallTree(np.radians(coords), metric="haversine")
+        self._aligned = None
+
+    @classmethod
+    def from_csv(cls, path=None):
+        df = pd.read_csv(path or os.path.join(DATA_DIR, PROPERTY_COORDS_FILE))
+        return cls(df["PropertyName"], df["latitude"], df["longitude"])
+
+    def query_radius_rows(self, latitude, longitude, radius_km, sort_results=False):
+        """``(rows, distances_km)`` of the properties within ``radius_km``.
+
+        ``rows`` are positions in ``self.names``; unsorted unless
+        ``sort_results`` is set.
+        """
+        point = np.radians([[latitude, longitude]])
+        ind, dist = self.tree.query_radius(
+            point, r=radius_km / EARTH_RADIUS_KM,
+            return_distance=True, sort_results=sort_results
+        )
+        return ind[0], dist[0] * EARTH_RADIUS_KM
+
+    def query_radius(self, latitude, longitude, radius_km):
+        """Properties within ``radius_km`` of a point, nearest first.
+
+        Returns a Series of distances in km indexed by property name.
+        """
+        rows, distances = self.query_radius_rows(latitude, longitude, radius_km, sort_results=True)
+        return pd.Series(distances, index=self.names[rows], name="distance_km")
+
+    def positions_in(self, index):
+        """Position of every indexed property in ``index`` (-1 when absent).
+
+        Computed once per ``index`` object, so radius queries can map
+        their rows without hashing names.
+        """
+        self._aligned = _positions_in(self.names, index, self._aligned)
+        return self._aligned[1]
+
+
+class LandmarkDistances:
+    """Radius queries around a landmark from the scraped distances (metres).
+
+    Same query interface as ``SpatialIndex`` with a landmark name in
+    place of the coordinates. Unlisted distances (``MISSING_DISTANCE_M``)
+    never match.
+    """
+
+    def __init__(self, location_df):
+        self.names = pd.Index(location_df.index)
+        self.landmarks = pd.Index(location_df.columns)
+        distances = location_df.to_numpy(dtype=np.float64, copy=True)
+        distances[distances >= MISSING_DISTANCE_M] = np.inf
+        # One contiguous row per landmark
+        self.distances_km = np.ascontiguousarray(distances.T) / 1000.0
+        self._aligned = None
+
+    def query_radius_rows(self, landmark, radius_km, sort_results=False):
+        """``(rows, distances_km)`` of the properties closer than ``radius_km``."""
+        distances = self.distances_km[self.landmarks.get_loc(landmark)]
+        rows = np.flatnonzero(distances < radius_km)
+        if sort_results:
+            rows = rows[np.argsort(distances[rows], kind="stable")]
+        return rows, distances[rows]
+
+    def query_radius(self, landmark, radius_km):
+        """Properties within ``radius_km`` of ``landmark``, nearest first."""
+        rows, distances = self.query_radius_rows(landmark, radius_km, sort_results=True)
+        return pd.Series(distances, index=self.names[rows], name="distance_km")
+
+    def positions_in(self, index):
+        """Position of every property in ``index`` (-1 when absent)."""
+        self._aligned = _positions_in(self.names, index, self._aligned)
+        return self._aligned[1]
+
+
+def load_landmarks(path=None):
+    """Estimated landmark coordinates (and anchor counts) indexed by landmark name."""
+    df = pd.read_csv(path or os.path.join(DATA_DIR, LANDMARKS_FILE))
+    return df.set_index("Landmark")
+
+
+# --------------------------------------------------
+# OFFLINE TABLE BUILDING
+# --------------------------------------------------
+def _to_km(lat, lon):
+    x = (np.asarray(lon) - ORIGIN_LON) * 111.320 * np.cos(np.radians(ORIGIN_LAT))
+    y = (np.asarray(lat) - ORIGIN_LAT) * 110.574
+    return np.column_stack([x, y])
+
+
+def _from_km(xy):
+    lon = xy[:, 0] / (111.320 * np.cos(np.radians(ORIGIN_LAT))) + ORIGIN_LON
+    lat = xy[:, 1] / 110.574 + ORIGIN_LAT
+    return lat, lon
+
+
+def multilaterate(anchors_xy, distances_km, min_anchors=3):
+    """Least-squares position (km plane) from anchor distances.
+
+    With fewer than ``min_anchors`` anchors the nearest anchor's position
+    is used as an approximation; with none the result is None.
+    """
+    if len(distances_km) == 0:
+        return None
+    nearest = np.argsort(distances_km)[:3]
+    if len(distances_km) < min_anchors:
+        return anchors_xy[nearest[0]]
+    guess = anchors_xy[nearest].mean(axis=0)
+    fit = least_squares(
+        lambda p: np.hypot(*(anchors_xy - p).T) - distances_km,
+        guess,
+        loss="soft_l1",
+    )
+    return fit.x
+
+
+def _sector_key(text):
+    text = str(text).lower()
+    if "sohna" in text:
+        return None
+    m = _SECTOR_RE.search(text)
+    return f"sector {m.group(1)}{m.group(2) or ''}" if m else None
+
+
+def build_spatial_tables(location_df, latlong_df, subnames=None):
+    """``(property_coords, landmarks)`` frames for the spatial index.
+
+    ``location_df`` is the property×landmark distance table in metres,
+    ``latlong_df`` the geocoded listings and ``subnames`` an optional
+    PropertyName → PropertySubName mapping used for sector fallback.
+    """
+    names = location_df.index
+    lat = np.full(len(names), np.nan)
+    lon = np.full(len(names), np.nan)
+    source = np.array(["multilateration"] * len(names), dtype=object)
+
+    society = latlong_df.assign(key=latlong_df["society"].str.lower().str.strip())
+    by_society = society.groupby("key")[["latitude", "longitude"]].mean()
+    by_sector = latlong_df.groupby("sector")[["latitude", "longitude"]].mean()
+    subnames = subnames if subnames is not None else {}
+
+    for i, name in enumerate(names):
+        key = name.lower().strip()
+        if key in by_society.index:
+            lat[i], lon[i] = by_society.loc[key]
+            source[i] = "society"
+            continue
+        sector = _sector_key(subnames.get(name, ""))
+        if sector in by_sector.index:
+            lat[i], lon[i] = by_sector.loc[sector]
+            source[i] = "sector"
+
+    dist_km = location_df.to_numpy(dtype=np.float64) / 1000.0
+    listed = location_df.to_numpy() < MISSING_DISTANCE_M
+    placed = ~np.isnan(lat)
+    prop_xy = _to_km(lat, lon)
+
+    # Landmarks from placed properties
+    landmark_xy = np.full((location_df.shape[1], 2), np.nan)
+    anchors = np.zeros(location_df.shape[1], dtype=int)
+    for j in range(location_df.shape[1]):
+        use = listed[:, j] & placed
+        anchors[j] = use.sum()
+        xy = multilaterate(prop_xy[use], dist_km[use, j])
+        if xy is not None:
+            landmark_xy[j] = xy
+
+    # Remaining properties from located landmarks
+    located = ~np.isnan(landmark_xy[:, 0])
+    for i in np.flatnonzero(~placed):
+        use = listed[i] & located
+        xy = multilaterate(landmark_xy[use], dist_km[i, use])
+        if xy is not None:
+            prop_xy[i] = xy
+
+    prop_lat, prop_lon = _from_km(prop_xy)
+    property_coords = pd.DataFrame({
+        "PropertyName": names,
+        "latitude": prop_lat,
+        "longitude": prop_lon,
+        "source": source,
+    }).dropna(subset=["latitude", "longitude"])
+
+    lm_lat, lm_lon = _from_km(landmark_xy)
+    landmarks = pd.DataFrame({
+        "Landmark": location_df.columns,
+        "latitude": lm_lat,
+        "longitude": lm_lon,
+        "anchors": anchors,
+    }).dropna(subset=["latitude", "longitude"])
+
+    return property_coords, landmarks
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--real-estate-data",
+                        help="Scraped projects CSV with PropertySubName "
+                             "(enables the sector fallback)")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, "distance_location.pkl"), "rb") as f:
+        location_df = pickle.load(f)
+    latlong_df = pd.read_csv(os.path.join(args.data_dir, "new_latlong.csv"))
+
+    subnames = None
+    if args.real_estate_data:
+        projects = pd.read_csv(args.real_estate_data)
+        subnames = (
+            projects.drop_duplicates("PropertyName")
+            .set_index("PropertyName")["PropertySubName"]
+            .to_dict()
+        )
+
+    property_coords, landmarks = build_spatial_tables(
+        location_df, latlong_df, subnames
+    )
+    property_coords.round(6).to_csv(
+        os.path.join(args.data_dir, PROPERTY_COORDS_FILE), index=False
+    )
+    landmarks.round(6).to_csv(
+        os.path.join(args.data_dir, LANDMARKS_FILE), index=False
+    )
+    print(f"Located {len(property_coords)}/{len(location_df)} properties "
+          f"({property_coords['source'].value_counts().to_dict()}) and "
+          f"{len(landmarks)}/{location_df.shape[1]} landmarks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Columnar (Parquet) copies of the CSV tables, with compact dtypes.
+
+Every CSV the app or the notebooks read can be converted to a
+``.parquet`` next to it. Tables listed in ``SCHEMAS`` get explicit
+per-column dtypes (int8 counts, float32 measures, categoricals) and drop
+redundant columns; any other table has its repeated text columns made
+categorical and its coordinates ``float32``. ``read_table`` loads only
+the requested columns. Like ``core.artifacts``, the Parquet copy is
+(re)generated on first read when missing, older than its CSV or written
+under an older ``SCHEMA_VERSION``, and the CSV is used directly when the
+directory is not writable. A Parquet file whose CSV is gone is never
+served: reading that table raises ``FileNotFoundError``.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.tables                 # app tables and the notebook chain
+    python -m core.tables ../data/new_latlong.csv --footprint
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.config import BASE_DIR, DATA_DIR
+
+NOTEBOOK_DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), "data")
+
+# Tables the pages read
+APP_TABLES = (
+    "sector_stats.csv",
+    "gurgaon_properties.csv",
+    "new_latlong.csv",
+)
+
+# The cleaning/feature-engineering chain in the notebooks
+NOTEBOOK_TABLES = (
+    "gurgaon_properties_cleaned_v1.csv",
+    "gurgaon_properties_cleaned_v2.csv",
+    "gurgaon_properties_missing_value_treated.csv",
+    "gurgaon_properties_outlier_treated.csv",
+    "gurgaon_properties_post_feature_selection.csv",
+)
+
+CATEGORY_COLUMNS = ("property_type", "society", "sector", "agePossession")
+
+FLOAT32_COLUMNS = ("latitude", "longitude")
+
+# Bump when SCHEMAS or the default dtype rules change
+SCHEMA_VERSION = 1
+
+SCHEMA_METADATA_KEY = b"core.tables.schema_version"
+
+_PROPERTY_COUNTS = {
+    "bedRoom": "int8",
+    "bathroom": "int8",
+    "study room": "int8",
+    "servant room": "int8",
+    "store room": "int8",
+    "pooja room": "int8",
+    "others": "int8",
+    "furnishing_type": "int8",
+    "luxury_score": "int16",
+}
+
+# Explicit dtypes per table (by file name); unlisted columns are dropped
+SCHEMAS = {
+    "new_latlong.csv": {
+        "property_type": "category",
+        "society": "category",
+        "sector": "category",
+        "price": "float32",
+        "price_per_sqft": "float32",
+        **_PROPERTY_COUNTS,
+        "balcony": "category",
+        "floorNum": "float32",
+        "agePossession": "category",
+        "built_up_area": "float32",
+        # "coordinates" ("28.3986° N, 76.9384° E") repeats these two
+        "latitude": "float32",
+        "longitude": "float32",
+    },
+}
+
+
+# --------------------------------------------------
+# DTYPES
+# --------------------------------------------------
+def compact_dtypes(df):
+    """Copy of ``df`` with categorical text columns and float32 coordinates.
+
+    Only text columns become categoricals (the post-feature-selection
+    table stores the encoded codes as floats and is left alone).
+    """
+    out = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in out.columns and not pd.api.types.is_numeric_dtype(out[col]):
+            out[col] = out[col].astype("category")
+    for col in FLOAT32_COLUMNS:
+        if col in out.columns:
+            out[col] = out[col].astype(np.float32)
+    return out
+
+
+def _cast(series, dtype):
+    """``series`` as ``dtype``; numeric downcasts must not change values."""
+    out = series.astype(dtype)
+    if dtype != "category" and pd.api.types.is_numeric_dtype(series):
+        same = np.isclose(out.to_numpy(np.float64), series.to_numpy(np.float64),
+                          rtol=1e-6, equal_nan=True)
+        if not same.all():
+            raise ValueError(f"Column {series.name!r} does not fit in {dtype}")
+    return out
+
+
+def apply_schema(df, schema):
+    """``df`` with exactly the ``schema`` columns cast to their dtypes."""
+    missing = [c for c in schema if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return pd.DataFrame({col: _cast(df[col], dtype) for col, dtype in schema.items()})
+
+
+def compact_table(df, name):
+    """``df`` (read from the CSV ``name``) with its compact dtypes."""
+    schema = SCHEMAS.get(os.path.basename(name))
+    return apply_schema(df, schema) if schema else compact_dtypes(df)
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def memory_footprint(df):
+    """Per-column dtype and in-memory size (deep), largest first."""
+    usage = df.memory_usage(deep=True, index=False)
+    footprint = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": usage,
+        "share": usage / usage.sum(),
+    })
+    return footprint.sort_values("bytes", ascending=False)
+
+
+# --------------------------------------------------
+# PARQUET
+# --------------------------------------------------
+def parquet_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def convert_to_parquet(csv_path):
+    """Write ``csv_path`` as compact Parquet and return the new path."""
+    dst = parquet_path(csv_path)
+    df = compact_table(pd.read_csv(csv_path), csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        SCHEMA_METADATA_KEY: str(SCHEMA_VERSION).encode(),
+    })
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, dst)
+    return dst
+
+
+def _schema_version(path):
+    metadata = pq.read_schema(path).metadata or {}
+    return int(metadata.get(SCHEMA_METADATA_KEY, b"0"))
+
+
+def _parquet_is_fresh(csv_path):
+    dst = parquet_path(csv_path)
+    # An orphaned copy could be stale in any way, so it never counts as fresh
+    if not os.path.exists(dst) or not os.path.exists(csv_path):
+        return False
+    if os.path.getmtime(dst) < os.path.getmtime(csv_path):
+        return False
+    return _schema_version(dst) == SCHEMA_VERSION
+
+
+def table_path(name, data_dir=DATA_DIR):
+    """File ``read_table`` serves for ``name`` (Parquet once converted)."""
+    csv_path = os.path.join(data_dir, name)
+    return parquet_path(csv_path) if _parquet_is_fresh(csv_path) else csv_path
+
+
+def read_table(name, columns=None, data_dir=DATA_DIR):
+    """Table ``name`` (a CSV file name) restricted to ``columns``.
+
+    Reads the Parquet copy, converting the CSV first when needed.
+    """
+    csv_path = os.path.join(data_dir, name)
+    columns = list(columns) if columns is not None else None
+    if not _parquet_is_fresh(csv_path):
+        try:
+            convert_to_parquet(csv_path)
+        except OSError:
+            df = compact_table(pd.read_csv(csv_path), csv_path)
+            return df if columns is None else df[columns]
+    return pd.read_parquet(parquet_path(csv_path), columns=columns)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def default_paths():
+    paths = [os.path.join(DATA_DIR, name) for name in APP_TABLES]
+    paths += [os.path.join(NOTEBOOK_DATA_DIR, name) for name in NOTEBOOK_TABLES]
+    return [p for p in paths if os.path.exists(p)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert CSV tables to compact Parquet")
+    parser.add_argument("paths", nargs="*", help="CSV files (default: app and notebook tables)")
+    parser.add_argument("--footprint", action="store_true",
+                        help="print per-column memory before and after")
+    args = parser.parse_args(argv)
+
+    for path in args.paths or default_paths():
+        start = time.perf_counter()
+        dst = convert_to_parquet(path)
+        elapsed = time.perf_counter() - start
+        print(f"{os.path.basename(path)}: {os.path.getsize(path) / 1e3:.0f} KB -> "
+              f"{os.path.getsize(dst) / 1e3:.0f} KB parquet ({elapsed:.2f}s)")
+
+        if args.footprint:
+            before = memory_footprint(pd.read_csv(path))
+            after = memory_footprint(pd.read_parquet(dst))
+            table = before.join(after, lsuffix="_csv", rsuffix="_parquet", how="outer")
+            table = table.sort_values("bytes_csv", ascending=False)
+            print(table[["dtype_csv", "bytes_csv", "dtype_parquet", "bytes_parquet"]]
+                  .to_string(na_rep="-", float_format="{:.0f}".format))
+            print(f"  total {before['bytes'].sum() / 1e3:.0f} KB -> "
+                  f"{after['bytes'].sum() / 1e3:.0f} KB in memory")
+
+
+if __name__ == "__main__":
+    main()
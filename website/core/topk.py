@@ -0,0 +1,236 @@
+"""Sparse top-K storage for the recommender similarity matrices.
+
+Each dense N×N cosine matrix is reduced to its K strongest neighbours per
+row (a scipy CSR matrix plus one fill value per row) and saved as
+``.npz``, so size and load time grow with N·K instead of N².
+
+Usage (from the ``website`` directory)::
+
+    python -m core.topk --k 50
+"""
+import argparse
+import os
+import pickle
+
+import numpy as np
+from scipy import sparse
+
+from core.config import DATA_DIR
+
+DEFAULT_K = 50
+DEFAULT_BLOCK_SIZE = 1024
+
+
+def topk_path(pickle_name, data_dir=DATA_DIR):
+    stem = os.path.splitext(pickle_name)[0]
+    return os.path.join(data_dir, f"{stem}_topk.npz")
+
+
+# --------------------------------------------------
+# TOP-K MATRIX
+# --------------------------------------------------
+class TopKMatrix:
+    """Row-wise top-K approximation of a dense similarity matrix.
+
+    Every row keeps its ``k`` strongest neighbours exactly; all other
+    entries read as that row's ``fill`` value (the mean of the dropped
+    entries). Neighbours are stored as a CSR matrix of residuals against
+    ``fill``, which keeps weighted blends of several matrices exact in
+    this representation.
+    """
+
+    def __init__(self, residuals, fill):
+        self.residuals = residuals.tocsr()
+        if not self.residuals.has_sorted_indices:
+            self.residuals.sort_indices()
+        self.fill = np.asarray(fill, dtype=np.float64)
+
+    @property
+    def shape(self):
+        return self.residuals.shape
+
+    @property
+    def nbytes(self):
+        r = self.residuals
+        return r.data.nbytes + r.indices.nbytes + r.indptr.nbytes + self.fill.nbytes
+
+    def entries(self, row, cols):
+        """``self[row, cols]`` as float64, in O(k + len(cols))."""
+        r = self.residuals
+        start, stop = r.indptr[row], r.indptr[row + 1]
+        kept, residuals = r.indices[start:stop], r.data[start:stop]
+        cols = np.asarray(cols, dtype=np.intp)
+        out = np.full(cols.size, self.fill[row], dtype=np.float64)
+        if kept.size:
+            at = np.minimum(np.searchsorted(kept, cols), kept.size - 1)
+            hit = kept[at] == cols
+            out[hit] += residuals[at[hit]]
+        return out
+
+    def rows(self, rows):
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.intp))
+        out = self.residuals[rows].toarray().astype(np.float64, copy=False)
+        out += self.fill[rows][:, None]
+        return out
+
+    @classmethod
+    def blend(cls, weights, matrices):
+        residuals = sparse.csr_matrix(matrices[0].shape, dtype=np.float64)
+        fill = np.zeros(matrices[0].shape[0], dtype=np.float64)
+        for weight, matrix in zip(weights, matrices):
+            if weight:
+                residuals = residuals + weight * matrix.residuals
+                fill += weight * matrix.fill
+        return cls(residuals, fill)
+
+
+def topk_rows(block, start, k):
+    """Top-``k`` of the full rows ``start..start+len(block)`` of a matrix.
+
+    Returns ``(indices, residuals, fill)`` as stored by ``TopKMatrix``.
+    ``block`` must be a float64 array; it is modified in place.
+    """
+    n_cols = block.shape[1]
+    rows = np.arange(block.shape[0])
+    self_scores = block[rows, rows + start].copy()
+    block[rows, rows + start] = -np.inf
+
+    part = np.argpartition(-block, k - 1, axis=1)[:, :k]
+    part.sort(axis=1)
+    kept = np.take_along_axis(block, part, axis=1)
+
+    fill = np.zeros(block.shape[0], dtype=np.float64)
+    n_dropped = n_cols - 1 - k
+    if n_dropped > 0:
+        block[rows, rows + start] = self_scores
+        dropped_sum = block.sum(axis=1) - self_scores - kept.sum(axis=1)
+        fill = dropped_sum / n_dropped
+    return part, kept - fill[:, None], fill
+
+
+def topk_matrix(indices, data, fill, n_cols):
+    """``TopKMatrix`` from per-row ``(n_rows, k)`` neighbour arrays."""
+    n_rows, k = indices.shape
+    indptr = np.arange(0, n_rows * k + 1, k, dtype=np.int64)
+    residuals = sparse.csr_matrix(
+        (data.ravel(), indices.ravel(), indptr), shape=(n_rows, n_cols)
+    )
+    return TopKMatrix(residuals, fill)
+
+
+def sparsify_topk(matrix, k=DEFAULT_K, block_size=DEFAULT_BLOCK_SIZE,
+                  dtype=np.float32):
+    """``TopKMatrix`` keeping the ``k`` largest entries of every row.
+
+    The diagonal (self-similarity) is never kept. ``matrix`` may be any
+    row-sliceable 2-D array, including a memory-mapped ``.npy``, and is
+    processed ``block_size`` rows at a time.
+    """
+    n_rows, n_cols = matrix.shape
+    k = min(int(k), n_cols - 1)
+
+    indices = np.empty((n_rows, k), dtype=np.int32)
+    data = np.empty((n_rows, k), dtype=dtype)
+    fill = np.zeros(n_rows, dtype=np.float64)
+    for start in range(0, n_rows, block_size):
+        stop = min(start + block_size, n_rows)
+        block = np.array(matrix[start:stop], dtype=np.float64)
+        indices[start:stop], data[start:stop], fill[start:stop] = topk_rows(block, start, k)
+    return topk_matrix(indices, data, fill, n_cols)
+
+
+def extend_topk(matrix, new_rows, k=DEFAULT_K, dtype=np.float32):
+    """``matrix`` (N×N top-K) grown with ``new_rows`` (M×(N+M) exact scores).
+
+    The new rows are reduced with ``topk_rows``. An existing row's top-K
+    can only change by taking in new columns (the similarity is
+    symmetric, so those are ``new_rows[:, row]``): the merge keeps the
+    best ``k`` of its kept entries and the M new ones, and moves the
+    rest into the fill mean. Costs O(N·(K + M)) instead of re-reducing
+    the (N+M)² matrix.
+    """
+    n = matrix.shape[0]
+    m, n_cols = new_rows.shape
+    if n_cols != n + m:
+        raise ValueError(f"Expected {n + m} columns in the new rows, got {n_cols}")
+    counts = np.diff(matrix.residuals.indptr)
+    k_old = int(counts[0])
+    if np.any(counts != k_old):
+        raise ValueError("Every row of the top-K matrix must keep the same number of neighbours")
+    k = min(int(k), n_cols - 1)
+    if k > k_old and k_old < n - 1:
+        raise ValueError(f"Cannot grow K from {k_old} to {k} incrementally; rebuild the top-K files")
+
+    indices = np.empty((n + m, k), dtype=np.int32)
+    data = np.empty((n + m, k), dtype=dtype)
+    fill = np.zeros(n + m, dtype=np.float64)
+    indices[n:], data[n:], fill[n:] = topk_rows(np.array(new_rows, dtype=np.float64), n, k)
+
+    r = matrix.residuals
+    candidates = np.hstack([
+        r.data.reshape(n, k_old) + matrix.fill[:, None],
+        np.asarray(new_rows[:, :n], dtype=np.float64).T,
+    ])
+    columns = np.hstack([
+        r.indices.reshape(n, k_old),
+        np.broadcast_to(np.arange(n, n + m), (n, m)),
+    ])
+    part = np.argpartition(-candidates, k - 1, axis=1)[:, :k]
+    kept_columns = np.take_along_axis(columns, part, axis=1)
+    # Column order within each row, as topk_rows returns it
+    order = np.argsort(kept_columns, axis=1)
+    kept = np.take_along_axis(np.take_along_axis(candidates, part, axis=1), order, axis=1)
+
+    n_dropped = n_cols - 1 - k
+    if n_dropped > 0:
+        dropped_sum = matrix.fill * (n - 1 - k_old) + candidates.sum(axis=1) - kept.sum(axis=1)
+        fill[:n] = dropped_sum / n_dropped
+    indices[:n] = np.take_along_axis(kept_columns, order, axis=1)
+    data[:n] = kept - fill[:n, None]
+    return topk_matrix(indices, data, fill, n_cols)
+
+
+def save_topk(path, matrix):
+    r = matrix.residuals
+    np.savez(
+        path,
+        data=r.data,
+        indices=r.indices,
+        indptr=r.indptr,
+        shape=np.array(r.shape),
+        fill=matrix.fill.astype(np.float32),
+    )
+
+
+def load_topk(path):
+    with np.load(path) as f:
+        residuals = sparse.csr_matrix(
+            (f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"])
+        )
+        return TopKMatrix(residuals, f["fill"])
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    from core.similarity import SIMILARITY_FILES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=DEFAULT_K,
+                        help="Neighbours kept per property")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    for name in SIMILARITY_FILES:
+        with open(os.path.join(args.data_dir, name), "rb") as f:
+            dense = pickle.load(f)
+        topk = sparsify_topk(dense, k=args.k)
+        path = topk_path(name, args.data_dir)
+        save_topk(path, topk)
+        print(f"{name}: {dense.nbytes / 1e3:.0f} KB dense -> "
+              f"{os.path.getsize(path) / 1e3:.0f} KB top-{args.k} ({path})")
+
+
+if __name__ == "__main__":
+    main()
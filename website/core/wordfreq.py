@@ -0,0 +1,96 @@
+"""Per-sector word-frequency tables for the Analytic page WordCloud.
+
+The ``features`` column holds stringified Python lists. They are parsed
+once and tokenized with WordCloud's own ``process_text`` (same stopwords,
+plural folding and collocations as ``WordCloud.generate``), so the page
+only has to call ``generate_from_frequencies``.
+
+Usage (from the ``website`` directory)::
+
+    python -m core.wordfreq
+"""
+import argparse
+import ast
+import os
+import pickle
+from collections import Counter
+
+from wordcloud import WordCloud
+
+from core.config import DATA_DIR
+from core.tables import read_table
+
+FREQUENCIES_FILE = "feature_frequencies.pkl"
+
+ALL_SECTORS = "All"
+
+WORDCLOUD_OPTIONS = dict(
+    width=800,
+    height=650,
+    background_color="white",
+    stopwords={"s"},
+    min_font_size=10
+)
+
+
+def parse_features(value):
+    """List of feature names from one ``features`` cell."""
+    if not isinstance(value, str) or not value.strip():
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return [str(item) for item in parsed] if isinstance(parsed, (list, tuple)) else []
+
+
+def build_frequency_tables(feature_sector_df):
+    """``{sector: Counter}`` of WordCloud tokens, plus an ``"All"`` table."""
+    tokenizer = WordCloud(**WORDCLOUD_OPTIONS)
+    words = feature_sector_df["features"].map(parse_features)
+
+    tables = {}
+    for sector, sector_words in words.groupby(feature_sector_df["sector"], observed=True):
+        text = " ".join(w for row in sector_words for w in row)
+        tables[sector] = Counter(tokenizer.process_text(text)) if text.strip() else Counter()
+
+    # process_text is not additive (collocation scores depend on the whole
+    # text), so the combined table is tokenized from the combined text
+    all_text = " ".join(w for row in words for w in row)
+    tables[ALL_SECTORS] = Counter(tokenizer.process_text(all_text)) if all_text.strip() else Counter()
+    return tables
+
+
+def load_frequency_tables(path=None):
+    with open(path or os.path.join(DATA_DIR, FREQUENCIES_FILE), "rb") as f:
+        return pickle.load(f)
+
+
+def render_wordcloud(frequencies):
+    """RGB image array for a frequency table (None when it is empty)."""
+    if not frequencies:
+        return None
+    return WordCloud(**WORDCLOUD_OPTIONS).generate_from_frequencies(frequencies).to_array()
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build per-sector WordCloud frequency tables")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    feature_df = read_table("gurgaon_properties.csv", ["features"], data_dir=args.data_dir)
+    main_df = read_table("new_latlong.csv", ["sector"], data_dir=args.data_dir)
+    feature_sector_df = feature_df[["features"]].join(main_df, how="inner")
+
+    tables = build_frequency_tables(feature_sector_df)
+    path = os.path.join(args.data_dir, FREQUENCIES_FILE)
+    with open(path, "wb") as f:
+        pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"{len(tables)} frequency tables ({os.path.getsize(path) / 1e3:.0f} KB) -> {path}")
+
+
+if __name__ == "__main__":
+    main()
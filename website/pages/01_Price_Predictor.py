@@ -1,6 +1,3 @@
-print("🔥 PREDICTOR FILE LOADED")
-
-
 import os
 import warnings
 from sklearn.exceptions import InconsistentVersionWarning
@@ -9,7 +6,10 @@ warnings.filterwarnings("ignore", category=InconsistentVersionWarning)
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
+
+from core.artifacts import load_joblib
+from core.price_surface import SURFACE_FILE, PriceSurface
+from core.pricing import CachedPredictor, FEATURE_COLUMNS, PRICE_BAND, predict_frame
 
 
 # --------------------------------------------------
@@ -35,13 +35,28 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # /app/website
 DATA_DIR = os.path.join(BASE_DIR, "dataset")
 
 # --------------------------------------------------
-df = joblib.load(
-    os.path.join(DATA_DIR, "df.pkl")
-)
+# Loaded once per server process, not once per rerun
+df = load_joblib("df.pkl", DATA_DIR)
 
-pipeline = joblib.load(
-    os.path.join(DATA_DIR, "price_prediction.pkl")
-)
+@st.cache_resource
+def load_predictor():
+    # One LRU prediction cache shared by all sessions; it reloads the
+    # model and starts empty whenever the model files change. The compact
+    # export (python -m core.price_model) is used while it matches the
+    # current pickle.
+    return CachedPredictor(data_dir=DATA_DIR)
+
+
+predictor = load_predictor()
+
+
+@st.cache_resource
+def load_price_surface():
+    path = os.path.join(DATA_DIR, SURFACE_FILE)
+    return PriceSurface.load(path) if os.path.exists(path) else None
+
+
+price_surface = load_price_surface()
 
 
 # --------------------------------------------------
@@ -100,14 +115,11 @@ if predict:
     data = [[property_type, sector, bedrooms, bathroom, balcony,
              property_age, built_up_area, servant_room, store_room,
              furnishing_type, luxury_category, floor_category]]
-    columns = ['property_type', 'sector', 'bedRoom', 'bathroom', 'balcony',
-               'agePossession', 'built_up_area', 'servant room', 'store room',
-               'furnishing_type', 'luxury_category', 'floor_category']
-    input_df = pd.DataFrame(data, columns=columns)
+    input_values = dict(zip(FEATURE_COLUMNS, data[0]))
 
-    base_price = np.expm1(pipeline.predict(input_df))[0]
-    low = base_price - 0.22
-    high = base_price + 0.22
+    base_price = predictor.predict_one(input_values)
+    low = base_price - PRICE_BAND
+    high = base_price + PRICE_BAND
 
     st.success("Prediction generated successfully 🚀")
 
@@ -119,3 +131,80 @@ if predict:
         st.metric("Estimated Price", f"₹ {base_price:.2f} Cr")
     with c3:
         st.metric("Maximum Price", f"₹ {high:.2f} Cr")
+
+    cache_stats = predictor.stats()
+    st.caption(
+        f"Prediction cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+        f"({cache_stats['size']}/{cache_stats['maxsize']} entries)"
+    )
+
+st.divider()
+
+# --------------------------------------------------
+# PRICE CURVE (WHAT-IF, NO MODEL CALL)
+# --------------------------------------------------
+st.subheader("Price Curve")
+
+if price_surface is None:
+    st.info("Price curve data not found. Build it with `python -m core.price_surface`.")
+elif sector not in price_surface.sectors or property_type not in price_surface.property_types:
+    st.info("No price curve available for this sector.")
+else:
+    st.caption(
+        f"How the estimate for a {property_type} in {sector} changes with built-up area "
+        "and bedrooms (other features at their most common values)"
+    )
+    cc1, cc2 = st.columns(2)
+    with cc1:
+        curve_bhk = st.multiselect(
+            'Bedrooms',
+            price_surface.bedrooms.tolist(),
+            default=[b for b in (2, 3, 4) if b in price_surface.bedrooms]
+        )
+    with cc2:
+        area_lo, area_hi = st.slider(
+            'Built Up Area Range',
+            float(price_surface.areas[0]), float(price_surface.areas[-1]),
+            (float(price_surface.areas[0]), min(3000.0, float(price_surface.areas[-1])))
+        )
+
+    if curve_bhk:
+        curve_df = price_surface.curves(
+            sector, property_type, np.linspace(area_lo, area_hi, 100), bedrooms=sorted(curve_bhk)
+        )
+        st.line_chart(curve_df)
+    if price_surface.model_hash and price_surface.model_hash != predictor.model_hash:
+        st.caption("⚠️ Curve was built for an older model; rebuild it to match current predictions.")
+
+st.divider()
+
+# --------------------------------------------------
+# BULK PREDICTION (CSV UPLOAD)
+# --------------------------------------------------
+st.subheader("Bulk Price Prediction")
+st.caption("Upload a CSV with the columns: " + ", ".join(FEATURE_COLUMNS))
+
+uploaded_file = st.file_uploader("Listings CSV", type="csv")
+
+if uploaded_file is not None and st.button("Predict All Prices 📄", use_container_width=True):
+    try:
+        bulk_df = pd.read_csv(uploaded_file)
+        priced_df, rows_per_sec = predict_frame(predictor.pipeline, bulk_df)
+    except ValueError as e:
+        st.session_state.pop("bulk_result", None)
+        st.error(f"Could not price this file: {e}")
+    else:
+        st.session_state.bulk_result = (uploaded_file.name, priced_df, rows_per_sec)
+
+if uploaded_file is not None and "bulk_result" in st.session_state:
+    file_name, priced_df, rows_per_sec = st.session_state.bulk_result
+    if file_name == uploaded_file.name:
+        st.success(f"Priced {len(priced_df):,} properties ({rows_per_sec:,.0f} rows/sec) 🚀")
+        st.dataframe(priced_df.head(100), use_container_width=True)
+        st.download_button(
+            "Download Predictions ⬇️",
+            priced_df.to_csv(index=False).encode("utf-8"),
+            file_name="predicted_prices.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
@@ -1,12 +1,40 @@
 import os
 import streamlit as st
-import pandas as pd
 import json
 import plotly.express as px
-import ast
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import plotly.graph_objects as go
+
+from core.analytics import (
+    MAIN_COLUMNS,
+    PROPERTY_COLUMNS,
+    build_aggregates,
+    range_stats
+)
+from core.binning import make_spec, parse_edges
+from core.figures import (
+    MAP_CENTER,
+    FigureCache,
+    choropleth_figure,
+    correlation_figure,
+    data_version,
+    donut_figure,
+    radar_figure,
+    range_figure
+)
+from core.geo import (
+    LEVELS,
+    SOURCE_GEOJSON,
+    lod_for_zoom,
+    lod_path,
+    read_geojson,
+    simplify_geojson
+)
+from core.tables import read_table, table_path
+from core.wordfreq import (
+    FREQUENCIES_FILE,
+    build_frequency_tables,
+    load_frequency_tables,
+    render_wordcloud
+)
 
 
 # ----------------------------------
@@ -35,17 +63,14 @@ DATA_DIR = os.path.join(BASE_DIR, "dataset")
 # ----------------------------------
 @st.cache_data
 def load_data():
-    sector_stats = pd.read_csv(
-        os.path.join(DATA_DIR, "sector_stats.csv")
-    )
+    # Parquet copies, only the columns this page uses
+    sector_stats = read_table("sector_stats.csv", data_dir=DATA_DIR)
 
-    properties = pd.read_csv(
-        os.path.join(DATA_DIR, "gurgaon_properties.csv")
+    properties = read_table(
+        "gurgaon_properties.csv", PROPERTY_COLUMNS, data_dir=DATA_DIR
     )
 
-    main_df = pd.read_csv(
-        os.path.join(DATA_DIR, "new_latlong.csv")
-    )
+    main_df = read_table("new_latlong.csv", MAIN_COLUMNS, data_dir=DATA_DIR)
 
     with open(
         os.path.join(DATA_DIR, "gurugram_sectors_clean.geojson"),
@@ -61,212 +86,85 @@ sector_stats, feature_df, main_df, clean_geojson = load_data()
 
 
 # ----------------------------------
-# FLOOR RANGE BUCKETING
+# DERIVED AGGREGATES (BUILT ONCE, NOT PER RERUN)
 # ----------------------------------
-def floor_bucket(x):
-    if x <= 2:
-        return "Ground–2"
-    elif x <= 5:
-        return "3–5"
-    elif x <= 10:
-        return "6–10"
-    elif x <= 15:
-        return "11–15"
-    elif x <= 20:
-        return "16–20"
-    else:
-        return "21+"
+@st.cache_data
+def load_aggregates():
+    return build_aggregates(main_df, feature_df)
 
-main_df["floor_range"] = main_df["floorNum"].apply(floor_bucket)
 
-floor_order = ["Ground–2", "3–5", "6–10", "11–15", "16–20", "21+"]
+aggregates = load_aggregates()
 
-floor_stats = (
-    main_df
-    .groupby("floor_range")
-    .agg(
-        count=("price", "count"),
-        avg_price=("price", "mean")
-    )
-    .reset_index()
-)
+floor_stats = aggregates.floor_stats
+area_stats = aggregates.area_stats
+corr_matrix = aggregates.corr_matrix
+bhk_df = aggregates.bhk_df
+furn_df = aggregates.furn_df
+age_df = aggregates.age_df
+balcony_df = aggregates.balcony_df
+feature_sector_df = aggregates.feature_sector_df
+sector_list = list(aggregates.sector_list)
 
-floor_stats["floor_range"] = pd.Categorical(
-    floor_stats["floor_range"],
-    categories=floor_order,
-    ordered=True
-)
-
-floor_stats = floor_stats.sort_values("floor_range")
-floor_stats["avg_price_cr"] = floor_stats["avg_price"].round(2)
 
 # ----------------------------------
-# BUILT-UP AREA BUCKETING
+# FIGURE CACHE (BUILT ONCE PER DATA VERSION, SERVED AS JSON)
 # ----------------------------------
-def area_bucket(x):
-    if x < 500:
-        return "<500"
-    elif x <= 1000:
-        return "500–1000"
-    elif x <= 1500:
-        return "1000–1500"
-    elif x <= 2000:
-        return "1500–2000"
-    elif x <= 2500:
-        return "2000–2500"
-    else:
-        return "2500+"
-
-main_df["area_range"] = main_df["built_up_area"].apply(area_bucket)
-
-area_order = [
-    "<500",
-    "500–1000",
-    "1000–1500",
-    "1500–2000",
-    "2000–2500",
-    "2500+"
-]
-
-area_stats = (
-    main_df
-    .groupby("area_range")
-    .agg(
-        count=("price", "count"),
-        avg_price=("price", "mean")
-    )
-    .reset_index()
-)
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache()
 
-area_stats["area_range"] = pd.Categorical(
-    area_stats["area_range"],
-    categories=area_order,
-    ordered=True
-)
 
-area_stats = area_stats.sort_values("area_range")
-area_stats["avg_price_cr"] = area_stats["avg_price"].round(2)
+@st.cache_resource
+def load_map_geojson(level):
+    path = lod_path(SOURCE_GEOJSON, level, DATA_DIR)
+    if os.path.exists(path):
+        return read_geojson(path)
+    # No offline artifact: simplify the source once per process
+    tolerance_m, precision = LEVELS[level]
+    return simplify_geojson(clean_geojson, tolerance_m, precision, properties=["sector"])
 
-# ----------------------------------
-# HEATMAP 
-# ----------------------------------
-# CORRELATION DATA 
-# ----------------------------------
-exclude_cols = [
-    "price_per_sqft",
-    "latitude",
-    "longitude"
-]
-
-numeric_cols = (
-    main_df
-    .select_dtypes(include=["int64", "float64"])
-    .drop(columns=exclude_cols, errors="ignore")
-)
 
-corr_matrix = numeric_cols.corr().round(2)
+figure_cache = load_figure_cache()
 
-# ----------------------------------
-# BHK DISTRIBUTION DATA
-# ----------------------------------
-bhk_df = (
-    main_df["bedRoom"]
-    .value_counts()
-    .sort_index()
-    .reset_index()
-)
+version = data_version([
+    table_path(name, DATA_DIR)
+    for name in ("sector_stats.csv", "gurgaon_properties.csv", "new_latlong.csv")
+])
 
-bhk_df.columns = ["BHK", "Count"]
-bhk_df["BHK"] = bhk_df["BHK"].astype(str) + " BHK"
 
-# ----------------------------------
-# FURNISHING DISTRIBUTION DATA
-# ----------------------------------
-furnishing_map = {
-    0: "Unfurnished",
-    1: "Semi-Furnished",
-    2: "Fully Furnished"
-}
+def cached_figure(name, build):
+    return figure_cache.get(name, version, build)
 
-furn_df = (
-    main_df["furnishing_type"]
-    .map(furnishing_map)
-    .value_counts()
-    .reset_index()
-)
 
-furn_df.columns = ["Furnishing Type", "Count"]
+MAP_ZOOMS = [10, 11, 12, 13, 14, 15]
 
-# ----------------------------------
-# AGE / POSSESSION DISTRIBUTION
-# ----------------------------------
-age_df = (
-    main_df["agePossession"]
-    .value_counts()
-    .reset_index()
-)
 
-age_df.columns = ["Age / Possession", "Count"]
+# Fragment: changing the zoom reruns only the map
+@st.fragment
+def sector_map():
+    st.subheader("🗺️ Sector-wise Price per Sqft Map")
 
-# ----------------------------------
-# BALCONY DISTRIBUTION
-# ----------------------------------
-balcony_df = (
-    main_df["balcony"]
-    .fillna("No Balcony")
-    .replace({
-        "0": "No Balcony",
-        "1": "Balcony",
-        0: "No Balcony",
-        1: "Balcony"
-    })
-    .value_counts()
-    .reset_index()
-)
+    zoom = st.select_slider("Map zoom", MAP_ZOOMS, value=11)
 
-balcony_df.columns = ["Balcony Status", "Count"]
+    # Coarsest boundaries that are still sub-pixel at this zoom
+    level = lod_for_zoom(zoom, MAP_CENTER["lat"])
+    path = lod_path(SOURCE_GEOJSON, level, DATA_DIR)
+    map_version = data_version([
+        table_path("sector_stats.csv", DATA_DIR),
+        path if os.path.exists(path) else os.path.join(DATA_DIR, SOURCE_GEOJSON)
+    ])
 
-# ----------------------------------
-# WORDCLOUD DATA PREP
-# ----------------------------------
-feature_sector_df = feature_df.merge(
-    main_df[["sector"]],
-    left_index=True,
-    right_index=True
-)[["features", "sector"]]
-
-sector_list = ["All"] + sorted(feature_sector_df["sector"].unique())
-
-st.subheader("🗺️ Sector-wise Price per Sqft Map")
-
-fig = px.choropleth_map(
-        sector_stats,
-        geojson=clean_geojson,
-        locations="sector",
-        featureidkey="properties.sector",
-        color="avg_price_per_sqft",             
-        color_continuous_scale="Viridis",
-        map_style="open-street-map",
-        zoom=11,
-        center={"lat": 28.4595, "lon": 77.0266},
-        opacity=0.75,
-        hover_name="sector",
-        hover_data={
-            "avg_price": ':.2f',
-            "avg_price_per_sqft": ':.0f',
-            "avg_area": ':.0f',
-            "listings": True
-        },
-        title="Gurugram Sector-wise Average Price per Sqft"
+    fig = figure_cache.get(
+        f"choropleth_lod{level}",
+        map_version,
+        lambda: choropleth_figure(sector_stats, load_map_geojson(level))
     )
+    fig.update_layout(map_zoom=zoom)
+    st.plotly_chart(fig, use_container_width=True)
 
-fig.update_layout(
-        height=700,
-        margin={"r":0,"t":50,"l":0,"b":0}
-    )
 
-fig.update_traces(marker_line_width=1, marker_line_color="black")
-st.plotly_chart(fig, use_container_width=True)
+sector_map()
+
 # ----------------------------------
 # LAYOUT (TWO COLUMNS)
 # ----------------------------------
@@ -278,58 +176,34 @@ col1, col2 = st.columns(2)
 with col1:
     st.subheader("🧭 Amenities Availability")
 
-    amenity_cols = [
-        "study room",
-        "servant room",
-        "store room",
-        "pooja room",
-        "others"
-    ]
-
-    amenity_stats = (
-        main_df[amenity_cols]
-        .mean()
-        .mul(100)
-        .round(1)
+    fig_radar = cached_figure(
+        "radar",
+        lambda: radar_figure(aggregates.amenity_stats)
     )
 
-    categories = amenity_stats.index.tolist()
-    values = amenity_stats.values.tolist()
-
-    categories += [categories[0]]
-    values += [values[0]]
-
-    max_val = max(values)
+    st.plotly_chart(fig_radar, use_container_width=True)
 
-    fig_radar = go.Figure()
 
-    fig_radar.add_trace(
-        go.Scatterpolar(
-            r=values,
-            theta=categories,
-            fill="toself",
-            line=dict(color="#2E86C1", width=3),
-            fillcolor="rgba(46,134,193,0.35)"
-        )
-    )
+# ----------------------------------
+# WORDCLOUD (PRECOMPUTED FREQUENCIES, IMAGE CACHED PER SECTOR)
+# ----------------------------------
+@st.cache_resource
+def load_word_frequencies():
+    path = os.path.join(DATA_DIR, FREQUENCIES_FILE)
+    if os.path.exists(path):
+        return load_frequency_tables(path)
+    # No offline artifact: parse the feature lists once per process
+    return build_frequency_tables(feature_sector_df)
 
-    fig_radar.update_layout(
-        polar=dict(
-            gridshape="linear",
-            radialaxis=dict(
-                range=[0, max_val * 1.2],
-                showticklabels=True
-            )
-        ),
-        height=650,
-        margin=dict(t=30, b=30, l=30, r=30),
-        showlegend=False
-    )
 
-    st.plotly_chart(fig_radar, use_container_width=True)
+@st.cache_data
+def sector_wordcloud(sector):
+    return render_wordcloud(load_word_frequencies().get(sector))
 
 
-with col2:
+# Fragment: changing the sector reruns only the WordCloud, not the page
+@st.fragment
+def feature_wordcloud():
     st.subheader("☁️ Sector-wise Feature WordCloud")
 
     wc_sector = st.selectbox(
@@ -341,38 +215,17 @@ with col2:
 
     st.session_state.wc_sector = wc_sector
 
-    if st.session_state.wc_sector == "All":
-        wc_df = feature_sector_df
-    else:
-        wc_df = feature_sector_df[
-            feature_sector_df["sector"] == st.session_state.wc_sector
-        ]
-
-    words = []
-    for item in wc_df["features"].dropna().apply(ast.literal_eval):
-        words.extend(item)
-
-    feature_text = " ".join(words)
-
-    if feature_text.strip():
-        plt.rcParams["font.family"] = "Arial"
+    wc_image = sector_wordcloud(st.session_state.wc_sector)
 
-        wordcloud = WordCloud(
-            width=800,
-            height=650,
-            background_color="white",
-            stopwords={"s"},
-            min_font_size=10
-        ).generate(feature_text)
-
-        fig_wc, ax = plt.subplots(figsize=(7,7))
-        ax.imshow(wordcloud, interpolation="bilinear")
-        ax.axis("off")
-
-        st.pyplot(fig_wc, use_container_width=True)
+    if wc_image is not None:
+        st.image(wc_image, use_container_width=True)
     else:
         st.info("No feature data available for this sector.")
 
+
+with col2:
+    feature_wordcloud()
+
 st.markdown("---")
 
 col_built, col_floor = st.columns(2)
@@ -380,55 +233,12 @@ col_built, col_floor = st.columns(2)
 with col_built:
     st.subheader("📊 Price by Built-up Area Range")
 
-    fig_area = go.Figure()
-
-    # Histogram → COUNT
-    fig_area.add_bar(
-        x=area_stats["area_range"],
-        y=area_stats["count"],
-        name="Property Count",
-        marker_color="#D6EAF8",
-        yaxis="y"
-    )
-
-    # Step line → AVG PRICE
-    fig_area.add_scatter(
-        x=area_stats["area_range"],
-        y=area_stats["avg_price_cr"],
-        name="Avg Price (Cr)",
-        mode="lines+markers+text",
-        text=area_stats["avg_price_cr"],
-        textposition="top center",
-        line=dict(
-            color="#1F618D",
-            width=3,
-            shape="hv"
-        ),
-        marker=dict(size=8),
-        yaxis="y2"
-    )
-
-    fig_area.update_layout(
-        height=450,
-        xaxis_title="Built-up Area Range (sqft)",
-        yaxis=dict(title="Property Count", showgrid=False),
-        yaxis2=dict(
-            title="Average Price (Cr)",
-            overlaying="y",
-            side="right",
-            showgrid=False,
-            range=[
-                area_stats["avg_price_cr"].min() * 0.9,
-                area_stats["avg_price_cr"].max() * 1.1
-            ]
-        ),
-        legend=dict(
-            orientation="h",
-            y=1.15,
-            x=0.5,
-            xanchor="center"
-        ),
-        margin=dict(t=40, b=40, l=40, r=40)
+    fig_area = cached_figure(
+        "area_range",
+        lambda: range_figure(
+            area_stats, "area_range", "Built-up Area Range (sqft)",
+            bar_color="#D6EAF8", line_color="#1F618D"
+        )
     )
 
     st.plotly_chart(fig_area, use_container_width=True)
@@ -436,81 +246,66 @@ with col_built:
 with col_floor:
     st.subheader("📊 Price Analysis by Floor Range")
 
-    fig_floor = go.Figure()
-
-    # Bars → Count
-    fig_floor.add_bar(
-        x=floor_stats["floor_range"],
-        y=floor_stats["count"],
-        name="Property Count",
-        marker_color="#AED6F1",
-        yaxis="y"
+    fig_floor = cached_figure(
+        "floor_range",
+        lambda: range_figure(
+            floor_stats, "floor_range", "Floor Range",
+            bar_color="#AED6F1", line_color="#CB4335"
+        )
     )
 
-    # Line → Avg Price (Cr)
-    fig_floor.add_scatter(
-    x=floor_stats["floor_range"],
-    y=floor_stats["avg_price_cr"],
-    name="Avg Price (Cr)",
-    mode="lines+markers+text",
-    text=floor_stats["avg_price_cr"],
-    textposition="top center",
-    line=dict(
-        color="#CB4335",
-        width=3,
-        shape="hv"  
-    ),
-    marker=dict(size=8),
-    yaxis="y2"
-)
+    st.plotly_chart(fig_floor, use_container_width=True)
+
+st.markdown("---")
 
+# ----------------------------------
+# CUSTOM RANGE EXPLORER (ANALYST-DEFINED BINS)
+# ----------------------------------
+RANGE_COLUMNS = {
+    "Built-up Area (sqft)": ("built_up_area", "500, 1000, 1500, 2000, 2500"),
+    "Price per Sqft": ("price_per_sqft", "5000, 7500, 10000, 15000, 20000"),
+    "Luxury Score": ("luxury_score", "25, 50, 100, 150"),
+    "Floor Number": ("floorNum", "2, 5, 10, 15, 20"),
+}
 
-    fig_floor.update_layout(
-        height=450,
-        xaxis_title="Floor Range",
-        yaxis=dict(
-            title="Property Count",
-            showgrid=False
-        ),
-        yaxis2=dict(
-            title="Average Price (Cr)",
-            overlaying="y",
-            side="right",
-            showgrid=False,
-            range=[
-                floor_stats["avg_price_cr"].min() * 0.9,
-                floor_stats["avg_price_cr"].max() * 1.1
-            ]
-        ),
-        legend=dict(
-            orientation="h",
-            y=1.15,
-            x=0.5,
-            xanchor="center"
-        ),
-        margin=dict(t=40, b=40, l=40, r=40)
+
+@st.fragment
+def custom_range_explorer():
+    st.subheader("📐 Custom Range Explorer")
+
+    rc1, rc2 = st.columns([1, 2])
+    with rc1:
+        label = st.selectbox("Column", list(RANGE_COLUMNS))
+    column, default_edges = RANGE_COLUMNS[label]
+    with rc2:
+        edges_text = st.text_input("Bin edges (comma separated)", default_edges, key=f"edges_{column}")
+
+    try:
+        spec = make_spec(parse_edges(edges_text))
+    except ValueError:
+        st.warning("Enter numeric bin edges separated by commas.")
+        return
+
+    stats = range_stats(main_df, column, spec, "range")
+
+    fig_range = range_figure(
+        stats, "range", label,
+        bar_color="#D5F5E3", line_color="#1E8449", fit_price_axis=False
     )
 
-    st.plotly_chart(fig_floor, use_container_width=True)
+    st.plotly_chart(fig_range, use_container_width=True)
+
+
+custom_range_explorer()
 
 st.markdown("---")
 
 st.subheader("🔥 Feature Correlation Heatmap")
 
-fig_corr = px.imshow(
-        corr_matrix,
-        text_auto=True,
-        color_continuous_scale="RdBu",
-        zmin=-1,
-        zmax=1
-    )
-
-fig_corr.update_layout(
-        height=1000,
-        xaxis_title="Features",
-        yaxis_title="Features",
-        margin=dict(t=40, b=40, l=40, r=40)
-    )
+fig_corr = cached_figure(
+    "correlation",
+    lambda: correlation_figure(corr_matrix)
+)
 
 st.plotly_chart(fig_corr, use_container_width=True)
 
@@ -520,23 +315,11 @@ col_bhk, col_furn = st.columns(2)
 with col_bhk:
     st.subheader("🏠 Property Distribution by BHK")
 
-    fig_bhk = px.pie(
-        bhk_df,
-        names="BHK",
-        values="Count",
-        hole=0.4,
-        color_discrete_sequence=px.colors.qualitative.Set3
-    )
-
-    fig_bhk.update_traces(
-        textinfo="percent+label",
-        textfont_size=14
-    )
-
-    fig_bhk.update_layout(
-        height=450,
-        margin=dict(t=40, b=40, l=40, r=40),
-        legend_title_text="Bedroom Type"
+    fig_bhk = cached_figure(
+        "bhk_pie",
+        lambda: donut_figure(
+            bhk_df, "BHK", px.colors.qualitative.Set3, "Bedroom Type"
+        )
     )
 
     st.plotly_chart(fig_bhk, use_container_width=True)
@@ -544,23 +327,11 @@ with col_bhk:
 with col_furn:
     st.subheader("🛋️ Furnishing Type Distribution")
 
-    fig_furn = px.pie(
-        furn_df,
-        names="Furnishing Type",
-        values="Count",
-        hole=0.4,
-        color_discrete_sequence=px.colors.qualitative.Pastel
-    )
-
-    fig_furn.update_traces(
-        textinfo="percent+label",
-        textfont_size=14
-    )
-
-    fig_furn.update_layout(
-        height=450,
-        margin=dict(t=40, b=40, l=40, r=40),
-        legend_title_text="Furnishing Status"
+    fig_furn = cached_figure(
+        "furnishing_pie",
+        lambda: donut_figure(
+            furn_df, "Furnishing Type", px.colors.qualitative.Pastel, "Furnishing Status"
+        )
     )
 
     st.plotly_chart(fig_furn, use_container_width=True)
@@ -571,23 +342,11 @@ col_age, col_balcony = st.columns(2)
 with col_age:
     st.subheader("⏳ Property Age / Possession")
 
-    fig_age = px.pie(
-        age_df,
-        names="Age / Possession",
-        values="Count",
-        hole=0.4,
-        color_discrete_sequence=px.colors.qualitative.Set2
-    )
-
-    fig_age.update_traces(
-        textinfo="percent+label",
-        textfont_size=14
-    )
-
-    fig_age.update_layout(
-        height=450,
-        margin=dict(t=40, b=40, l=40, r=40),
-        legend_title_text="Status"
+    fig_age = cached_figure(
+        "age_pie",
+        lambda: donut_figure(
+            age_df, "Age / Possession", px.colors.qualitative.Set2, "Status"
+        )
     )
 
     st.plotly_chart(fig_age, use_container_width=True)
@@ -595,23 +354,11 @@ with col_age:
 with col_balcony:
     st.subheader("🌤️ Balcony Availability")
 
-    fig_balcony = px.pie(
-        balcony_df,
-        names="Balcony Status",
-        values="Count",
-        hole=0.4,
-        color_discrete_sequence=px.colors.qualitative.Pastel1
-    )
-
-    fig_balcony.update_traces(
-        textinfo="percent+label",
-        textfont_size=14
-    )
-
-    fig_balcony.update_layout(
-        height=450,
-        margin=dict(t=40, b=40, l=40, r=40),
-        legend_title_text="Balcony"
+    fig_balcony = cached_figure(
+        "balcony_pie",
+        lambda: donut_figure(
+            balcony_df, "Balcony Status", px.colors.qualitative.Pastel1, "Balcony"
+        )
     )
 
     st.plotly_chart(fig_balcony, use_container_width=True)
@@ -1,9 +1,15 @@
 import os
 import streamlit as st
-import pickle
 import pandas as pd
 import numpy as np
 
+from core.ann import load_ann_index
+from core.artifacts import load_pickle
+from core.nearby import PROJECT_PRICES_FILE, PriceFilter, nearby_recommendations
+from core.search import landmark_index, property_index
+from core.similarity import DEFAULT_WEIGHTS, load_engine
+from core.spatial import LandmarkDistances, SpatialIndex
+
 # --------------------------------------------------
 # PAGE CONFIG
 # --------------------------------------------------
@@ -21,41 +27,83 @@ DATA_DIR = os.path.join(BASE_DIR, "dataset")
 # LOAD DATA (DOCKER & AWS SAFE)
 # --------------------------------------------------
 
-location_df = pickle.load(
-    open(os.path.join(DATA_DIR, "distance_location.pkl"), "rb")
-)
+# Loaded once per server process, not once per rerun
+location_df = load_pickle("distance_location.pkl", DATA_DIR)
 
-url_df = pickle.load(
-    open(os.path.join(DATA_DIR, "url.pkl"), "rb")
-)
+url_df = load_pickle("url.pkl", DATA_DIR)
 
 # Property → URL mapping
 url_dict = url_df.set_index("PropertyName")["Link"].to_dict()
 
-cosine_sim1 = pickle.load(
-    open(os.path.join(DATA_DIR, "Top_facilities.pkl"), "rb")
-)
+# --------------------------------------------------
+# SIMILARITY ENGINE (CACHED ACROSS SESSIONS)
+# --------------------------------------------------
+@st.cache_resource
+def load_similarity_engine():
+    # Shared across sessions. Recommendations blend only the query row,
+    # so no private N×N matrix is built next to the mapped .npy files
+    return load_engine(location_df.index, DATA_DIR)
 
-cosine_sim2 = pickle.load(
-    open(os.path.join(DATA_DIR, "price_based.pkl"), "rb")
-)
 
-cosine_sim3 = pickle.load(
-    open(os.path.join(DATA_DIR, "location_based.pkl"), "rb")
-)
+engine = load_similarity_engine()
+
+# Optional LSH index (``python -m core.ann``); exact search stays the default
+ann_index = load_ann_index(DATA_DIR)
 
 # --------------------------------------------------
-# RECOMMENDER FUNCTION
+# SPATIAL INDEXES (CACHED ACROSS SESSIONS)
+# --------------------------------------------------
+@st.cache_resource
+def load_spatial_index():
+    # Landmarks: the scraped distances; coordinates: a BallTree
+    return (
+        LandmarkDistances(location_df),
+        SpatialIndex.from_csv(os.path.join(DATA_DIR, "property_coords.csv"))
+    )
+
+
+landmark_distances, point_index = load_spatial_index()
+
+
+@st.cache_resource
+def load_price_filter():
+    path = os.path.join(DATA_DIR, PROJECT_PRICES_FILE)
+    if not os.path.exists(path):
+        return None
+    return PriceFilter.from_csv(location_df.index, path)
+
+
+price_filter = load_price_filter()
+
 # --------------------------------------------------
-def recommend_properties_with_scores(property_name, top_n=5):
-    cosine_sim_matrix = 0.5 * cosine_sim1 + 0.8 * cosine_sim2 + 1 * cosine_sim3
+# NAME SEARCH (instead of selectboxes listing every name)
+# --------------------------------------------------
+SEARCH_LIMIT = 20
+
+property_names = property_index(DATA_DIR)
+landmark_names = landmark_index(DATA_DIR)
 
-    sim_scores = list(enumerate(cosine_sim_matrix[location_df.index.get_loc(property_name)]))
-    sorted_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
 
-    top_indices = [i[0] for i in sorted_scores[1:top_n + 1]]
-    top_scores = [i[1] for i in sorted_scores[1:top_n + 1]]
-    top_properties = location_df.index[top_indices].tolist()
+def search_select(label, index, key, placeholder):
+    query = st.text_input(f'Search {label.lower()}', key=f'{key}_query', placeholder=placeholder)
+    options = index.search(query, SEARCH_LIMIT)
+    if query and not options:
+        st.caption("No close match; showing the first names instead")
+        options = index.search("", SEARCH_LIMIT)
+    return st.selectbox(f'Select {label.lower()}', options, key=key)
+
+
+# --------------------------------------------------
+# RECOMMENDER FUNCTION
+# --------------------------------------------------
+def recommend_properties_with_scores(property_name, top_n=5, weights=DEFAULT_WEIGHTS,
+                                     approximate=False):
+    searcher = engine
+    if approximate and ann_index is not None and property_name in ann_index.names:
+        searcher = ann_index
+    top_properties, top_scores = searcher.recommend(
+        property_name, top_n=top_n, weights=weights
+    )
 
     recommendations_df = pd.DataFrame({
         'PropertyName': top_properties,
@@ -65,6 +113,17 @@ def recommend_properties_with_scores(property_name, top_n=5):
 
     return recommendations_df
 
+
+def recommend_nearby_with_scores(property_name, radius_index, center, radius_km, top_n=5,
+                                 weights=DEFAULT_WEIGHTS, **filters):
+    # Only the apartments inside the radius (and filters) are scored
+    recommendations_df = nearby_recommendations(
+        engine, radius_index, property_name, center, radius_km,
+        top_n=top_n, weights=weights, price_filter=price_filter, **filters
+    )
+    recommendations_df['Link'] = [url_dict.get(p, "") for p in recommendations_df['PropertyName']]
+    return recommendations_df
+
 # --------------------------------------------------
 # CENTERED PAGE LAYOUT (full width, no side margin)
 # --------------------------------------------------
@@ -78,7 +137,17 @@ st.divider()
 # UI: Location + Radius
 # --------------------------------------------------
 st.subheader("Search Nearby Apartments")
-selected_location = st.selectbox('Select Location', sorted(location_df.columns.to_list()))
+search_mode = st.radio('Search Around', ['Landmark', 'Coordinates'], horizontal=True)
+if search_mode == 'Landmark':
+    selected_location = search_select('Location', landmark_names, 'location', 'e.g. cyber city')
+    radius_index, center = landmark_distances, (selected_location,)
+else:
+    c1, c2 = st.columns(2)
+    with c1:
+        center_lat = st.number_input('Latitude', value=28.4595, format="%.4f")
+    with c2:
+        center_lon = st.number_input('Longitude', value=77.0266, format="%.4f")
+    radius_index, center = point_index, (center_lat, center_lon)
 radius = st.number_input('Radius in KM', min_value=0.5, step=0.5)
 
 # Initialize session state
@@ -88,17 +157,19 @@ if "nearby_searched" not in st.session_state:
 
 # Nearby search button
 if st.button('Search Nearby'):
-    # Filter apartments within radius
-    result_ser = location_df[location_df[selected_location] < radius*1000][selected_location].sort_values()
-    st.session_state.nearby_results = list(result_ser.index)
+    # Apartments within radius, nearest first
+    result_ser = radius_index.query_radius(*center, radius)
+    st.session_state.nearby_results = list(result_ser.items())
     st.session_state.nearby_searched = True
+    # Recommendations within the radius use this search, not later widget edits
+    st.session_state.nearby_area = (search_mode, center, radius)
 
 # Show nearby apartments
 if st.session_state.nearby_searched:
     if st.session_state.nearby_results:
         st.write("### Nearby Apartments:")
-        for name in st.session_state.nearby_results:
-            st.text(f"• {name}")
+        for name, distance in st.session_state.nearby_results:
+            st.text(f"• {name} ({distance:.1f} km)")
     else:
         st.warning("No apartments found in this radius 😕")
 
@@ -109,8 +180,34 @@ st.divider()
 # --------------------------------------------------
 if st.session_state.nearby_searched:
     st.subheader("Recommend Similar Apartments")
-    # Full apartment list for selection
-    selected_apartment = st.selectbox('Select an apartment for recommendations', sorted(location_df.index.to_list()))
+    selected_apartment = search_select('Apartment', property_names, 'apartment', 'e.g. dlf camellias')
+
+    # Similarity weights (defaults match the original blend)
+    w1, w2, w3 = st.columns(3)
+    with w1:
+        facilities_weight = st.slider('Facilities Weight', 0.0, 2.0, DEFAULT_WEIGHTS[0], 0.1)
+    with w2:
+        price_weight = st.slider('Price Weight', 0.0, 2.0, DEFAULT_WEIGHTS[1], 0.1)
+    with w3:
+        location_weight = st.slider('Location Weight', 0.0, 2.0, DEFAULT_WEIGHTS[2], 0.1)
+    weights = (facilities_weight, price_weight, location_weight)
+
+    within_radius = st.checkbox('Only apartments within the search radius', value=False)
+    filters = {}
+    if within_radius and price_filter is not None:
+        top_price = float(np.ceil(np.nanmax(price_filter.high)))
+        f1, f2 = st.columns(2)
+        with f1:
+            filters['configs'] = st.multiselect('Configuration', price_filter.configs)
+        with f2:
+            low, high = st.slider('Price (₹ Cr)', 0.0, top_price, (0.0, top_price), 0.5)
+        # The full slider range means "any price" (including unpriced listings)
+        filters['min_price'] = low if low > 0 else None
+        filters['max_price'] = high if high < top_price else None
+
+    approximate = not within_radius and ann_index is not None and st.checkbox(
+        'Approximate search (faster on large catalogues)', value=False
+    )
 
     if "recommend_clicked" not in st.session_state:
         st.session_state.recommend_clicked = False
@@ -120,19 +217,40 @@ if st.session_state.nearby_searched:
         st.session_state.recommend_apartment = selected_apartment
 
     if st.session_state.recommend_clicked:
-        recommendation_df = recommend_properties_with_scores(st.session_state.recommend_apartment)
+        if within_radius:
+            area_mode, area_center, area_radius = st.session_state.nearby_area
+            area_index = landmark_distances if area_mode == 'Landmark' else point_index
+            recommendation_df = recommend_nearby_with_scores(
+                st.session_state.recommend_apartment, area_index, area_center, area_radius,
+                weights=weights, **filters
+            )
+        else:
+            recommendation_df = recommend_properties_with_scores(
+                st.session_state.recommend_apartment, weights=weights,
+                approximate=approximate
+            )
 
         # Build Markdown table with clickable links
         table_md = "| Property Name | Similarity Score | Link |\n|---|---|---|\n"
         for _, row in recommendation_df.iterrows():
             name = row['PropertyName']
+            if 'distance_km' in row:
+                name = f"{name} ({row['distance_km']:.1f} km)"
             score = round(row['SimilarityScore'], 3)
             link = row['Link']
             link_md = f"[View Property]({link})" if link else "-"
             table_md += f"| {name} | {score} | {link_md} |\n"
 
         st.markdown("### 🔍 Recommended Apartments")
-        st.markdown(table_md, unsafe_allow_html=True)
+        if recommendation_df.empty:
+            st.warning("No apartments in this radius match the filters 😕")
+        else:
+            st.markdown(table_md, unsafe_allow_html=True)
+            if engine.is_sparse:
+                st.caption("Approximate scores: on a catalogue this size only each apartment's "
+                           "strongest neighbours are stored exactly")
+            elif approximate:
+                st.caption("Approximate search: a close match may occasionally be missed")
 else:
     st.info("Search nearby apartments first to enable recommendations 🧭")
 